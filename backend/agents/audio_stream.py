@@ -0,0 +1,167 @@
+import os
+import re
+import time
+import asyncio
+import uuid
+
+from agents.perception import perception_agent
+from agents.memory import memory_agent
+from agents.risk import risk_agent
+from agents.risk_state import risk_state
+
+BYTES_PER_SAMPLE = 2  # 16-bit mono PCM
+
+
+class PCMChunker:
+    """
+    Cuts an incoming PCM byte stream into fixed-length chunks, each one
+    carrying a short tail of the previous chunk so words on the boundary
+    aren't lost.
+    """
+
+    def __init__(self, sample_rate, chunk_seconds=None, overlap_seconds=None):
+        self.sample_rate = sample_rate
+        chunk_seconds = chunk_seconds or float(os.getenv("AUDIO_CHUNK_SECONDS", "10"))
+        overlap_seconds = overlap_seconds if overlap_seconds is not None else float(os.getenv("AUDIO_CHUNK_OVERLAP_SECONDS", "0.5"))
+
+        self.chunk_bytes = int(chunk_seconds * sample_rate) * BYTES_PER_SAMPLE
+        self.overlap_bytes = int(overlap_seconds * sample_rate) * BYTES_PER_SAMPLE
+        self.buffer = bytearray()
+        self.tail = b""
+        self.received = 0
+
+    def feed(self, data):
+        """Input: raw PCM bytes. Output: list of complete chunks (possibly empty)."""
+        self.buffer.extend(data)
+        self.received += len(data)
+        chunks = []
+        while len(self.buffer) >= self.chunk_bytes:
+            chunks.append(self._cut(self.chunk_bytes))
+        return chunks
+
+    def flush(self):
+        """Whatever is left at the end of the stream (None if nothing)."""
+        if not self.buffer:
+            return None
+        return self._cut(len(self.buffer))
+
+    def _cut(self, size):
+        body = bytes(self.buffer[:size])
+        del self.buffer[:size]
+        chunk = self.tail + body
+        self.tail = body[-self.overlap_bytes:] if self.overlap_bytes else b""
+        return chunk
+
+    def seconds(self):
+        """Audio received so far."""
+        return self.received / (self.sample_rate * BYTES_PER_SAMPLE)
+
+
+class AudioStreamer:
+    """
+    Live radio / field recordings over /ws/audio: each chunk is transcribed,
+    embedded and stored in live_intel as soon as it arrives, so partial
+    transcripts are searchable (and recalled against history) while the
+    recording is still coming in.
+    """
+
+    def __init__(self):
+        # Chunks waiting for transcription per connection; when full, the socket stops being read
+        self.queue_size = int(os.getenv("AUDIO_QUEUE_SIZE", "8"))
+        self.stats = {"streams": 0, "active": 0, "chunks": 0, "silent_chunks": 0, "errors": 0, "audio_seconds": 0.0}
+
+    async def enqueue(self, queue, pcm, consumer):
+        """
+        Waits for room in the (bounded) queue. Audio chunks are never dropped:
+        a slow consumer pushes back on the sender instead.
+        Raises the consumer's error if it died, rather than waiting forever.
+        """
+        if consumer.done():
+            consumer.result()
+        put = asyncio.ensure_future(queue.put(pcm))
+        done, _ = await asyncio.wait({put, consumer}, return_when=asyncio.FIRST_COMPLETED)
+        if put not in done:
+            put.cancel()
+            consumer.result()
+
+    async def consume(self, queue, stream, send):
+        """
+        Processes one connection's chunks in order.
+        Queue items: PCM chunk bytes, None = end of stream.
+        Output: The partial transcripts, in order
+        """
+        transcripts = []
+        index = 0
+        while True:
+            pcm = await queue.get()
+            if pcm is None:
+                return transcripts
+
+            started = time.perf_counter()
+            processed = await perception_agent.process_audio_chunk(pcm, stream["sample_rate"])
+            if not processed:
+                self.stats["silent_chunks"] += 1
+                index += 1
+                continue
+
+            transcript = processed["description"]
+            point = stream["store"].build_point(
+                "audio", processed, stream["location"],
+                extra_payload={"stream_id": stream["id"], "chunk": index, "partial": True}
+            )
+            await stream["store"].store(point)
+            risk_state.update(stream["location"], risk_agent.intel_signal(transcript), point.payload["timestamp"])
+
+            # Search history with what has been said so far
+            incidents = await asyncio.to_thread(memory_agent.recall_patterns, transcript)
+            self.stats["chunks"] += 1
+            transcripts.append(transcript)
+
+            await send({
+                "type": "partial",
+                "stream_id": stream["id"],
+                "chunk": index,
+                "id": point.id,
+                "text": transcript,
+                "similar_incidents": incidents,
+                "processing_ms": round((time.perf_counter() - started) * 1000, 1)
+            })
+            index += 1
+
+    def open(self, location, sample_rate, store):
+        self.stats["streams"] += 1
+        self.stats["active"] += 1
+        return {"id": str(uuid.uuid4()), "location": location, "sample_rate": sample_rate, "store": store}
+
+    def close(self, stream, audio_seconds=0.0):
+        self.stats["active"] -= 1
+        self.stats["audio_seconds"] += audio_seconds
+
+    def report(self):
+        return dict(self.stats, audio_seconds=round(self.stats["audio_seconds"], 1))
+
+
+def join_transcripts(transcripts, max_overlap_words=12):
+    """
+    Joins chunk transcripts into one text. Chunks overlap by a short tail of
+    audio, so a chunk usually starts by repeating the last words of the one
+    before it: the longest such repeat (ignoring case and punctuation) is cut.
+    """
+    words = []
+    for transcript in transcripts:
+        new = transcript.split()
+        overlap = 0
+        for n in range(min(max_overlap_words, len(words), len(new)), 0, -1):
+            if [_word(w) for w in words[-n:]] == [_word(w) for w in new[:n]]:
+                overlap = n
+                break
+        words.extend(new[overlap:])
+    return " ".join(words)
+
+
+def _word(word):
+    return re.sub(r"[^\w]+", "", word.lower())
+
+
+# Singleton (shared by every /ws/audio connection)
+audio_streamer = AudioStreamer()
@@ -0,0 +1,161 @@
+import os
+import re
+import json
+import threading
+
+
+def _normalize(text):
+    return re.sub(r"[^a-z0-9 ]+", "", " ".join(str(text).lower().split())).strip()
+
+
+def _clip(text, limit):
+    text = " ".join(str(text).split())
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
+
+
+class ContextBuilder:
+    """
+    Token-budgeted prompt context for the LLM agents.
+
+    - Evidence: incidents ranked by similarity, incidents with the same
+      outcome merged into one line, long fields clipped, lines added until
+      CONTEXT_EVIDENCE_TOKENS is spent. Within /analyze one block is shared
+      by the Decision and Explainability prompts; /agent/decision and
+      /agent/explain each build their own.
+    - Plans: a compact "key: value" summary instead of json.dumps.
+
+    Token counts are estimated at CONTEXT_CHARS_PER_TOKEN characters per
+    token (no tokenizer dependency; close enough for budgeting Llama prompts).
+    """
+
+    def __init__(self):
+        self.chars_per_token = float(os.getenv("CONTEXT_CHARS_PER_TOKEN", "4"))
+        self.evidence_tokens = int(os.getenv("CONTEXT_EVIDENCE_TOKENS", "400"))
+        self.plan_tokens = int(os.getenv("CONTEXT_PLAN_TOKENS", "150"))
+        self.max_incidents = int(os.getenv("CONTEXT_MAX_INCIDENTS", "8"))
+        self.field_chars = int(os.getenv("CONTEXT_FIELD_CHARS", "160"))
+        # Assumed prefill cost: the latency saved is an estimate from this, not a measurement
+        self.ms_per_1k_tokens = float(os.getenv("CONTEXT_MS_PER_1K_PROMPT_TOKENS", "25"))
+
+        self._lock = threading.Lock()
+        self.stats = {"prompts": 0, "prompt_tokens": 0, "saved_tokens": 0, "estimated_saved_ms": 0.0,
+                      "incidents_in": 0, "incidents_kept": 0, "outcomes_merged": 0}
+
+    def tokens(self, text):
+        return int(len(text) / self.chars_per_token + 0.999) if text else 0
+
+    # --- EVIDENCE ---
+    def evidence(self, past_incidents, budget=None):
+        """
+        Input: Memory Agent hits (any order)
+        Output: {"text", "tokens", "raw_tokens", "kept", "merged", "dropped"}
+        raw_tokens = what listing every incident in full would have cost.
+        """
+        budget = budget or self.evidence_tokens
+        past_incidents = past_incidents or []
+        raw_tokens = self.tokens("".join(
+            f"- Event {i + 1}: {inc.get('incident', 'Unknown Event')} | Outcome: {inc.get('outcome', 'Unknown Outcome')}"
+            f" | Action: {inc.get('action_taken', 'No action recorded')}\n"
+            for i, inc in enumerate(past_incidents)
+        ))
+
+        # 1. Best matches first; the same outcome is one piece of evidence, however often it recurs
+        ranked = sorted(past_incidents, key=lambda inc: inc.get("score") or 0.0, reverse=True)
+        groups = {}
+        for inc in ranked:
+            outcome = inc.get("outcome") or "Unknown Outcome"
+            groups.setdefault(_normalize(outcome) or id(inc), []).append(inc)
+
+        # 2. One line per outcome, until the budget is spent
+        lines, used, merged = [], 0, 0
+        for members in list(groups.values())[:self.max_incidents]:
+            line = self._evidence_line(len(lines) + 1, members)
+            cost = self.tokens(line) + 1
+            if lines and used + cost > budget:
+                break
+            lines.append(line)
+            used += cost
+            merged += len(members) - 1
+
+        text = "\n".join(lines) + ("\n" if lines else "")
+        kept = sum(len(members) for members in list(groups.values())[:len(lines)])
+        with self._lock:
+            self.stats["incidents_in"] += len(past_incidents)
+            self.stats["incidents_kept"] += kept
+            self.stats["outcomes_merged"] += merged
+        return {
+            "text": text,
+            "tokens": self.tokens(text),
+            "raw_tokens": raw_tokens,
+            "kept": kept,
+            "merged": merged,
+            "dropped": len(past_incidents) - kept
+        }
+
+    def _evidence_line(self, n, members):
+        top = members[0]
+        name = _clip(top.get("incident", "Unknown Event"), self.field_chars // 2)
+        if top.get("year"):
+            name += f" ({top['year']})"
+        if len(members) > 1:
+            name += f" +{len(members) - 1} similar"
+        parts = [f"E{n} {name}", f"sim {float(top.get('score') or 0.0):.2f}",
+                 f"outcome: {_clip(top.get('outcome') or 'Unknown Outcome', self.field_chars)}"]
+        if top.get("action_taken"):
+            parts.append(f"action: {_clip(top['action_taken'], self.field_chars)}")
+        return "- " + " | ".join(parts)
+
+    # --- PLANS ---
+    def compact_plan(self, plan, budget=None):
+        """Plan JSON -> 'key: a; b; c' lines within the plan budget. Output: (text, saved tokens)."""
+        raw = json.dumps(plan)
+        if not isinstance(plan, dict):
+            return _clip(raw, int((budget or self.plan_tokens) * self.chars_per_token)), 0
+
+        lines = []
+        for key, value in plan.items():
+            if isinstance(value, list):
+                value = "; ".join(
+                    _clip(v if not isinstance(v, dict) else json.dumps(v, separators=(",", ":")), self.field_chars)
+                    for v in value
+                )
+            elif isinstance(value, dict):
+                value = json.dumps(value, separators=(",", ":"))
+            lines.append(f"{key}: {_clip(value, self.field_chars * 2)}")
+
+        text = "\n".join(lines)
+        limit = int((budget or self.plan_tokens) * self.chars_per_token)
+        if len(text) > limit:
+            text = text[:limit - 1].rstrip() + "…"
+        return text, max(0, self.tokens(raw) - self.tokens(text))
+
+    # --- ACCOUNTING ---
+    def record(self, agent, prompt, saved_tokens):
+        """Logs one prompt's size and an estimate of the prefill time the budget saved."""
+        tokens = self.tokens(prompt)
+        saved_tokens = max(0, saved_tokens)  # A short history can cost a few tokens more in the ranked format
+        saved_ms = saved_tokens * self.ms_per_1k_tokens / 1000.0
+        with self._lock:
+            self.stats["prompts"] += 1
+            self.stats["prompt_tokens"] += tokens
+            self.stats["saved_tokens"] += saved_tokens
+            self.stats["estimated_saved_ms"] += saved_ms
+        print(f"🧮 Context ({agent}): ~{tokens} prompt tokens, {saved_tokens} saved "
+              f"(estimated ~{saved_ms:.1f} ms at {self.ms_per_1k_tokens:g} ms/1k tokens, not measured).")
+        return tokens
+
+    def report(self):
+        with self._lock:
+            prompts = self.stats["prompts"]
+            return dict(
+                self.stats,
+                estimated_saved_ms=round(self.stats["estimated_saved_ms"], 1),
+                saved_ms_basis=f"estimate: saved tokens x {self.ms_per_1k_tokens:g} ms/1k (CONTEXT_MS_PER_1K_PROMPT_TOKENS), not measured",
+                mean_prompt_tokens=round(self.stats["prompt_tokens"] / prompts, 1) if prompts else 0.0,
+                evidence_budget=self.evidence_tokens,
+                plan_budget=self.plan_tokens
+            )
+
+
+# Singleton (shared by Decision + Explainability agents)
+context_builder = ContextBuilder()
@@ -1,35 +1,58 @@
-import os
 import json
+import asyncio
 from dotenv import load_dotenv
-from groq import Groq
+
+from agents.llm import llm_gateway, completion_text
+from agents.llm_cache import response_cache, incident_ids
+from agents.context import context_builder
 
 load_dotenv()
 
+# Use the most stable model for Groq
+MODEL = "llama-3.3-70b-versatile"
+TEMPERATURE = 0.1
+PROMPT_VERSION = 2  # Part of the response-cache key: bump when the prompt template changes
+SYSTEM_PROMPT = "You are a crisis AI. You MUST output valid JSON only. No markdown, no conversational text."
+
 class DecisionAgent:
     def __init__(self):
         print("♟️ Strategist: Initializing Decision Engine...")
         
         # DEBUG: Print if key exists (DO NOT print the actual key)
-        api_key = os.getenv("GROQ_API_KEY")
-        if not api_key:
+        # All calls go through the shared async gateway (pooled, retried)
+        self.client = llm_gateway
+        if not self.client.configured:
             print("❌ DECISION ERROR: GROQ_API_KEY is missing in .env!")
-            self.client = None
         else:
-            print(f"✅ Decision Agent: API Key found (Starts with {api_key[:4]}...)")
-            self.client = Groq(api_key=api_key)
+            print(f"✅ Decision Agent: API Key found (Starts with {self.client.api_key[:4]}...)")
 
-    def generate_plan(self, current_desc, risk_data, past_incidents):
-        if not self.client:
+    async def generate_plan(self, current_desc, risk_data, past_incidents, evidence=None):
+        """
+        Input: Current situation, risk assessment, similar past incidents
+               (+ optional evidence block from context_builder, shared with the Explainability Agent)
+        Output: Response plan (dict)
+        """
+        if not self.client.configured:
             return {"error": "Groq Client not initialized. Check GROQ_API_KEY."}
 
-        # 1. Context Construction
-        past_context = ""
-        for i, inc in enumerate(past_incidents):
-            # Safe access to dictionary keys with defaults
-            inc_name = inc.get('incident', 'Unknown Event')
-            inc_outcome = inc.get('outcome', 'Unknown Outcome')
-            inc_action = inc.get('action_taken', 'No action recorded')
-            past_context += f"- Event {i+1}: {inc_name} | Outcome: {inc_outcome} | Action: {inc_action}\n"
+        # 0. Identical situations get the cached plan (no LLM latency or cost)
+        cache_key = response_cache.make_key(
+            prompt_version=PROMPT_VERSION,
+            model=MODEL,
+            temperature=TEMPERATURE,
+            system=SYSTEM_PROMPT,
+            current_desc=current_desc.lower(),
+            risk_level=risk_data.get('level', 'UNKNOWN'),
+            incident_ids=incident_ids(past_incidents)
+        )
+        cached = await asyncio.to_thread(response_cache.get, "decision", cache_key)
+        if cached is not None:
+            print("⚡ Decision Agent: Served plan from response cache.")
+            return cached
+
+        # 1. Context Construction (ranked, deduplicated, within the token budget)
+        evidence = evidence or context_builder.evidence(past_incidents)
+        past_context = evidence["text"]
 
         prompt = f"""
         You are AURA, an AI Crisis Commander.
@@ -42,29 +65,30 @@ class DecisionAgent:
         
         TASK: Generate a JSON response plan.
         """
+        context_builder.record("decision", SYSTEM_PROMPT + prompt, evidence["raw_tokens"] - evidence["tokens"])
 
         try:
             # 2. Call Groq
-            chat_completion = self.client.chat.completions.create(
+            chat_completion = await self.client.chat(
                 messages=[
                     {
                         "role": "system", 
-                        "content": "You are a crisis AI. You MUST output valid JSON only. No markdown, no conversational text."
+                        "content": SYSTEM_PROMPT
                     },
                     {
                         "role": "user", 
                         "content": prompt
                     }
                 ],
-                # Use the most stable model for Groq
-                model="llama-3.3-70b-versatile",
-                temperature=0.1,
+                model=MODEL,
+                temperature=TEMPERATURE,
                 response_format={"type": "json_object"}
             )
 
             # 3. Parse Response
-            response_text = chat_completion.choices[0].message.content
+            response_text = completion_text(chat_completion)
             plan = json.loads(response_text)
+            await asyncio.to_thread(response_cache.put, "decision", cache_key, plan)
             return plan
 
         except Exception as e:
@@ -0,0 +1,182 @@
+import os
+import time
+import asyncio
+import threading
+from collections import deque
+
+import numpy as np
+from qdrant_client.models import QueryRequest
+
+from agents.intel_store import LIVE_COLLECTION
+from agents.memory import intel_filter
+from agents.fingerprint import hamming
+from agents.tracing import tracer
+
+
+class IntelDeduplicator:
+    """
+    Ingest-path dedup for live_intel, scoped to one location and a time window.
+
+    1. Images: dHash against recently stored frames for the location (no I/O).
+    2. Any modality: nearest neighbour of the fresh vector in live_intel
+       (same location/type, inside the window) above a cosine threshold.
+    A duplicate is merged into the existing point (hit_count, last_seen)
+    instead of being written as a new one.
+    """
+
+    def __init__(self, client, collection=LIVE_COLLECTION):
+        self.client = client
+        self.collection = collection
+        self.enabled = os.getenv("DEDUP_ENABLED", "1") != "0"
+        self.window_seconds = float(os.getenv("DEDUP_WINDOW_SECONDS", "300"))
+        self.hash_distance = int(os.getenv("DEDUP_HASH_DISTANCE", "6"))
+        self.thresholds = {
+            "image": float(os.getenv("DEDUP_IMAGE_THRESHOLD", "0.97")),
+            "audio": float(os.getenv("DEDUP_TEXT_THRESHOLD", "0.95"))
+        }
+
+        self.recent = {}   # location -> deque of {"ts", "id", "type", "dhash", "hit_count"}
+        self._lock = threading.Lock()
+        self.stats = {"checked": 0, "duplicates": 0, "by_hash": 0, "by_vector": 0, "in_batch": 0, "stored": 0}
+
+    # --- CHECK ---
+    async def check(self, kind, processed_data, location):
+        """
+        Input: modality, Perception output, location
+        Output: The existing point this one duplicates ({"id", "hit_count"}), or None
+        """
+        return (await self.check_batch([(kind, processed_data)], location))[0]
+
+    async def check_batch(self, items, location):
+        """
+        Input: [(modality, Perception output)] for one location
+        Output: One entry per item: {"id", "hit_count"} of the point it
+        duplicates (possibly an earlier item of the same batch), or None
+        """
+        if not self.enabled:
+            return [None] * len(items)
+
+        now = time.time()
+        self.stats["checked"] += len(items)
+        matches = [self._hash_match(location, kind, data.get("dhash"), now) for kind, data in items]
+
+        # One batched nearest-neighbour request for everything the hashes didn't catch
+        pending = [i for i, match in enumerate(matches) if match is None]
+        if pending:
+            for i, match in zip(pending, await asyncio.to_thread(self._vector_matches, [items[i] for i in pending], location)):
+                if match is not None:
+                    matches[i] = match
+                    self.stats["by_vector"] += 1
+
+        # Near-duplicates inside the batch itself (e.g. a burst of frames)
+        accepted = {}
+        for i, (kind, data) in enumerate(items):
+            if matches[i] is not None:
+                continue
+            vector = np.asarray(data["vector"], dtype=np.float32)
+            vector = vector / (np.linalg.norm(vector) or 1.0)
+            for j, other in accepted.get(kind, []):
+                if float(vector @ other) >= self.thresholds.get(kind, 1.0):
+                    matches[i] = {"batch_index": j}
+                    self.stats["in_batch"] += 1
+                    break
+            else:
+                accepted.setdefault(kind, []).append((i, vector))
+
+        self.stats["duplicates"] += sum(1 for match in matches if match is not None)
+        return matches
+
+    def _hash_match(self, location, kind, fingerprint, now):
+        if not fingerprint:
+            return None
+        with self._lock:
+            entries = self._prune(location, now)
+            for entry in entries:
+                if entry["type"] == kind and entry["dhash"] and hamming(entry["dhash"], fingerprint) <= self.hash_distance:
+                    self.stats["by_hash"] += 1
+                    return entry
+        return None
+
+    def _vector_matches(self, items, location):
+        requests = [
+            QueryRequest(
+                query=data["vector"],
+                using="image_vec" if kind == "image" else "text_vec",
+                filter=intel_filter(location, kind, self.window_seconds / 60),
+                score_threshold=self.thresholds.get(kind, 1.0),
+                limit=1,
+                with_payload=["hit_count"]
+            )
+            for kind, data in items
+        ]
+        try:
+            vector_names = "+".join(sorted({request.using for request in requests}))
+            with tracer.span("qdrant.query_batch", collection=self.collection, vector=vector_names, requests=len(requests)):
+                responses = self.client.query_batch_points(collection_name=self.collection, requests=requests)
+        except Exception as e:
+            print(f"⚠️ Dedup lookup failed ({e}). Storing as new intel.")
+            return [None] * len(items)
+        return [
+            {"id": str(r.points[0].id), "hit_count": (r.points[0].payload or {}).get("hit_count", 1)} if r.points else None
+            for r in responses
+        ]
+
+    # --- WRITE ---
+    async def merge(self, match, location, seen_at=None):
+        """
+        Folds one more sighting into an existing point. Output: its new hit_count.
+        `timestamp` moves to the latest sighting (the original capture time is
+        kept in `first_seen`), so time-window recall, the dedup window and
+        retention all treat a point that keeps being re-seen as fresh.
+        """
+        seen_at = seen_at or time.time()
+        with self._lock:
+            entries = self.recent.get(location)
+            entry = next((e for e in entries or () if e["id"] == match["id"]), None)
+            hit_count = (entry or match).get("hit_count", 1) + 1
+            if entry is not None:
+                # Re-queue at the back so pruning (oldest first) stays in order
+                entries.remove(entry)
+                entry.update(hit_count=hit_count, ts=seen_at)
+                entries.append(entry)
+            else:
+                match["hit_count"] = hit_count
+
+        await asyncio.to_thread(
+            self.client.set_payload,
+            collection_name=self.collection,
+            payload={"hit_count": hit_count, "last_seen": seen_at, "timestamp": seen_at},
+            points=[match["id"]],
+            wait=False
+        )
+        return hit_count
+
+    def remember(self, points):
+        """Registers freshly stored points for the hash check."""
+        with self._lock:
+            for point in points:
+                payload = point.payload
+                self._prune(payload["location"], time.time()).append({
+                    "ts": payload["timestamp"],
+                    "id": str(point.id),
+                    "type": payload["type"],
+                    "dhash": payload.get("dhash"),
+                    "hit_count": payload.get("hit_count", 1)
+                })
+                self.stats["stored"] += 1
+
+    def _prune(self, location, now):
+        # Caller holds self._lock
+        entries = self.recent.setdefault(location, deque())
+        while entries and entries[0]["ts"] < now - self.window_seconds:
+            entries.popleft()
+        return entries
+
+    def report(self):
+        checked = self.stats["checked"]
+        return dict(
+            self.stats,
+            enabled=self.enabled,
+            dedup_rate=round(self.stats["duplicates"] / checked, 3) if checked else 0.0,
+            tracked_locations=len(self.recent)
+        )
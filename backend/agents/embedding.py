@@ -0,0 +1,160 @@
+import os
+import time
+import queue
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+
+from agents.models import model_registry
+from agents.tracing import tracer
+
+
+class EmbeddingEngine:
+    """
+    Central micro-batching encoder.
+
+    Concurrent encode requests for the same model are collected into one
+    batch (capped by EMBED_MAX_BATCH items or EMBED_MAX_WAIT_MS of waiting)
+    and run on a worker pool, so request handlers never call
+    SentenceTransformer.encode inline.
+    """
+
+    def __init__(self, max_batch=None, max_wait_ms=None, workers=None, window=1024):
+        self.max_batch = max_batch or int(os.getenv("EMBED_MAX_BATCH", "32"))
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else float(os.getenv("EMBED_MAX_WAIT_MS", "5"))) / 1000.0
+        self.pool = ThreadPoolExecutor(
+            max_workers=workers or int(os.getenv("EMBED_WORKERS", "2")),
+            thread_name_prefix="embed"
+        )
+
+        self._models = {}
+        self._queues = {}
+        self._lock = threading.Lock()
+
+        # Metrics (rolling window + lifetime totals, per model)
+        self._window = window
+        self._metrics = {}
+
+    # --- MODEL REGISTRATION ---
+    def register(self, name, model):
+        """Overrides the registry model for `name` (e.g. a stub in benchmarks)."""
+        with self._lock:
+            self._models[name] = model
+
+    # --- PUBLIC API ---
+    def submit(self, name, item):
+        """
+        Input: Model name + one item (text string or PIL image)
+        Output: concurrent.futures.Future resolving to a list of floats
+        """
+        future = Future()
+        self._queue_for(name).put((item, future, time.perf_counter()))
+        return future
+
+    def encode(self, name, item):
+        """Blocking helper for sync code paths (runs in FastAPI's threadpool)."""
+        return self.submit(name, item).result()
+
+    async def aencode(self, name, item):
+        """Awaitable helper for async handlers; never blocks the event loop."""
+        return await asyncio.wrap_future(self.submit(name, item))
+
+    def stats(self):
+        """Batch-size and queue-latency metrics per model."""
+        report = {
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "models": {}
+        }
+        with self._lock:
+            snapshot = {name: dict(m, sizes=list(m["sizes"]), waits=list(m["waits"])) for name, m in self._metrics.items()}
+
+        for name, m in snapshot.items():
+            sizes = np.array(m["sizes"] or [0], dtype=np.float64)
+            waits = np.array(m["waits"] or [0.0], dtype=np.float64) * 1000.0
+            report["models"][name] = {
+                "batches": m["batches"],
+                "items": m["items"],
+                "errors": m["errors"],
+                "batch_size": {
+                    "mean": round(float(sizes.mean()), 2),
+                    "p50": float(np.percentile(sizes, 50)),
+                    "max": float(sizes.max())
+                },
+                "queue_latency_ms": {
+                    "mean": round(float(waits.mean()), 3),
+                    "p50": round(float(np.percentile(waits, 50)), 3),
+                    "p95": round(float(np.percentile(waits, 95)), 3),
+                    "p99": round(float(np.percentile(waits, 99)), 3)
+                }
+            }
+        return report
+
+    # --- INTERNALS ---
+    def _queue_for(self, name):
+        with self._lock:
+            q = self._queues.get(name)
+            if q is None:
+                q = queue.Queue()
+                self._queues[name] = q
+                self._metrics[name] = {
+                    "batches": 0, "items": 0, "errors": 0,
+                    "sizes": deque(maxlen=self._window),
+                    "waits": deque(maxlen=self._window)
+                }
+                threading.Thread(
+                    target=self._collect, args=(name, q),
+                    name=f"embed-collector-{name}", daemon=True
+                ).start()
+            return q
+
+    def _collect(self, name, q):
+        # One collector per model: wait for a first item, then keep
+        # draining the queue until the batch is full or the window closes.
+        while True:
+            batch = [q.get()]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(q.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self.pool.submit(self._run_batch, name, batch)
+
+    def _run_batch(self, name, batch):
+        started = time.perf_counter()
+        batch = [entry for entry in batch if entry[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        metrics = self._metrics[name]
+        with self._lock:
+            metrics["batches"] += 1
+            metrics["items"] += len(batch)
+            metrics["sizes"].append(len(batch))
+            metrics["waits"].extend(started - enqueued for _, _, enqueued in batch)
+
+        try:
+            # Lazy: the first batch for a model triggers its (single) load
+            model = self._models.get(name) or model_registry.get(name)
+            with tracer.span("embedding.batch", model=name, batch_size=len(batch)):
+                vectors = model.encode([item for item, _, _ in batch], batch_size=len(batch))
+            for (_, future, _), vector in zip(batch, vectors):
+                future.set_result(vector.tolist())
+        except Exception as e:
+            print(f"❌ Embedding Error ({name}): {e}")
+            with self._lock:
+                metrics["errors"] += 1
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+
+# Singleton (shared by Perception + Memory agents)
+embedding_engine = EmbeddingEngine()
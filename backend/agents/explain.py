@@ -1,75 +1,205 @@
-import os
 import json
+import asyncio
 from dotenv import load_dotenv
-from groq import Groq
+
+from agents.llm import llm_gateway, completion_text
+from agents.llm_cache import response_cache, incident_ids
+from agents.context import context_builder
 
 load_dotenv()
 
+MODEL = "llama-3.3-70b-versatile" # Using the working model
+TEMPERATURE = 0.3
+PROMPT_VERSION = 2  # Part of the response-cache key: bump when the prompt template changes
+SYSTEM_PROMPT = "You provide clear, evidence-based reasoning. Output JSON only."
+
 class ExplainabilityAgent:
     def __init__(self):
         print("🔍 Explainability Agent: Loaded transparency protocols.")
-        
-        api_key = os.getenv("GROQ_API_KEY")
-        if not api_key:
+
+        self.client = llm_gateway
+        if not self.client.configured:
             print("❌ EXPLAIN ERROR: GROQ_API_KEY is missing.")
-            self.client = None
-        else:
-            self.client = Groq(api_key=api_key)
 
-    def explain_decision(self, plan, risk_data, past_incidents):
+    def summarize_evidence(self, past_incidents):
+        """
+        Evidence block shared by the full and the speculative (draft) prompts,
+        and by the Decision Agent (see agents/context.py).
+        """
+        return context_builder.evidence(past_incidents)
+
+    async def explain_decision(self, plan, risk_data, past_incidents, evidence=None):
         """
         Generates a natural language explanation for the strategic plan.
         """
         # Fallback if Groq is down
-        if not self.client:
-            return {
-                "summary": "AI rationale unavailable (API Key missing).",
-                "citations": ["Reference to historical data unavailable."]
-            }
+        if not self.client.configured:
+            return _unavailable()
 
-        # 1. Summarize History for the prompt
-        evidence_summary = ""
-        for inc in past_incidents:
-            evidence_summary += f"- {inc.get('incident')} (Outcome: {inc.get('outcome')})\n"
+        # 1. Summarize History + the plan for the prompt (compact, not the raw JSON)
+        evidence = evidence or self.summarize_evidence(past_incidents)
+        plan_summary, plan_saved = context_builder.compact_plan(plan)
 
         prompt = f"""
         You are the Transparency Officer for an AI Crisis System.
-        
-        THE DECISION PLAN: {json.dumps(plan)}
+
+        THE DECISION PLAN:
+        {plan_summary}
         THE RISK ASSESSMENT: Level {risk_data.get('level')} (Score {risk_data.get('score')})
         THE EVIDENCE (Past Events):
-        {evidence_summary}
-        
+        {evidence["text"]}
+
         TASK:
-        Write a concise, 2-sentence explanation of WHY this plan was recommended. 
+        Write a concise, 2-sentence explanation of WHY this plan was recommended.
         Explicitly cite the past events as the reason.
-        
+
         OUTPUT FORMAT (JSON):
         {{
             "narrative": "Recommended X because in the [Year] [Event Name], Y happened...",
             "confidence_reasoning": "High confidence due to 90% match with past data."
         }}
         """
+        context_builder.record("explain", SYSTEM_PROMPT + prompt, evidence["raw_tokens"] - evidence["tokens"] + plan_saved)
+        cache_key = self._cache_key("explain", plan, risk_data, past_incidents)
+        return await self._complete(prompt, risk_data, past_incidents, cache_key)
+
+    async def draft_explanation(self, risk_data, past_incidents, evidence=None):
+        """
+        Speculative mode: drafts the explanation from risk + evidence alone so it
+        can run in parallel with plan generation. Pair with refine_explanation().
+        """
+        if not self.client.configured:
+            return _unavailable()
+
+        evidence = evidence or self.summarize_evidence(past_incidents)
+
+        prompt = f"""
+        You are the Transparency Officer for an AI Crisis System.
+
+        THE RISK ASSESSMENT: Level {risk_data.get('level')} (Score {risk_data.get('score')})
+        THE EVIDENCE (Past Events):
+        {evidence["text"]}
+
+        TASK:
+        A response plan is being drafted in parallel. Write a concise, 2-sentence
+        explanation of WHY this risk level calls for immediate action.
+        Explicitly cite the past events as the reason.
+
+        OUTPUT FORMAT (JSON):
+        {{
+            "narrative": "Immediate action is warranted because in the [Year] [Event Name], Y happened...",
+            "confidence_reasoning": "High confidence due to 90% match with past data."
+        }}
+        """
+        context_builder.record("draft", SYSTEM_PROMPT + prompt, evidence["raw_tokens"] - evidence["tokens"])
+        cache_key = self._cache_key("draft", None, risk_data, past_incidents)
+        return await self._complete(prompt, risk_data, past_incidents, cache_key)
+
+    async def refine_explanation(self, draft, plan, risk_data, past_incidents):
+        """
+        Speculative mode, once the plan is ready: a short refine pass rewrites
+        the draft so it justifies this specific plan. The prompt is only the
+        draft + the compact plan (no evidence), so it costs far less than a
+        full explain_decision call. Falls back to the unrefined draft.
+        """
+        if not self.client.configured or not isinstance(plan, dict) or "error" in plan or "narrative" not in draft:
+            return self.attach_plan(draft, plan, refined=False)
+
+        plan_summary, _ = context_builder.compact_plan(plan)
+        prompt = f"""
+        You are the Transparency Officer for an AI Crisis System.
+
+        DRAFT EXPLANATION (written before the plan was final):
+        {draft.get("narrative")}
+
+        THE FINAL PLAN:
+        {plan_summary}
+
+        TASK:
+        Rewrite the draft as a concise, 2-sentence explanation of WHY this plan
+        was recommended. Keep the past events it cites; tie them to the plan's actions.
+
+        OUTPUT FORMAT (JSON):
+        {{
+            "narrative": "Recommended X because in the [Year] [Event Name], Y happened...",
+            "confidence_reasoning": {json.dumps(draft.get("confidence_reasoning", ""))}
+        }}
+        """
+        context_builder.record("refine", SYSTEM_PROMPT + prompt, 0)
+        cache_key = self._cache_key("refine", plan, risk_data, past_incidents, draft=draft.get("narrative"))
+        refined = await self._complete(prompt, risk_data, past_incidents, cache_key, fallback=draft)
+        return self.attach_plan(refined, plan, refined=refined is not draft)
+
+    def attach_plan(self, draft, plan, refined=False):
+        """Tags a speculative explanation with the plan it explains."""
+        explanation = dict(draft)
+        explanation["plan_reference"] = _plan_headline(plan)
+        explanation["mode"] = "speculative"
+        explanation["refined"] = refined
+        return explanation
+
+    def _cache_key(self, variant, plan, risk_data, past_incidents, draft=None):
+        return response_cache.make_key(
+            variant=variant,
+            draft=draft,
+            prompt_version=PROMPT_VERSION,
+            model=MODEL,
+            temperature=TEMPERATURE,
+            system=SYSTEM_PROMPT,
+            plan=plan,
+            risk_level=risk_data.get('level'),
+            risk_score=risk_data.get('score'),
+            incident_ids=incident_ids(past_incidents)
+        )
+
+    async def _complete(self, prompt, risk_data, past_incidents, cache_key, fallback=None):
+        cached = await asyncio.to_thread(response_cache.get, "explain", cache_key)
+        if cached is not None:
+            print("⚡ Explainability Agent: Served explanation from response cache.")
+            return cached
 
         try:
-            chat_completion = self.client.chat.completions.create(
+            chat_completion = await self.client.chat(
                 messages=[
-                    {"role": "system", "content": "You provide clear, evidence-based reasoning. Output JSON only."},
+                    {"role": "system", "content": SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
-                model="llama-3.3-70b-versatile", # Using the working model
-                temperature=0.3,
+                model=MODEL,
+                temperature=TEMPERATURE,
                 response_format={"type": "json_object"}
             )
 
-            return json.loads(chat_completion.choices[0].message.content)
+            explanation = json.loads(completion_text(chat_completion))
+            await asyncio.to_thread(response_cache.put, "explain", cache_key, explanation)
+            return explanation
 
         except Exception as e:
             print(f"❌ Explanation Error: {e}")
+            if fallback is not None:
+                return fallback
             # Robust Fallback - If AI fails, return a template
             return {
                 "narrative": f"Plan generated based on {risk_data.get('level')} risk factors and {len(past_incidents)} similar historical records.",
                 "confidence_reasoning": "Fallback explanation due to API error."
             }
 
-explain_agent = ExplainabilityAgent()
\ No newline at end of file
+
+def _unavailable():
+    return {
+        "summary": "AI rationale unavailable (API Key missing).",
+        "citations": ["Reference to historical data unavailable."]
+    }
+
+def _plan_headline(plan):
+    # The plan is free-form JSON: cite its first list of actions, else its first text field
+    if not isinstance(plan, dict) or "error" in plan:
+        return None
+    for value in plan.values():
+        if isinstance(value, list) and value:
+            return [str(v) if not isinstance(v, dict) else json.dumps(v) for v in value[:3]]
+    for value in plan.values():
+        if isinstance(value, str):
+            return value
+    return None
+
+explain_agent = ExplainabilityAgent()
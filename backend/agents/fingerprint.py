@@ -0,0 +1,15 @@
+import numpy as np
+
+
+def dhash(img, size=8):
+    """
+    Difference hash: 64-bit perceptual fingerprint that survives re-encoding,
+    small crops and lighting drift. Input: PIL image. Output: 16-char hex.
+    """
+    pixels = np.asarray(img.convert("L").resize((size + 1, size)), dtype=np.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).flatten()
+    return f"{int(''.join('1' if b else '0' for b in bits), 2):0{size * size // 4}x}"
+
+
+def hamming(a, b):
+    return bin(int(a, 16) ^ int(b, 16)).count("1")
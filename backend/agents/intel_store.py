@@ -0,0 +1,79 @@
+import os
+import time
+import uuid
+import asyncio
+from qdrant_client.models import PointStruct
+
+from agents.tracing import tracer
+
+LIVE_COLLECTION = "live_intel"
+
+
+class IntelStore:
+    """
+    Write path for `live_intel`: turns Perception output into points and
+    upserts them, one at a time (/ingest) or in chunked, parallel batches
+    (/ingest/batch).
+    """
+
+    def __init__(self, client, collection=LIVE_COLLECTION):
+        self.client = client
+        self.collection = collection
+        self.chunk_size = int(os.getenv("INGEST_UPSERT_CHUNK", "64"))
+        self.parallel_chunks = int(os.getenv("INGEST_UPSERT_PARALLEL", "4"))
+
+    def build_point(self, kind, processed_data, location, extra_payload=None):
+        """
+        Input: modality ("image"/"audio"), Perception output, location
+        Output: PointStruct with named vectors + payload
+        """
+        # Each point only stores the named vector it actually has (no
+        # zero-padded dummies: they waste RAM and degrade the COSINE graph)
+        vector_name = "image_vec" if kind == "image" else "text_vec"
+        vector_struct = {vector_name: processed_data["vector"]}
+
+        now = time.time()
+        payload = {
+            "type": kind,
+            "description": processed_data["description"],
+            "location": location,
+            "timestamp": now,        # Latest sighting (refreshed when duplicates merge in)
+            "first_seen": now,
+            "processed_by": "PerceptionAgent_v1",
+            "hit_count": 1  # Bumped when near-duplicates are merged in (see agents/dedup.py)
+        }
+        if processed_data.get("dhash"):
+            payload["dhash"] = processed_data["dhash"]
+        payload.update(extra_payload or {})
+        return PointStruct(id=str(uuid.uuid4()), vector=vector_struct, payload=payload)
+
+    async def store(self, point):
+        """Single point, acknowledged write (network call kept off the event loop)."""
+        with tracer.span("qdrant.upsert", collection=self.collection, vector=vector_names([point]), points=1):
+            await asyncio.to_thread(self.client.upsert, collection_name=self.collection, points=[point])
+        return point.id
+
+    async def store_batch(self, points, wait=False):
+        """
+        Chunked upserts, up to `parallel_chunks` in flight at once.
+        wait=False is safe here: every point is a fresh UUID, so nothing
+        reads them back within the same request.
+        Output: number of upsert calls made
+        """
+        chunks = [points[i:i + self.chunk_size] for i in range(0, len(points), self.chunk_size)]
+        gate = asyncio.Semaphore(self.parallel_chunks)
+
+        async def upsert(chunk):
+            async with gate:
+                with tracer.span("qdrant.upsert", collection=self.collection, vector=vector_names(chunk), points=len(chunk)):
+                    await asyncio.to_thread(
+                        self.client.upsert, collection_name=self.collection, points=chunk, wait=wait
+                    )
+
+        await asyncio.gather(*(upsert(chunk) for chunk in chunks))
+        return len(chunks)
+
+
+def vector_names(points):
+    """Span label for the named vectors in a write, e.g. "image_vec+text_vec"."""
+    return "+".join(sorted({name for point in points for name in (point.vector or {})}))
@@ -0,0 +1,139 @@
+import re
+import math
+import threading
+from collections import Counter
+
+import numpy as np
+
+# Payload fields that carry searchable incident text
+TEXT_FIELDS = ("description", "incident_name", "outcome", "action_taken")
+
+
+def tokenize(text):
+    """
+    'Evacuated Sector 4, toxic cloud' ->
+    ['evacuated', 'sector', '4', 'toxic', 'cloud', 'evacuated sector', 'sector 4', 'toxic cloud']
+
+    Unigrams plus adjacent bigrams, so exact phrases like "Sector 4" score as one term.
+    """
+    words = re.findall(r"\w+", (text or "").lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def payload_text(payload):
+    return " ".join(str(payload[field]) for field in TEXT_FIELDS if payload.get(field))
+
+
+class KeywordIndex:
+    """
+    In-process BM25 index over the incident payload text of one collection.
+
+    Complements dense recall on exact operational terms (sector numbers,
+    chemical names, "flashover") that embeddings tend to blur.
+    """
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+
+        self.ids = []
+        self.payloads = []
+        self.lengths = []
+        self.doc_terms = []
+        self.postings = {}   # term -> {doc: term frequency}
+        self._positions = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.ids)
+
+    # --- BUILD / SYNC ---
+    def add(self, ids, payloads):
+        """Adds (or replaces) points, indexing their TEXT_FIELDS."""
+        with self._lock:
+            for point_id, payload in zip(ids, payloads):
+                point_id = str(point_id)
+                payload = payload or {}
+                terms = Counter(tokenize(payload_text(payload)))
+
+                doc = self._positions.get(point_id)
+                if doc is None:
+                    doc = self._positions[point_id] = len(self.ids)
+                    self.ids.append(point_id)
+                    self.payloads.append(payload)
+                    self.lengths.append(0)
+                    self.doc_terms.append(())
+                else:
+                    for term in self.doc_terms[doc]:
+                        self.postings[term].pop(doc, None)
+                    self.payloads[doc] = payload
+
+                self.lengths[doc] = sum(terms.values())
+                self.doc_terms[doc] = tuple(terms)
+                for term, tf in terms.items():
+                    self.postings.setdefault(term, {})[doc] = tf
+        return len(ids)
+
+    def load_from_qdrant(self, client, collection, batch_size=256):
+        """Builds the index from the collection's payloads via scroll."""
+        offset = None
+        while True:
+            points, offset = client.scroll(
+                collection_name=collection,
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=False
+            )
+            self.add([p.id for p in points], [p.payload for p in points])
+            if offset is None:
+                break
+        return len(self)
+
+    # --- QUERY ---
+    def search(self, query_text, limit=3):
+        """
+        Input: Query text
+        Output: List of (id, BM25 score, payload), best first (only docs sharing a term)
+        """
+        terms = set(tokenize(query_text))
+        with self._lock:
+            n = len(self.ids)
+            if not n or not terms:
+                return []
+
+            lengths = np.asarray(self.lengths, dtype=np.float64)
+            norm = self.k1 * (1 - self.b + self.b * lengths / max(lengths.mean(), 1e-9))
+            scores = np.zeros(n)
+            for term in terms:
+                term_docs = self.postings.get(term)
+                if not term_docs:
+                    continue
+                idf = math.log(1 + (n - len(term_docs) + 0.5) / (len(term_docs) + 0.5))
+                docs = np.fromiter(term_docs.keys(), dtype=np.int64, count=len(term_docs))
+                tf = np.fromiter(term_docs.values(), dtype=np.float64, count=len(term_docs))
+                scores[docs] += idf * tf * (self.k1 + 1) / (tf + norm[docs])
+
+            matched = np.flatnonzero(scores)
+            if not len(matched):
+                return []
+            k = min(limit, len(matched))
+            top = matched[np.argpartition(-scores[matched], k - 1)[:k]]
+            top = top[np.argsort(-scores[top])]
+            return [(self.ids[i], float(scores[i]), self.payloads[i]) for i in top]
+
+
+def rrf_fuse(rankings, limit=3, k=60):
+    """
+    Reciprocal rank fusion.
+    Input: Several ranked hit lists of (id, score, payload)
+    Output: [(id, fused score, payload)], best first
+    """
+    fused, payloads = {}, {}
+    for hits in rankings:
+        for rank, (point_id, _, payload) in enumerate(hits):
+            point_id = str(point_id)
+            fused[point_id] = fused.get(point_id, 0.0) + 1.0 / (k + rank + 1)
+            payloads.setdefault(point_id, payload)
+    best = sorted(fused.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return [(point_id, score, payloads[point_id]) for point_id, score in best]
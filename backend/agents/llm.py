@@ -0,0 +1,168 @@
+import os
+import random
+import asyncio
+import httpx
+from dotenv import load_dotenv
+
+from agents.tracing import tracer, current_span
+
+load_dotenv()
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class LLMError(Exception):
+    """Raised when a completion fails after all retries (or hits its deadline)."""
+
+
+class LLMGateway:
+    """
+    Shared async client for Groq's OpenAI-compatible chat API.
+
+    - One pooled HTTP connection for every agent
+    - Semaphore caps in-flight completions (LLM_MAX_CONCURRENCY)
+    - Retries 429/5xx with jittered exponential backoff, honouring
+      Retry-After / x-ratelimit-reset-* headers
+    - Hard deadline per call (LLM_DEADLINE_SECONDS), retries included
+
+    Point GROQ_BASE_URL at a local stub server to run with no network.
+    """
+
+    def __init__(self):
+        self.api_key = os.getenv("GROQ_API_KEY")
+        self.base_url = os.getenv("GROQ_BASE_URL", "https://api.groq.com/openai/v1").rstrip("/")
+        self.max_concurrency = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+        self.max_retries = int(os.getenv("LLM_MAX_RETRIES", "3"))
+        self.deadline = float(os.getenv("LLM_DEADLINE_SECONDS", "30"))
+        self.backoff_base = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "0.5"))
+        self.backoff_cap = float(os.getenv("LLM_BACKOFF_CAP_SECONDS", "8"))
+
+        # Created lazily so they bind to the running event loop
+        self._client = None
+        self._semaphore = None
+
+        self.stats = {"calls": 0, "retries": 0, "failures": 0}
+
+    @property
+    def configured(self):
+        return bool(self.api_key)
+
+    def _http(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                limits=httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency),
+                timeout=httpx.Timeout(self.deadline, connect=5.0)
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def chat(self, messages, model, temperature=0.1, response_format=None):
+        """
+        Input: OpenAI-style messages + model settings
+        Output: Parsed completion JSON (dict)
+        """
+        if not self.configured:
+            raise LLMError("GROQ_API_KEY is missing.")
+
+        body = {"model": model, "messages": messages, "temperature": temperature}
+        if response_format:
+            body["response_format"] = response_format
+
+        self.stats["calls"] += 1
+        with tracer.span("llm.chat", model=model) as span:
+            try:
+                completion = await asyncio.wait_for(self._chat_with_retries(body), timeout=self.deadline)
+            except asyncio.TimeoutError:
+                self.stats["failures"] += 1
+                raise LLMError(f"Deadline of {self.deadline}s exceeded")
+            except LLMError:
+                self.stats["failures"] += 1
+                raise
+
+            # Token usage as reported by the provider (OpenAI-style `usage` block)
+            usage = completion.get("usage") or {}
+            for key in ("prompt_tokens", "completion_tokens", "total_tokens"):
+                span.set(key, usage.get(key))
+            return completion
+
+    async def _chat_with_retries(self, body):
+        client = self._http()
+        attempt = 0
+        while True:
+            async with self._semaphore:
+                try:
+                    response = await client.post("/chat/completions", json=body)
+                except httpx.TransportError as e:
+                    response, error = None, e
+                else:
+                    error = None
+                    if response.status_code < 400:
+                        return response.json()
+
+            retryable = response is None or response.status_code in RETRYABLE_STATUS
+            if not retryable or attempt >= self.max_retries:
+                detail = str(error) if response is None else f"HTTP {response.status_code}: {response.text[:200]}"
+                raise LLMError(detail)
+
+            # Backoff happens outside the semaphore so waiting calls don't hold a slot
+            delay = self._retry_delay(response, attempt)
+            attempt += 1
+            self.stats["retries"] += 1
+            current_span().add("retries")
+            print(f"⏳ LLM Gateway: retry {attempt}/{self.max_retries} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    def _retry_delay(self, response, attempt):
+        # Full jitter: random(0, min(cap, base * 2^attempt))
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+        if response is None:
+            return delay
+
+        hinted = _parse_seconds(response.headers.get("retry-after"))
+        if hinted is None and response.status_code == 429:
+            hinted = _parse_seconds(response.headers.get("x-ratelimit-reset-requests")) \
+                or _parse_seconds(response.headers.get("x-ratelimit-reset-tokens"))
+        return max(delay, hinted or 0.0)
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def _parse_seconds(value):
+    """'2' -> 2.0, '1.5s' -> 1.5, '250ms' -> 0.25, '1m30s' -> 90.0"""
+    if not value:
+        return None
+    value = value.strip().lower()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    total, number = 0.0, ""
+    units = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+    i = 0
+    while i < len(value):
+        ch = value[i]
+        if ch.isdigit() or ch == ".":
+            number += ch
+            i += 1
+            continue
+        unit = "ms" if value[i:i + 2] == "ms" else ch
+        if unit not in units or not number:
+            return None
+        total += float(number) * units[unit]
+        number = ""
+        i += len(unit)
+    return total if not number else None
+
+
+def completion_text(completion):
+    return completion["choices"][0]["message"]["content"]
+
+
+# Singleton (shared by Decision + Explainability agents)
+llm_gateway = LLMGateway()
@@ -0,0 +1,123 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+from contextlib import closing
+
+
+class ResponseCache:
+    """
+    Persistent LLM response cache on SQLite (WAL mode), so several uvicorn
+    workers can share it. Entries expire after `ttl` seconds and the least
+    recently used ones are evicted past `max_entries`. Hit/miss counters are
+    stored per agent in the same database.
+    """
+
+    def __init__(self, path=None, ttl=None, max_entries=None):
+        self.enabled = os.getenv("LLM_CACHE_ENABLED", "1") != "0"
+        self.path = path or os.getenv("LLM_CACHE_PATH", ".aura_cache/llm_responses.sqlite3")
+        self.ttl = ttl or float(os.getenv("LLM_CACHE_TTL_SECONDS", "3600"))
+        self.max_entries = max_entries or int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+        self._ready = False
+
+    # --- KEYS ---
+    @staticmethod
+    def make_key(**parts):
+        """Canonical hash of the prompt inputs (order-independent, whitespace-normalized)."""
+        def canon(value):
+            if isinstance(value, str):
+                return " ".join(value.split())
+            if isinstance(value, dict):
+                return {k: canon(v) for k, v in value.items()}
+            if isinstance(value, (list, tuple)):
+                return [canon(v) for v in value]
+            return value
+
+        blob = json.dumps(canon(parts), sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    # --- READ / WRITE ---
+    def get(self, agent, key):
+        if not self.enabled:
+            return None
+        now = time.time()
+        with closing(self._connect()) as db, db:
+            row = db.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and now - row[1] > self.ttl:
+                db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row is not None:
+                db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self._count(db, agent, hit=row is not None)
+        return json.loads(row[0]) if row is not None else None
+
+    def put(self, agent, key, value):
+        if not self.enabled:
+            return
+        now = time.time()
+        with closing(self._connect()) as db, db:
+            db.execute(
+                "INSERT OR REPLACE INTO responses (key, agent, value, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, agent, json.dumps(value), now, now)
+            )
+            # Size bound: drop expired first, then least recently used
+            db.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+            excess = db.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+            if excess > 0:
+                db.execute(
+                    "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed ASC LIMIT ?)",
+                    (excess,)
+                )
+
+    def stats(self):
+        if not self.enabled:
+            return {"enabled": False}
+        with closing(self._connect()) as db:
+            size = db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            rows = db.execute("SELECT agent, hits, misses FROM stats").fetchall()
+
+        agents = {}
+        for agent, hits, misses in rows:
+            total = hits + misses
+            agents[agent] = {"hits": hits, "misses": misses, "hit_rate": round(hits / total, 3) if total else 0.0}
+        return {"enabled": True, "path": self.path, "entries": size, "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl, "agents": agents}
+
+    # --- INTERNALS ---
+    def _connect(self):
+        # Short-lived connections: safe across threads and worker processes
+        if not self._ready:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        db = sqlite3.connect(self.path, timeout=5.0)
+        if not self._ready:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY, agent TEXT, value TEXT, created REAL, accessed REAL
+                );
+                CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+                CREATE TABLE IF NOT EXISTS stats (
+                    agent TEXT PRIMARY KEY, hits INTEGER NOT NULL DEFAULT 0, misses INTEGER NOT NULL DEFAULT 0
+                );
+            """)
+            self._ready = True
+        return db
+
+    @staticmethod
+    def _count(db, agent, hit):
+        column = "hits" if hit else "misses"
+        db.execute(
+            f"INSERT INTO stats (agent, {column}) VALUES (?, 1) "
+            f"ON CONFLICT(agent) DO UPDATE SET {column} = {column} + 1",
+            (agent,)
+        )
+
+
+def incident_ids(past_incidents):
+    """Stable identity of an evidence set (point id, else name + year)."""
+    return [inc.get("id") or f"{inc.get('incident')}|{inc.get('year')}" for inc in past_incidents]
+
+
+# Singleton (shared by Decision + Explainability agents)
+response_cache = ResponseCache()
@@ -1,64 +1,441 @@
 import os
+import re
+import time
+import uuid
+import hashlib
+import threading
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from qdrant_client import QdrantClient
-from sentence_transformers import SentenceTransformer
+from qdrant_client.models import PointStruct, Filter, FieldCondition, HasIdCondition, MatchValue, Range, QueryRequest
+
+from agents.embedding import embedding_engine
+from agents.models import TEXT_MODEL, IMAGE_MODEL
+from agents.cache import LRUCache, TTLCache
+from agents.vector_index import LocalVectorIndex
+from agents.keyword_index import KeywordIndex, rrf_fuse
+from agents.intel_store import LIVE_COLLECTION
+from agents.quantization import search_params
+from agents.tracing import tracer
+from agents.vector_db import get_qdrant_client
 
 load_dotenv()
 
+HISTORY_COLLECTION = "historical_patterns"
+
 class MemoryAgent:
     def __init__(self):
         print("🧠 Memory Agent: Connecting to Knowledge Base...")
-        
-        # 1. Connect to Qdrant Cloud
-        self.client = QdrantClient(
-            url=os.getenv("QDRANT_URL"),
-            api_key=os.getenv("QDRANT_API_KEY")
+
+        # 1. Connect to Qdrant (Cloud, or local mode; the client is shared with the API)
+        self.client = get_qdrant_client()
+
+        # 2. Text Model is shared with Perception via the model registry
+
+        # 3. Two-level cache for repeated operator queries
+        # L1: normalized query text -> embedding
+        # L2: (embedding, limit, collection) -> recall results (expires, and is
+        #     invalidated whenever the collection is written to)
+        self.embedding_cache = LRUCache(maxsize=int(os.getenv("MEMORY_EMBED_CACHE_SIZE", "1024")))
+        self.recall_cache = TTLCache(
+            maxsize=int(os.getenv("MEMORY_RECALL_CACHE_SIZE", "512")),
+            ttl=float(os.getenv("MEMORY_RECALL_TTL_SECONDS", "30"))
+        )
+
+        # 4. Vector index mode: "qdrant" (remote search) or "local" (in-process
+        #    copy built from a collection snapshot, persisted to disk so recall
+        #    keeps working when Qdrant is unreachable)
+        self.index_mode = os.getenv("MEMORY_INDEX", "qdrant").lower()
+        self.snapshot_dir = os.getenv("MEMORY_SNAPSHOT_DIR", ".aura_index")
+        self.local_indexes = {}
+        self._index_lock = threading.Lock()
+
+        # 5. Retrieval: "dense" (text_vec only) or "hybrid" (dense + BM25 over
+        #    the payload text, merged by reciprocal rank fusion)
+        self.retrieval = os.getenv("MEMORY_RETRIEVAL", "dense").lower()
+        self.hybrid_candidates = int(os.getenv("MEMORY_HYBRID_CANDIDATES", "4"))
+        self.keyword_indexes = {}
+        self._keyword_pool = ThreadPoolExecutor(
+            max_workers=int(os.getenv("MEMORY_HYBRID_WORKERS", "4")), thread_name_prefix="keyword-search"
         )
-        
-        # 2. Load Text Model
-        self.text_model = SentenceTransformer('all-MiniLM-L6-v2')
         print("✅ Memory Agent: Ready to recall.")
 
-    def recall_patterns(self, query_text, limit=3):
+    def recall_patterns(self, query_text, limit=3, collection=HISTORY_COLLECTION):
         """
         Input: Description of current event
         Output: Top 3 similar past events from Qdrant
         """
         try:
             print(f"🧠 Thinking: Searching for '{query_text}'...")
-            
-            # 1. Turn query text into a vector
-            query_vector = self.text_model.encode(query_text).tolist()
-            
-            # 2. Search Qdrant using the Modern API (v1.10+)
-            # Note: We use 'query' instead of 'query_vector'
-            # We use 'using' to specify the named vector 'text_vec'
-            search_result = self.client.query_points(
-                collection_name="historical_patterns",
-                query=query_vector,      # <--- CORRECT ARGUMENT FOR v1.16
-                using="text_vec",        # <--- TARGETS THE TEXT VECTOR
-                limit=limit,
-                with_payload=True
-            )
-            
+
+            # 1. Turn query text into a vector (cached, else micro-batched)
+            query_vector = self._embed_query(query_text)
+
+            cache_key = (_vector_key(query_vector), limit, collection, self.retrieval)
+            cached = self.recall_cache.get(cache_key)
+            if cached is not None:
+                print(f"⚡ Recall cache hit ({len(cached)} matches).")
+                return [dict(r) for r in cached]
+
+            # 2. Search (dense, or dense + keywords)
+            if self.retrieval == "hybrid":
+                hits = self._search_hybrid(collection, query_text, query_vector, limit)
+            else:
+                hits = self._search_dense(collection, query_vector, limit)
+
             # 3. Format the results
-            # The new API returns an object with a .points attribute
-            results = []
-            for hit in search_result.points:
-                results.append({
-                    "score": round(hit.score, 2),
-                    "incident": hit.payload.get("incident_name", "Unknown"),
-                    "year": hit.payload.get("year", "N/A"),
-                    "outcome": hit.payload.get("outcome", "No data"),
-                    "action_taken": hit.payload.get("action_taken", "N/A")
-                })
-            
+            results = [_format_hit(point_id, score, payload) for point_id, score, payload in hits]
+
+            self.recall_cache.put(cache_key, results)
             print(f"✅ Found {len(results)} matches.")
-            return results
+            return [dict(r) for r in results]
 
         except Exception as e:
             print(f"❌ Memory Error: {e}")
             return []
 
+    def recall_intel(self, query_text, location=None, intel_type=None, window_minutes=None, limit=5):
+        """
+        Filtered recall over live_intel, e.g. "same location, last 30 minutes, image only".
+        Backed by the payload indexes created in init_memory.py.
+        """
+        try:
+            # Image intel lives in CLIP space: search it with CLIP's text encoder
+            if intel_type == "image":
+                vector_name = "image_vec"
+                query_vector = embedding_engine.encode(IMAGE_MODEL, query_text)
+            else:
+                vector_name = "text_vec"
+                query_vector = self._embed_query(query_text)
+
+            with tracer.span("qdrant.query", collection=LIVE_COLLECTION, vector=vector_name, limit=limit):
+                search_result = self.client.query_points(
+                    collection_name=LIVE_COLLECTION,
+                    query=query_vector,
+                    using=vector_name,
+                    query_filter=intel_filter(location, intel_type, window_minutes),
+                    search_params=search_params(LIVE_COLLECTION),
+                    limit=limit,
+                    with_payload=True
+                )
+            return [_format_intel(hit.id, hit.score, hit.payload) for hit in search_result.points]
+
+        except Exception as e:
+            print(f"❌ Memory Error (live intel): {e}")
+            return []
+
+    def recall_multimodal(self, query_text=None, image_vector=None, collection=LIVE_COLLECTION,
+                          location=None, window_minutes=None, limit=5):
+        """
+        Cross-modal recall: a text query, an image (CLIP vector) or both.
+        Input: query_text and/or image_vector, optional live_intel filters
+        Output: One ranked list fused over every named vector that was searched
+        """
+        try:
+            # 1. One query vector per (vector space, source); encodes run concurrently
+            pending = []
+            if query_text:
+                pending.append(("text_vec", "text", embedding_engine.submit(TEXT_MODEL, query_text)))
+                # CLIP's text tower lands in the same space as drone images
+                pending.append(("image_vec", "text", embedding_engine.submit(IMAGE_MODEL, query_text)))
+            if image_vector is not None:
+                pending.append(("image_vec", "image", None))
+            if not pending:
+                return []
+
+            queries = [
+                (vector_name, source, image_vector if future is None else future.result())
+                for vector_name, source, future in pending
+            ]
+
+            # 2. Every per-vector search in one batched Qdrant request
+            candidates = limit * self.hybrid_candidates
+            query_filter = intel_filter(location, None, window_minutes)
+            vector_names = "+".join(sorted({vector_name for vector_name, _, _ in queries}))
+            with tracer.span("qdrant.query_batch", collection=collection, vector=vector_names, requests=len(queries)):
+                responses = self.client.query_batch_points(
+                    collection_name=collection,
+                    requests=[
+                        QueryRequest(
+                            query=vector, using=vector_name, filter=query_filter,
+                            params=search_params(collection), limit=candidates, with_payload=True
+                        )
+                        for vector_name, _, vector in queries
+                    ]
+                )
+
+            # 3. Fuse
+            rankings = {
+                f"{vector_name}:{source}": [(hit.id, hit.score, hit.payload) for hit in response.points]
+                for (vector_name, source, _), response in zip(queries, responses)
+            }
+            fused = fuse_scores(rankings, limit=limit)
+
+            format_hit = _format_hit if collection == HISTORY_COLLECTION else _format_intel
+            return [
+                dict(format_hit(point_id, score, payload), matched=matched)
+                for point_id, score, payload, matched in fused
+            ]
+
+        except Exception as e:
+            print(f"❌ Memory Error (multimodal): {e}")
+            return []
+
+    def _search_dense(self, collection, query_vector, limit):
+        # In-process index or Qdrant
+        if self.index_mode == "local":
+            return self.local_index(collection).search(query_vector, limit)
+        return self._search_qdrant(collection, query_vector, limit)
+
+    def _search_hybrid(self, collection, query_text, query_vector, limit):
+        """
+        Dense and BM25 candidates fetched concurrently, merged by reciprocal
+        rank fusion. Hits keep their cosine score (the Risk Agent weighs by
+        similarity), only the order comes from the fusion.
+        """
+        candidates = limit * self.hybrid_candidates
+        keyword_future = self._keyword_pool.submit(
+            lambda: self.keyword_index(collection).search(query_text, candidates)
+        )
+        dense = self._search_dense(collection, query_vector, candidates)
+        try:
+            keyword = keyword_future.result()
+        except Exception as e:
+            print(f"⚠️ Keyword search failed ({e}). Using dense results only.")
+            keyword = []
+
+        fused = rrf_fuse([dense, keyword], limit=limit)
+
+        similarity = {str(point_id): score for point_id, score, _ in dense}
+        missing = [point_id for point_id, _, _ in fused if point_id not in similarity]
+        if missing:
+            similarity.update(self._dense_scores(collection, query_vector, missing))
+        return [(point_id, similarity.get(point_id, 0.0), payload) for point_id, _, payload in fused]
+
+    def _dense_scores(self, collection, query_vector, ids):
+        """Cosine scores for keyword-only hits that missed the dense candidates."""
+        try:
+            if self.index_mode == "local":
+                return self.local_index(collection).score(query_vector, ids)
+            with tracer.span("qdrant.query", collection=collection, vector="text_vec", limit=len(ids)):
+                search_result = self.client.query_points(
+                    collection_name=collection,
+                    query=query_vector,
+                    using="text_vec",
+                    query_filter=Filter(must=[HasIdCondition(has_id=ids)]),
+                    search_params=search_params(collection),
+                    limit=len(ids),
+                    with_payload=False
+                )
+            return {str(hit.id): hit.score for hit in search_result.points}
+        except Exception as e:
+            print(f"⚠️ Could not score keyword-only hits ({e}).")
+            return {}
+
+    def _search_qdrant(self, collection, query_vector, limit):
+        try:
+            # Search Qdrant using the Modern API (v1.10+)
+            # Note: We use 'query' instead of 'query_vector'
+            # We use 'using' to specify the named vector 'text_vec'
+            with tracer.span("qdrant.query", collection=collection, vector="text_vec", limit=limit):
+                search_result = self.client.query_points(
+                    collection_name=collection,
+                    query=query_vector,      # <--- CORRECT ARGUMENT FOR v1.16
+                    using="text_vec",        # <--- TARGETS THE TEXT VECTOR
+                    search_params=search_params(collection),  # Rescoring when quantized
+                    limit=limit,
+                    with_payload=True
+                )
+            # The new API returns an object with a .points attribute
+            return [(hit.id, hit.score, hit.payload) for hit in search_result.points]
+
+        except Exception as e:
+            # Link to Qdrant down: serve from the last local snapshot if there is one
+            if collection not in self.local_indexes and not os.path.exists(self._snapshot_path(collection)):
+                raise
+            print(f"⚠️ Qdrant query failed ({e}). Serving '{collection}' from local snapshot.")
+            return self.local_index(collection, allow_remote=False).search(query_vector, limit)
+
+    def local_index(self, collection=HISTORY_COLLECTION, allow_remote=True):
+        """
+        Returns the in-process index for `collection`, building it on first use
+        from a Qdrant snapshot (or the on-disk copy if Qdrant can't be reached).
+        """
+        with self._index_lock:
+            index = self.local_indexes.get(collection)
+            if index is not None:
+                return index
+
+            index = LocalVectorIndex(vector_name="text_vec", dim=384)
+            path = self._snapshot_path(collection)
+            try:
+                if not allow_remote:
+                    raise ConnectionError("remote snapshot skipped")
+                count = index.load_from_qdrant(self.client, collection)
+                index.save(path)
+                print(f"📥 Memory Agent: Indexed {count} '{collection}' points in-process.")
+            except Exception as e:
+                if not os.path.exists(path):
+                    raise
+                count = index.load(path)
+                print(f"💾 Memory Agent: Loaded {count} '{collection}' points from {path} ({e}).")
+
+            self.local_indexes[collection] = index
+            return index
+
+    def keyword_index(self, collection=HISTORY_COLLECTION):
+        """
+        Returns the BM25 index for `collection`, built on first use from the
+        collection's payloads (or the local snapshot if Qdrant can't be reached).
+        """
+        with self._index_lock:
+            index = self.keyword_indexes.get(collection)
+            if index is not None:
+                return index
+
+            index = KeywordIndex()
+            try:
+                count = index.load_from_qdrant(self.client, collection)
+                print(f"🔤 Memory Agent: Keyword-indexed {count} '{collection}' points.")
+            except Exception as e:
+                snapshot = self.local_indexes.get(collection)
+                if snapshot is None:
+                    if not os.path.exists(self._snapshot_path(collection)):
+                        raise
+                    snapshot = LocalVectorIndex(vector_name="text_vec", dim=384)
+                    snapshot.load(self._snapshot_path(collection))
+                count = index.add(snapshot.ids, snapshot.payloads)
+                print(f"💾 Memory Agent: Keyword-indexed {count} '{collection}' points from snapshot ({e}).")
+
+            self.keyword_indexes[collection] = index
+            return index
+
+    def store_patterns(self, records, collection=HISTORY_COLLECTION):
+        """
+        Write path for the knowledge base.
+        Input: List of {"text": ..., "payload": {...}}
+        Output: Number of points written
+        """
+        # 1. Encode all texts in one go (the engine batches them together)
+        futures = [embedding_engine.submit(TEXT_MODEL, r["text"]) for r in records]
+
+        points = []
+        for record, future in zip(records, futures):
+            points.append(PointStruct(
+                id=str(uuid.uuid4()),
+                vector={"text_vec": future.result()}, # Text-only history: no image vector stored
+                payload=dict(record["payload"], description=record["text"])
+            ))
+
+        # 2. Write, then drop any cached recalls that are now stale
+        with tracer.span("qdrant.upsert", collection=collection, vector="text_vec", points=len(points)):
+            self.client.upsert(collection_name=collection, points=points)
+        self.invalidate(collection)
+
+        # 3. Keep the in-process index (and its disk snapshot) in step
+        index = self.local_indexes.get(collection)
+        if index is not None:
+            index.add(
+                [p.id for p in points],
+                [p.vector["text_vec"] for p in points],
+                [p.payload for p in points]
+            )
+            index.save(self._snapshot_path(collection))
+
+        keywords = self.keyword_indexes.get(collection)
+        if keywords is not None:
+            keywords.add([p.id for p in points], [p.payload for p in points])
+        return len(points)
+
+    def invalidate(self, collection=HISTORY_COLLECTION):
+        dropped = self.recall_cache.invalidate(lambda key: key[2] == collection)
+        if dropped:
+            print(f"♻️ Memory Agent: Dropped {dropped} cached recalls for '{collection}'.")
+
+    def cache_stats(self):
+        return {
+            "query_embeddings": self.embedding_cache.stats(),
+            "recall_results": self.recall_cache.stats()
+        }
+
+    def _snapshot_path(self, collection):
+        return os.path.join(self.snapshot_dir, f"{collection}.text_vec.npz")
+
+    def _embed_query(self, query_text):
+        # Normalized text is only the cache key: the model sees the original
+        # wording (case and punctuation carry meaning for MiniLM)
+        key = normalize_query(query_text)
+        vector = self.embedding_cache.get(key)
+        if vector is None:
+            vector = embedding_engine.encode(TEXT_MODEL, query_text)
+            self.embedding_cache.put(key, vector)
+        return vector
+
+
+def intel_filter(location=None, intel_type=None, window_minutes=None, now=None):
+    """Qdrant filter on the indexed live_intel payload fields (None = no filter)."""
+    must = []
+    if location:
+        must.append(FieldCondition(key="location", match=MatchValue(value=location)))
+    if intel_type:
+        must.append(FieldCondition(key="type", match=MatchValue(value=intel_type)))
+    if window_minutes:
+        since = (now or time.time()) - window_minutes * 60
+        must.append(FieldCondition(key="timestamp", range=Range(gte=since)))
+    return Filter(must=must) if must else None
+
+def fuse_scores(rankings, limit=5, weights=None):
+    """
+    Score fusion across vector spaces on a fixed scale: each cosine is
+    clipped to [0, 1] (a negative match counts as no match, like a miss),
+    then averaged with per-list weights. Scores are never rescaled per list,
+    so a list of weak matches stays weak; MiniLM vs CLIP scale differences
+    are for the weights to balance.
+    Input: {label: [(id, score, payload), ...]}
+    Output: [(id, fused score in [0, 1], payload, {label: raw score})], best first
+    """
+    fused, payloads, matched = {}, {}, {}
+    for label, hits in rankings.items():
+        weight = (weights or {}).get(label, 1.0)
+        for point_id, score, payload in hits:
+            point_id = str(point_id)
+            fused[point_id] = fused.get(point_id, 0.0) + weight * min(1.0, max(0.0, score))
+            payloads.setdefault(point_id, payload)
+            matched.setdefault(point_id, {})[label] = round(score, 3)
+
+    total = sum((weights or {}).get(label, 1.0) for label, hits in rankings.items() if hits) or 1.0
+    best = sorted(fused.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return [(point_id, score / total, payloads[point_id], matched[point_id]) for point_id, score in best]
+
+def normalize_query(text):
+    """'  Fire with CHEMICAL smell!! ' -> 'fire with chemical smell'"""
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+def _format_hit(point_id, score, payload):
+    payload = payload or {}
+    return {
+        "id": str(point_id),
+        "score": round(score, 2),
+        "incident": payload.get("incident_name", "Unknown"),
+        "year": payload.get("year", "N/A"),
+        "outcome": payload.get("outcome", "No data"),
+        "action_taken": payload.get("action_taken", "N/A")
+    }
+
+def _format_intel(point_id, score, payload):
+    payload = payload or {}
+    return {
+        "id": str(point_id),
+        "score": round(score, 2),
+        "type": payload.get("type"),
+        "description": payload.get("description"),
+        "location": payload.get("location"),
+        "timestamp": payload.get("timestamp"),
+        "hit_count": payload.get("hit_count", 1)
+    }
+
+def _vector_key(vector):
+    return hashlib.blake2b(np.asarray(vector, dtype=np.float32).tobytes(), digest_size=16).hexdigest()
+
 # Singleton
-memory_agent = MemoryAgent()
\ No newline at end of file
+memory_agent = MemoryAgent()
@@ -0,0 +1,91 @@
+import os
+import time
+import threading
+
+# Model names used across the system
+TEXT_MODEL = "all-MiniLM-L6-v2"   # Text -> 384 floats
+IMAGE_MODEL = "clip-ViT-B-32"     # Image -> 512 floats
+
+ALL_MODELS = [TEXT_MODEL, IMAGE_MODEL]
+
+
+class ModelRegistry:
+    """
+    Process-wide model store.
+
+    Hands out exactly one shared instance per model name and only loads a
+    model the first time somebody asks for it.
+    """
+
+    def __init__(self):
+        self._models = {}
+        self._load_locks = {}
+        self._timings = {}
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        """
+        Input: Model name (e.g. 'all-MiniLM-L6-v2')
+        Output: Loaded SentenceTransformer (loaded once, then shared)
+        """
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+
+        # Per-model lock: loading CLIP never blocks a MiniLM lookup
+        with load_lock:
+            model = self._models.get(name)
+            if model is None:
+                model = self._load(name)
+                self._models[name] = model
+            return model
+
+    def is_loaded(self, name):
+        return name in self._models
+
+    def warm_up(self, names=None):
+        """Loads the given models (default: all known) ahead of the first request."""
+        for name in names or ALL_MODELS:
+            self.get(name)
+        return self.report()
+
+    def report(self):
+        """Load timing per model (None = not loaded yet)."""
+        return {
+            name: {
+                "loaded": self.is_loaded(name),
+                "load_seconds": self._timings.get(name)
+            }
+            for name in sorted(set(ALL_MODELS) | set(self._models))
+        }
+
+    def _load(self, name):
+        # Heavy import kept local so importing the registry stays cheap
+        from sentence_transformers import SentenceTransformer
+
+        print(f"📦 Model Registry: Loading '{name}'...")
+        started = time.perf_counter()
+        model = SentenceTransformer(name)
+        self._timings[name] = round(time.perf_counter() - started, 3)
+        print(f"✅ Model Registry: '{name}' ready in {self._timings[name]}s")
+        return model
+
+
+def warmup_targets():
+    """
+    Reads AURA_WARMUP_MODELS: empty = lazy (default), 'all' = every model,
+    otherwise a comma-separated list of model names.
+    """
+    raw = os.getenv("AURA_WARMUP_MODELS", "").strip()
+    if not raw:
+        return []
+    if raw.lower() == "all":
+        return list(ALL_MODELS)
+    return [name.strip() for name in raw.split(",") if name.strip()]
+
+
+# Singleton
+model_registry = ModelRegistry()
@@ -1,81 +1,145 @@
-import os
+import asyncio
 from dotenv import load_dotenv
-from sentence_transformers import SentenceTransformer
 from PIL import Image
-import openai
+
+from agents.embedding import embedding_engine
+from agents.models import TEXT_MODEL, IMAGE_MODEL
+from agents.perception_pool import perception_pool, PoolUnavailable
+from agents.transcription import transcriber
+from agents.fingerprint import dhash
+from agents.tracing import tracer
 
 # Load environment variables
 load_dotenv()
 
-# Check for OpenAI Key (Needed for Audio Transcription)
-openai.api_key = os.getenv("OPENAI_API_KEY")
-
 class PerceptionAgent:
     def __init__(self):
-        print("👀 Perception Agent: Loading AI Models... (This might take a moment)")
-        
-        # 1. Load Image Model (CLIP) - Converts Images to Vectors (Size 512)
-        # We use a smaller, faster version of CLIP for hackathons
-        self.image_model = SentenceTransformer('clip-ViT-B-32')
-        
-        # 2. Load Text Model - Converts Text to Vectors (Size 384)
-        # This handles the text from audio transcripts or written reports
-        self.text_model = SentenceTransformer('all-MiniLM-L6-v2')
-        
-        print("✅ Perception Agent: Models Loaded & Ready.")
-
-    def process_image(self, image_file):
+        # Models are owned by the shared registry and load on first use:
+        # 1. Image Model (CLIP) - Converts Images to Vectors (Size 512)
+        # 2. Text Model (MiniLM) - Converts transcripts/reports to Vectors (Size 384)
+        print(f"👀 Perception Agent: Ready ({IMAGE_MODEL} + {TEXT_MODEL}, loaded on demand).")
+
+    async def process_image(self, image_file):
         """
-        Input: Raw Image File
+        Input: Raw Image File (path or in-memory buffer)
         Output: Vector (512 floats) + Description
         """
         try:
-            # Open image using Pillow
-            img = Image.open(image_file)
-            
-            # Generate Embedding (Vector)
-            # This turns the visual content into numbers
-            vector = self.image_model.encode(img).tolist()
+            vector = None
+            if perception_pool.running:
+                # Decode + CLIP in a worker process (falls back below if it can't)
+                try:
+                    with tracer.span("perception.encode", model=IMAGE_MODEL, backend="pool"):
+                        vector, fingerprint = await perception_pool.aencode(await asyncio.to_thread(_read_bytes, image_file))
+                except PoolUnavailable:
+                    if hasattr(image_file, "seek"):
+                        image_file.seek(0)
+
+            if vector is None:
+                # Open + decode image using Pillow, plus its perceptual fingerprint for
+                # near-duplicate frames (one worker-thread call, not on the event loop)
+                img, fingerprint = await asyncio.to_thread(_decode_image, image_file)
+
+                # Generate Embedding (Vector)
+                # This turns the visual content into numbers (batched, off the event loop)
+                with tracer.span("perception.encode", model=IMAGE_MODEL, backend="inline"):
+                    vector = await embedding_engine.aencode(IMAGE_MODEL, img)
             
             return {
                 "vector": vector,
                 "description": "Drone surveillance feed (Visual Data)",
-                "modality": "image"
+                "modality": "image",
+                "dhash": fingerprint
             }
         except Exception as e:
             print(f"❌ Image Processing Error: {e}")
             return None
 
-    def process_audio(self, audio_file_path):
+    async def process_audio(self, audio_file_path):
         """
-        Input: Path to Audio File
+        Input: Path to Audio File (or an in-memory file object)
         Output: Vector (384 floats) + Transcript text
         """
         try:
-            # 1. Transcribe Audio (Voice -> Text) using OpenAI Whisper
-            # Note: For hackathon speed, we use OpenAI API. 
-            # If no key, we return a mock string for testing.
-            
-            if not openai.api_key:
-                print("⚠️ No OpenAI Key found. Using Mock Transcription.")
-                transcript = "Emergency reported. Heavy smoke detected in Sector 4. Chemical smell present."
-            else:
-                with open(audio_file_path, "rb") as audio:
-                    response = openai.Audio.transcribe("whisper-1", audio)
-                    transcript = response["text"]
+            # 1. Transcribe Audio (Voice -> Text) with the configured backend
+            #    (TRANSCRIPTION_BACKEND: OpenAI Whisper, local Whisper or mock)
+            with tracer.span("perception.transcribe", backend=transcriber.name):
+                transcript = await asyncio.to_thread(transcriber.transcribe, audio_file_path)
             
             # 2. Convert Transcript -> Vector
-            vector = self.text_model.encode(transcript).tolist()
-            
-            return {
-                "vector": vector,
-                "description": transcript,  # The actual text content
-                "modality": "audio"
-            }
+            return await self._transcript_result(transcript)
             
         except Exception as e:
             print(f"❌ Audio Processing Error: {e}")
             return None
 
+    async def process_audio_chunk(self, pcm, sample_rate):
+        """
+        Input: One chunk of a live recording (16-bit mono PCM)
+        Output: Vector (384 floats) + partial transcript, or None if the chunk was silent
+        """
+        try:
+            with tracer.span("perception.transcribe", backend=transcriber.name, streamed=True) as span:
+                transcript = await asyncio.to_thread(transcriber.transcribe_pcm, pcm, sample_rate)
+                span.set("audio_seconds", len(pcm) / 2 / sample_rate)
+            if not transcript.strip():
+                return None
+            return await self._transcript_result(transcript)
+
+        except Exception as e:
+            print(f"❌ Audio Chunk Error: {e}")
+            return None
+
+    async def _transcript_result(self, transcript):
+        with tracer.span("perception.encode", model=TEXT_MODEL, backend="inline"):
+            vector = await embedding_engine.aencode(TEXT_MODEL, transcript)
+        return {
+            "vector": vector,
+            "description": transcript,  # The actual text content
+            "modality": "audio"
+        }
+
+    def describe_sensor_window(self, summary):
+        """
+        Input: Aggregated sensor window (from the WebSocket gateway)
+        Output: Text description the Memory Agent can search with
+        """
+        readings = [
+            f"{sensor} avg {stats['mean']} (peak {stats['max']}, {stats['count']} readings)"
+            for sensor, stats in sorted(summary["sensors"].items())
+        ]
+        description = f"Live sensor feed at {summary['location']}: " + "; ".join(readings or ["no readings"])
+        if summary.get("notes"):
+            description += ". Field notes: " + " ".join(summary["notes"])
+        return description
+
+    async def process_batch(self, items):
+        """
+        Input: List of (modality, source) pairs
+        Output: List of Perception results (None where processing failed)
+
+        All items are submitted at once, so the embedding engine encodes
+        them in shared micro-batches instead of one by one.
+        """
+        return await asyncio.gather(*(
+            self.process_image(source) if kind == "image" else self.process_audio(source)
+            for kind, source in items
+        ))
+
+def _decode_image(image_file):
+    with tracer.span("perception.decode") as span:
+        img = Image.open(image_file)
+        img.load()
+        span.set("format", img.format)
+    return img, dhash(img)
+
+def _read_bytes(image_file):
+    if hasattr(image_file, "getvalue"):
+        return image_file.getvalue()
+    if hasattr(image_file, "read"):
+        return image_file.read()
+    with open(image_file, "rb") as f:
+        return f.read()
+
 # Singleton Instance (so we don't reload models every request)
 perception_agent = PerceptionAgent()
\ No newline at end of file
@@ -0,0 +1,302 @@
+import io
+import os
+import queue
+import asyncio
+import threading
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from agents.models import IMAGE_MODEL
+from agents.fingerprint import dhash
+
+IMAGE_DIM = 512
+OUTPUT_BYTES = IMAGE_DIM * 4 + 8  # vector (float32) + dHash (uint64)
+
+
+class PoolUnavailable(Exception):
+    """The pool can't take this image right now; callers fall back to in-process encoding."""
+
+
+class ImageRejected(Exception):
+    """The worker is healthy but the image couldn't be decoded/encoded."""
+
+
+def _worker_main(model_name, input_name, output_name, conn, threads):
+    """
+    Worker process: loads CLIP once, then loops over encode requests.
+    Image bytes arrive in `input_name`, the vector and dHash go back
+    through `output_name`; the pipe only carries tiny control messages.
+    """
+    from PIL import Image
+    from sentence_transformers import SentenceTransformer
+
+    try:
+        import torch
+        torch.set_num_threads(threads)  # One core per worker: scale by adding workers
+    except ImportError:
+        pass
+
+    inp = shared_memory.SharedMemory(name=input_name)
+    out = shared_memory.SharedMemory(name=output_name)
+    vector_out = np.ndarray((IMAGE_DIM,), dtype=np.float32, buffer=out.buf)
+    hash_out = np.ndarray((1,), dtype=np.uint64, buffer=out.buf, offset=IMAGE_DIM * 4)
+    model = SentenceTransformer(model_name)
+    conn.send(("ready", os.getpid()))
+
+    try:
+        while True:
+            try:
+                message = conn.recv()
+            except EOFError:
+                break
+
+            if message[0] == "stop":
+                break
+            if message[0] == "ping":
+                conn.send(("pong",))
+                continue
+
+            try:
+                img = Image.open(io.BytesIO(inp.buf[:message[1]]))
+                img.load()
+                vector_out[:] = model.encode([img])[0]
+                hash_out[0] = int(dhash(img), 16)
+                conn.send(("ok",))
+            except Exception as e:
+                conn.send(("error", str(e)))
+    finally:
+        del vector_out, hash_out
+        inp.close()
+        out.close()
+
+
+class _Worker:
+    """One long-lived encoder process plus its two shared-memory slots."""
+
+    def __init__(self, ctx, index, slot_bytes, threads):
+        self.ctx = ctx
+        self.index = index
+        self.slot_bytes = slot_bytes
+        self.threads = threads
+        self.input = shared_memory.SharedMemory(create=True, size=slot_bytes)
+        self.output = shared_memory.SharedMemory(create=True, size=OUTPUT_BYTES)
+        self.lock = threading.Lock()
+        self.restarts = 0
+        self.generation = 0  # Bumped per restart, so a dead process is replaced once
+        self.encoded = 0
+        self._spawn()
+
+    def _spawn(self):
+        self.conn, child = self.ctx.Pipe()
+        self.process = self.ctx.Process(
+            target=_worker_main,
+            args=(IMAGE_MODEL, self.input.name, self.output.name, child, self.threads),
+            name=f"perception-worker-{self.index}",
+            daemon=True
+        )
+        self.process.start()
+        child.close()
+        self.ready = False
+
+    def alive(self):
+        return self.process.is_alive()
+
+    def wait_ready(self, timeout):
+        # Caller holds self.lock
+        if self.ready:
+            return
+        if not self.conn.poll(timeout):
+            raise TimeoutError(f"worker {self.index} did not load {IMAGE_MODEL} within {timeout}s")
+        message = self.conn.recv()
+        if message[0] != "ready":
+            raise RuntimeError(f"worker {self.index} sent {message!r} before ready")
+        self.ready = True
+
+    def encode(self, data, timeout, load_timeout):
+        with self.lock:
+            self.wait_ready(load_timeout)
+            self.input.buf[:len(data)] = data
+            self.conn.send(("encode", len(data)))
+            if not self.conn.poll(timeout):
+                raise TimeoutError(f"worker {self.index} timed out after {timeout}s")
+            message = self.conn.recv()
+            if message[0] != "ok":
+                raise ImageRejected(message[1])
+            self.encoded += 1
+            vector = np.ndarray((IMAGE_DIM,), dtype=np.float32, buffer=self.output.buf).tolist()
+            fingerprint = int(np.ndarray((1,), dtype=np.uint64, buffer=self.output.buf, offset=IMAGE_DIM * 4)[0])
+            return vector, f"{fingerprint:016x}"
+
+    def ping(self, timeout):
+        """Health check for an idle worker (skipped while it's busy or still loading)."""
+        if not self.lock.acquire(blocking=False):
+            return True
+        try:
+            if not self.ready:
+                return self.alive()
+            self.conn.send(("ping",))
+            return self.conn.poll(timeout) and self.conn.recv()[0] == "pong"
+        except (OSError, EOFError):
+            return False
+        finally:
+            self.lock.release()
+
+    def restart(self):
+        # Caller holds self.lock (or the worker is known to be dead)
+        self._stop(grace=0)
+        self._spawn()
+        self.restarts += 1
+        self.generation += 1
+
+    def _stop(self, grace=2):
+        try:
+            if self.process.is_alive() and grace:
+                self.conn.send(("stop",))
+                self.process.join(grace)
+        except (OSError, EOFError):
+            pass
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(1)
+        self.conn.close()
+
+    def close(self):
+        self._stop()
+        for shm in (self.input, self.output):
+            shm.close()
+            shm.unlink()
+
+
+class PerceptionPool:
+    """
+    Optional pool of spawned processes that decode and CLIP-encode images
+    outside the API process (PERCEPTION_POOL_WORKERS > 0), so concurrent
+    drone uploads scale with cores instead of contending for one GIL.
+    Image bytes and vectors travel through per-worker shared memory.
+    """
+
+    def __init__(self, workers=None, slot_bytes=None, timeout=None, load_timeout=None, health_interval=None):
+        self.workers_wanted = workers if workers is not None else int(os.getenv("PERCEPTION_POOL_WORKERS", "0"))
+        self.slot_bytes = slot_bytes or int(os.getenv("PERCEPTION_POOL_SLOT_BYTES", str(8 * 1024 * 1024)))
+        self.timeout = timeout or float(os.getenv("PERCEPTION_POOL_TIMEOUT_SECONDS", "30"))
+        self.load_timeout = load_timeout or float(os.getenv("PERCEPTION_POOL_LOAD_TIMEOUT_SECONDS", "180"))
+        self.health_interval = health_interval or float(os.getenv("PERCEPTION_POOL_HEALTH_SECONDS", "10"))
+        self.threads = int(os.getenv("PERCEPTION_POOL_THREADS", "1"))
+
+        self.workers = []
+        self._idle = queue.Queue()
+        # encode_bytes runs on many threads: stats and restarts go through this lock
+        self._lock = threading.Lock()
+        self.stats = {"encoded": 0, "rejected": 0, "fallbacks": 0, "crashes": 0}
+
+    @property
+    def enabled(self):
+        return self.workers_wanted > 0
+
+    @property
+    def running(self):
+        return bool(self.workers)
+
+    def start(self):
+        """Spawns the workers (each loads CLIP in the background)."""
+        if self.running or not self.enabled:
+            return
+        ctx = mp.get_context("spawn")  # No forked torch/threads state
+        for index in range(self.workers_wanted):
+            worker = _Worker(ctx, index, self.slot_bytes, self.threads)
+            self.workers.append(worker)
+            self._idle.put(worker)
+        print(f"🏭 Perception Pool: {len(self.workers)} workers starting ({IMAGE_MODEL}).")
+
+    def close(self):
+        workers, self.workers = self.workers, []
+        while not self._idle.empty():
+            self._idle.get_nowait()
+        for worker in workers:
+            worker.close()
+
+    def encode_bytes(self, data):
+        """
+        Input: Encoded image bytes (JPEG/PNG/...)
+        Output: (CLIP vector (512 floats), dHash hex)
+        Raises PoolUnavailable when the caller should encode in-process instead.
+        Never waits for a busy pool: this runs on the default executor, whose
+        threads image decoding and recall also need.
+        """
+        if not self.running or len(data) > self.slot_bytes:
+            self._count(fallbacks=1)
+            raise PoolUnavailable("pool not running" if not self.running else "image larger than a shared-memory slot")
+
+        try:
+            worker = self._idle.get_nowait()
+        except queue.Empty:
+            self._count(fallbacks=1)
+            raise PoolUnavailable("no idle worker")
+
+        generation = worker.generation
+        try:
+            result = worker.encode(data, self.timeout, self.load_timeout)
+            self._count(encoded=1)
+            return result
+        except ImageRejected:
+            self._count(rejected=1)
+            raise
+        except Exception as e:
+            # Dead or hung worker: replace it, let this image go in-process
+            self._count(fallbacks=1)
+            self._restart(worker, generation, f"failed ({e})")
+            raise PoolUnavailable(str(e))
+        finally:
+            self._idle.put(worker)
+
+    def _count(self, **deltas):
+        with self._lock:
+            for key, delta in deltas.items():
+                self.stats[key] += delta
+
+    def _restart(self, worker, generation, reason):
+        """Restarts `worker` unless someone already did since `generation` was read. Returns True if restarted."""
+        with worker.lock, self._lock:
+            if worker.generation != generation:
+                return False
+            print(f"🩺 Perception Pool: worker {worker.index} {reason}. Restarting.")
+            worker.restart()
+            self.stats["crashes"] += 1
+            return True
+
+    async def aencode(self, data):
+        return await asyncio.to_thread(self.encode_bytes, data)
+
+    def health_check(self):
+        """Restarts any worker that died or stopped answering pings. Returns restarts made."""
+        restarted = 0
+        for worker in list(self.workers):
+            generation = worker.generation
+            if worker.alive() and worker.ping(timeout=5):
+                continue
+            restarted += self._restart(worker, generation, "unhealthy")
+        return restarted
+
+    async def monitor(self):
+        """Background health loop (started by the API when the pool is enabled)."""
+        while self.running:
+            await asyncio.sleep(self.health_interval)
+            await asyncio.to_thread(self.health_check)
+
+    def report(self):
+        with self._lock:
+            stats = dict(self.stats)
+        return dict(
+            stats,
+            workers=len(self.workers),
+            ready=sum(1 for w in self.workers if w.ready),
+            alive=sum(1 for w in self.workers if w.alive()),
+            restarts=sum(w.restarts for w in self.workers),
+            idle=self._idle.qsize()
+        )
+
+
+# Singleton (disabled unless PERCEPTION_POOL_WORKERS > 0)
+perception_pool = PerceptionPool()
@@ -0,0 +1,117 @@
+import os
+import json
+import time
+import asyncio
+
+from agents.memory import memory_agent
+from agents.risk import risk_agent
+from agents.decision import decision_agent
+from agents.explain import explain_agent
+
+PIPELINE_MODES = ("sequential", "speculative")
+DEFAULT_MODE = os.getenv("PIPELINE_MODE", "sequential")
+
+
+async def run_pipeline(description, limit=3, mode=DEFAULT_MODE):
+    """
+    Runs memory -> risk -> decision -> explain in-process.
+    Yields one event per stage as soon as it is ready, so the caller can
+    show the risk level before the LLM stages finish.
+
+    mode="speculative" drafts the explanation in parallel with the plan,
+    then runs a short refine pass so the final explanation is conditioned
+    on the finished plan.
+    """
+    timings = {}
+    started = time.perf_counter()
+
+    def stage(name, data, t0):
+        timings[name] = round((time.perf_counter() - t0) * 1000, 2)
+        return {"stage": name, "data": data, "elapsed_ms": timings[name]}
+
+    # 1. Memory (Agent 2)
+    t0 = time.perf_counter()
+    incidents = await asyncio.to_thread(memory_agent.recall_patterns, description, limit)
+    yield stage("memory", incidents, t0)
+
+    # 2. Risk (Agent 3)
+    t0 = time.perf_counter()
+    risk = risk_agent.assess_risk(incidents)
+    yield stage("risk", risk, t0)
+
+    # One token-budgeted evidence block, shared by both LLM prompts
+    evidence = explain_agent.summarize_evidence(incidents)
+
+    llm_started = time.perf_counter()
+    if mode == "speculative":
+        # 3+4. Plan and explanation draft run concurrently
+        plan_task = asyncio.create_task(_timed(decision_agent.generate_plan(description, risk, incidents, evidence)))
+        draft_task = asyncio.create_task(_timed(explain_agent.draft_explanation(risk, incidents, evidence)))
+        try:
+            plan, plan_ms = await plan_task
+            timings["decision"] = plan_ms
+            yield {"stage": "decision", "data": plan, "elapsed_ms": plan_ms}
+
+            draft, draft_ms = await draft_task
+        finally:
+            # Client went away (or a stage failed): don't leave LLM calls running
+            for task in (plan_task, draft_task):
+                if not task.done():
+                    task.cancel()
+
+        # 4b. Condition the draft on the finished plan
+        explanation, refine_ms = await _timed(explain_agent.refine_explanation(draft, plan, risk, incidents))
+        timings["explain_draft"] = draft_ms
+        timings["explain_refine"] = refine_ms
+        timings["explain"] = round(draft_ms + refine_ms, 2)
+        yield {"stage": "explain", "data": explanation, "elapsed_ms": timings["explain"]}
+    else:
+        # 3. Decision (Groq)
+        t0 = time.perf_counter()
+        plan = await decision_agent.generate_plan(description, risk, incidents, evidence)
+        yield stage("decision", plan, t0)
+
+        # 4. Explainability (Groq)
+        t0 = time.perf_counter()
+        explanation = await explain_agent.explain_decision(plan, risk, incidents, evidence)
+        yield stage("explain", explanation, t0)
+
+    # Wall clock of the LLM stages. In speculative mode the sequential figure
+    # is an estimate (the stage durations summed), not a measured sequential run.
+    llm_wall_ms = round((time.perf_counter() - llm_started) * 1000, 2)
+    sequential_ms = round(timings["decision"] + timings["explain"], 2) if mode == "speculative" else llm_wall_ms
+
+    yield {
+        "stage": "done",
+        "timings_ms": timings,
+        "total_ms": round((time.perf_counter() - started) * 1000, 2),
+        "metadata": {
+            "mode": mode,
+            "llm_wall_ms": llm_wall_ms,
+            "sequential_ms_est": sequential_ms,
+            "saved_ms_est": round(max(0.0, sequential_ms - llm_wall_ms), 2),
+            "context": {
+                "evidence_tokens": evidence["tokens"],
+                "raw_evidence_tokens": evidence["raw_tokens"],
+                "incidents_kept": evidence["kept"],
+                "outcomes_merged": evidence["merged"],
+                "incidents_dropped": evidence["dropped"]
+            }
+        }
+    }
+
+
+async def _timed(coro):
+    t0 = time.perf_counter()
+    result = await coro
+    return result, round((time.perf_counter() - t0) * 1000, 2)
+
+
+async def as_ndjson(events):
+    async for event in events:
+        yield json.dumps(event) + "\n"
+
+
+async def as_sse(events):
+    async for event in events:
+        yield f"event: {event['stage']}\ndata: {json.dumps(event)}\n\n"
@@ -0,0 +1,52 @@
+import os
+
+from qdrant_client.models import (
+    ScalarQuantization, ScalarQuantizationConfig, ScalarType,
+    BinaryQuantization, BinaryQuantizationConfig,
+    SearchParams, QuantizationSearchParams
+)
+
+# "none"   -> float32 vectors in RAM (default)
+# "int8"   -> scalar quantization: 4x smaller in RAM, originals on disk
+# "binary" -> 1 bit per dimension: 32x smaller, needs oversampling + rescoring
+QUANTIZATION_MODES = ("none", "int8", "binary")
+
+
+def quantization_mode(collection):
+    """
+    Storage mode for a collection: QDRANT_QUANTIZATION_<COLLECTION>
+    (e.g. QDRANT_QUANTIZATION_LIVE_INTEL=int8), else QDRANT_QUANTIZATION.
+    """
+    mode = os.getenv(f"QDRANT_QUANTIZATION_{collection.upper()}") or os.getenv("QDRANT_QUANTIZATION", "none")
+    mode = mode.lower()
+    if mode not in QUANTIZATION_MODES:
+        raise ValueError(f"Unknown quantization mode '{mode}' for {collection} (expected one of {QUANTIZATION_MODES})")
+    return mode
+
+
+def quantization_config(mode):
+    """Qdrant quantization config for a mode (None for full precision)."""
+    if mode == "int8":
+        return ScalarQuantization(
+            scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True)
+        )
+    if mode == "binary":
+        return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True))
+    return None
+
+
+def search_params(collection, mode=None, oversampling=None, rescore=None):
+    """
+    Read-path params for a quantized collection: search the compact
+    vectors, fetch `oversampling` x limit candidates, then rescore them
+    against the on-disk originals. None when the collection isn't quantized.
+    """
+    mode = mode or quantization_mode(collection)
+    if mode == "none":
+        return None
+
+    if oversampling is None:
+        oversampling = float(os.getenv("MEMORY_QUANT_OVERSAMPLING", "3.0" if mode == "binary" else "1.5"))
+    if rescore is None:
+        rescore = os.getenv("MEMORY_QUANT_RESCORE", "1") != "0"
+    return SearchParams(quantization=QuantizationSearchParams(rescore=rescore, oversampling=oversampling))
@@ -0,0 +1,237 @@
+import os
+import time
+import uuid
+import asyncio
+
+import numpy as np
+from qdrant_client.models import PointStruct, Filter, FieldCondition, MatchValue, Range
+
+from agents.intel_store import LIVE_COLLECTION
+from agents.risk import risk_agent
+
+ARCHIVE_COLLECTION = "action_outcomes"
+SUMMARY_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "aura/intel-summary")
+MAX_SAMPLES = 5
+VECTOR_NAMES = ("text_vec", "image_vec")
+
+
+class RetentionJob:
+    """
+    Keeps live_intel bounded with three tiers:
+      hot     (< RETENTION_HOT_HOURS)      full points, untouched
+      aged    (hot .. RETENTION_EXPIRE_DAYS) rolled up per location + incident
+                                           into summary points in action_outcomes
+      expired (> RETENTION_EXPIRE_DAYS)    deleted, from both collections
+    Work is done page by page (scroll, summarize, delete), so a run never
+    holds more than one page of points in memory.
+
+    Roll-ups are idempotent: each summary lists the source ids it has
+    folded in that may still be in live_intel (`pending_ids`), so if a
+    delete fails after its summary was written, the next run skips those
+    points instead of counting them twice. Ids that are gone from
+    live_intel are pruned from the list on the summary's next roll-up.
+    """
+
+    def __init__(self, client, live=LIVE_COLLECTION, archive=ARCHIVE_COLLECTION):
+        self.client = client
+        self.live = live
+        self.archive = archive
+        self.enabled = os.getenv("RETENTION_ENABLED", "0") == "1"  # Opt-in: it deletes data
+        self.hot_seconds = float(os.getenv("RETENTION_HOT_HOURS", "24")) * 3600
+        self.expire_seconds = float(os.getenv("RETENTION_EXPIRE_DAYS", "30")) * 86400
+        self.bucket_seconds = float(os.getenv("RETENTION_INCIDENT_MINUTES", "60")) * 60
+        self.batch_size = int(os.getenv("RETENTION_BATCH", "256"))
+        self.max_batches = int(os.getenv("RETENTION_MAX_BATCHES_PER_RUN", "200"))
+        self.interval = float(os.getenv("RETENTION_INTERVAL_SECONDS", "900"))
+
+        self._running = False
+        self.stats = {
+            "runs": 0, "rolled_up": 0, "summaries_written": 0,
+            "expired_live": 0, "expired_summaries": 0,
+            "last_run_at": None, "last_run_seconds": None
+        }
+
+    # --- ONE PASS ---
+    def run_once(self, now=None):
+        """Rolls up aged intel and deletes expired points. Output: counts for this run."""
+        now = now or time.time()
+        started = time.perf_counter()
+        run = {"rolled_up": 0, "summaries_written": 0, "expired_live": 0, "expired_summaries": 0}
+
+        # Expired live points go first: no point summarizing what is about to be dropped
+        run["expired_live"] = self._delete_older_than(self.live, now - self.expire_seconds)
+
+        for _ in range(self.max_batches):
+            points, _ = self.client.scroll(
+                collection_name=self.live,
+                scroll_filter=_older_than(now - self.hot_seconds),
+                limit=self.batch_size,
+                with_payload=True,
+                with_vectors=list(VECTOR_NAMES)
+            )
+            if not points:
+                break
+
+            # Summaries are written before their source points are removed
+            run["summaries_written"] += self._roll_up(points)
+            self.client.delete(collection_name=self.live, points_selector=[p.id for p in points], wait=True)
+            run["rolled_up"] += len(points)
+
+        run["expired_summaries"] = self._delete_older_than(
+            self.archive, now - self.expire_seconds, type_filter="summary"
+        )
+
+        for key, value in run.items():
+            self.stats[key] += value
+        self.stats["runs"] += 1
+        self.stats["last_run_at"] = now
+        self.stats["last_run_seconds"] = round(time.perf_counter() - started, 3)
+        return run
+
+    def _roll_up(self, points):
+        """Folds one page of aged points into their (location, incident) summaries."""
+        groups = {}
+        for point in points:
+            payload = point.payload or {}
+            key = (payload.get("location", "Unknown"), self._incident(payload))
+            groups.setdefault(key, []).append(point)
+
+        ids = [summary_id(location, incident) for location, incident in groups]
+        existing = {
+            str(p.id): p
+            for p in self.client.retrieve(
+                collection_name=self.archive, ids=ids, with_payload=True, with_vectors=list(VECTOR_NAMES)
+            )
+        }
+
+        # Source points a previous (interrupted) run already folded in and that still exist
+        pending = {i for p in existing.values() for i in (p.payload or {}).get("pending_ids", [])}
+        still_live = {
+            str(p.id) for p in self.client.retrieve(
+                collection_name=self.live, ids=list(pending), with_payload=False, with_vectors=False
+            )
+        } if pending else set()
+
+        summaries = []
+        for ((location, incident), members), point_id in zip(groups.items(), ids):
+            previous = existing.get(point_id)
+            folded = [i for i in (previous.payload.get("pending_ids", []) if previous else []) if i in still_live]
+            fresh = [m for m in members if str(m.id) not in folded]
+            summary = self._summarize(location, incident, fresh, previous)
+            summary.payload["pending_ids"] = sorted(set(folded) | {str(m.id) for m in members})
+            summaries.append(summary)
+        self.client.upsert(collection_name=self.archive, points=summaries, wait=True)
+        return len(summaries)
+
+    def _incident(self, payload):
+        # Explicit incident / audio stream if the point has one, else an hour-style time bucket
+        explicit = payload.get("incident_id") or payload.get("stream_id")
+        if explicit:
+            return str(explicit)
+        bucket = int(float(payload.get("timestamp", 0)) // self.bucket_seconds * self.bucket_seconds)
+        return f"window-{bucket}"
+
+    def _summarize(self, location, incident, members, previous=None):
+        payload = dict(previous.payload) if previous is not None else {
+            "type": "summary", "source": self.live, "location": location, "incident": incident,
+            "count": 0, "hit_count": 0, "by_type": {}, "samples": [], "peak_signal": 0.0,
+            "vector_counts": {}, "timestamp": None, "window_end": None
+        }
+        payload.pop("pending_ids", None)  # Re-set by _roll_up
+        old_vectors = (previous.vector or {}) if previous is not None else {}
+
+        # Running means of each named vector, weighted by how many points fed them
+        vectors = {}
+        for name in VECTOR_NAMES:
+            fresh = [m.vector[name] for m in members if (m.vector or {}).get(name)]
+            n_old = payload["vector_counts"].get(name, 0)
+            if not fresh and not n_old:
+                continue
+            total = np.sum(np.asarray(fresh, dtype=np.float32), axis=0) if fresh else 0.0
+            if n_old and name in old_vectors:
+                total = total + np.asarray(old_vectors[name], dtype=np.float32) * n_old
+            norm = np.linalg.norm(total)
+            if norm:
+                vectors[name] = (total / norm).tolist()
+            payload["vector_counts"][name] = n_old + len(fresh)
+
+        # A merged point spans first_seen .. timestamp (its latest sighting)
+        firsts = [float(m.payload.get("first_seen", m.payload.get("timestamp", 0))) for m in members]
+        timestamps = [float(m.payload.get("timestamp", 0)) for m in members]
+        for m in members:
+            kind = m.payload.get("type", "unknown")
+            payload["by_type"][kind] = payload["by_type"].get(kind, 0) + 1
+            description = m.payload.get("description")
+            if description:
+                payload["peak_signal"] = max(payload["peak_signal"], risk_agent.intel_signal(description))
+                if description not in payload["samples"] and len(payload["samples"]) < MAX_SAMPLES:
+                    payload["samples"].append(description)
+
+        payload["count"] += len(members)
+        payload["hit_count"] += sum(m.payload.get("hit_count", 1) for m in members)
+        payload["timestamp"] = min([t for t in (payload["timestamp"], *firsts) if t is not None])
+        payload["window_end"] = max([t for t in (payload["window_end"], *timestamps) if t is not None])
+        kinds = ", ".join(f"{n} {k}" for k, n in sorted(payload["by_type"].items()))
+        payload["description"] = f"{payload['count']} intel reports at {location} ({kinds}): " + " | ".join(payload["samples"])
+
+        return PointStruct(id=summary_id(location, incident), vector=vectors, payload=payload)
+
+    def _delete_older_than(self, collection, cutoff, type_filter=None):
+        """Streams ids of points older than `cutoff` and deletes them page by page."""
+        deleted = 0
+        for _ in range(self.max_batches):
+            points, _ = self.client.scroll(
+                collection_name=collection,
+                scroll_filter=_older_than(cutoff, type_filter),
+                limit=self.batch_size,
+                with_payload=False,
+                with_vectors=False
+            )
+            if not points:
+                break
+            self.client.delete(collection_name=collection, points_selector=[p.id for p in points], wait=True)
+            deleted += len(points)
+        return deleted
+
+    # --- BACKGROUND LOOP ---
+    async def run_forever(self):
+        """Started by the API; one pass every RETENTION_INTERVAL_SECONDS."""
+        while self.enabled:
+            await asyncio.sleep(self.interval)
+            await self.arun_once()
+
+    async def arun_once(self):
+        if self._running:
+            return None  # A pass is still going (manual trigger + timer)
+        self._running = True
+        try:
+            run = await asyncio.to_thread(self.run_once)
+            print(f"🧹 Retention: rolled up {run['rolled_up']} aged points into {run['summaries_written']} summaries, "
+                  f"expired {run['expired_live']} live / {run['expired_summaries']} archived.")
+            return run
+        except Exception as e:
+            print(f"❌ Retention Error: {e}")
+            return None
+        finally:
+            self._running = False
+
+    def report(self):
+        return dict(
+            self.stats,
+            enabled=self.enabled,
+            hot_hours=self.hot_seconds / 3600,
+            expire_days=self.expire_seconds / 86400,
+            running=self._running
+        )
+
+
+def summary_id(location, incident):
+    """Stable id, so later runs fold into the same summary point."""
+    return str(uuid.uuid5(SUMMARY_NAMESPACE, f"{location}\x1f{incident}"))
+
+
+def _older_than(cutoff, type_filter=None):
+    must = [FieldCondition(key="timestamp", range=Range(lt=cutoff))]
+    if type_filter:
+        must.append(FieldCondition(key="type", match=MatchValue(value=type_filter)))
+    return Filter(must=must)
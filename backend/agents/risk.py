@@ -1,61 +1,116 @@
+import re
+from functools import lru_cache
+
+import numpy as np
+
+from agents.tracing import tracer
+
+# Weighted signal categories: weight = risk points added by a past incident
+# with a 1.0 similarity whose outcome mentions one of the keywords
+SIGNAL_CATEGORIES = {
+    "structural":  (10.0, ["collapse"]),
+    "life_safety": (10.0, ["casualty", "casualties", "fatality"]),
+    "hazmat":      (10.0, ["toxic", "explosion"]),
+    "fire":        (10.0, ["flashover"]),
+    "escalation":  (8.0,  ["critical", "failure"]),
+}
+BASELINE_WEIGHT = 2.0  # Any similar incident, even without a danger signal
+INTEL_BASELINE = 0.05  # Risk contribution of a live intel point with no danger signal
+
+LEVELS = np.array(["LOW", "MEDIUM", "HIGH", "CRITICAL"])
+LEVEL_THRESHOLDS = np.array([0.2, 0.4, 0.7])  # score > threshold -> next level
+
+# Keywords that indicate danger in past records: word -> (category, weight)
+SIGNALS = {
+    word: (category, weight)
+    for category, (weight, words) in SIGNAL_CATEGORIES.items()
+    for word in words
+}
+# One compiled matcher over every signal (longest first, so "casualties" wins over "casualty")
+SIGNAL_MATCHER = re.compile("|".join(re.escape(word) for word in sorted(SIGNALS, key=len, reverse=True)))
+
+
+@lru_cache(maxsize=4096)
+def _match_outcome(outcome):
+    # Module-level so the cache key is the text alone (no agent instance)
+    best = (0.0, None, None)
+    for found in SIGNAL_MATCHER.finditer(outcome.lower()):
+        category, weight = SIGNALS[found.group(0)]
+        if weight > best[0]:
+            best = (weight, found.group(0), category)
+    return best
+
+
 class RiskAgent:
     def __init__(self):
         print("🛡️ Risk Agent: Safety Protocols Loaded.")
-        
-        # Keywords that indicate danger in past records
-        self.danger_signals = [
-            "collapse", "casualty", "casualties", "toxic", "explosion", 
-            "flashover", "fatality", "critical", "failure"
-        ]
+        self.signals = SIGNALS
+        self.danger_signals = list(SIGNALS)
+
+    def match_outcome(self, outcome):
+        """
+        Input: Outcome text
+        Output: (weight, keyword, category) of the strongest signal, or (0.0, None, None)
+        """
+        return _match_outcome(outcome)
+
+    def intel_signal(self, description):
+        """
+        Input: Description/transcript of a fresh intel point
+        Output: Its risk contribution (0..1) for the per-location risk state
+        """
+        weight, _, _ = self.match_outcome(description or "")
+        return weight / 10.0 if weight else INTEL_BASELINE
 
     def assess_risk(self, similar_incidents):
         """
         Input: List of similar past incidents (from Memory Agent)
         Output: Risk Level (LOW/MEDIUM/HIGH) + Confidence
         """
-        if not similar_incidents:
-            return {"level": "UNKNOWN", "score": 0.0, "reason": "No historical data found"}
-
-        risk_score = 0
-        total_incidents = len(similar_incidents)
-        reasons = []
-
-        # Analyze each past incident
-        for incident in similar_incidents:
-            outcome = incident.get("outcome", "").lower()
-            match_score = incident.get("score", 0) # How similar was it? (e.g. 0.89)
-
-            # Check for danger keywords in the outcome
-            found_danger = False
-            for word in self.danger_signals:
-                if word in outcome:
-                    found_danger = True
-                    # If a very similar past event was dangerous, Risk goes UP
-                    risk_score += (10 * match_score) 
-                    reasons.append(f"Past event '{incident['incident']}' had outcome: {word}")
-                    break
-            
-            if not found_danger:
-                risk_score += (2 * match_score) # Minor risk increase for any incident
-
-        # Normalize Score (0 to 10 scale approx)
-        final_score = min(risk_score, 10) / 10.0  # Cap at 1.0 (100%)
-        
-        # Determine Level
-        if final_score > 0.7:
-            level = "CRITICAL"
-        elif final_score > 0.4:
-            level = "HIGH"
-        elif final_score > 0.2:
-            level = "MEDIUM"
-        else:
-            level = "LOW"
-
-        return {
-            "level": level,
-            "score": round(final_score, 2),
-            "flagged_factors": reasons[:2] # Show top 2 reasons
-        }
+        return self.assess_batch([similar_incidents])[0]
+
+    def assess_batch(self, incident_sets):
+        """
+        Input: Many candidate incident lists (e.g. one per active location)
+        Output: One assessment per list, scored in a single NumPy pass
+        """
+        incidents = [inc for incident_set in incident_sets for inc in incident_set]
+        with tracer.span("risk.score", sets=len(incident_sets), incidents=len(incidents)):
+            set_index = np.repeat(np.arange(len(incident_sets)), [len(s) for s in incident_sets])
+
+            # 1. Signal weight + similarity for every incident at once
+            matches = [self.match_outcome(inc.get("outcome") or "") for inc in incidents]
+            weights = np.array([m[0] for m in matches], dtype=np.float64)
+            similarity = np.array([inc.get("score", 0) or 0 for inc in incidents], dtype=np.float64)
+
+            # If a very similar past event was dangerous, Risk goes UP
+            contributions = np.where(weights > 0, weights, BASELINE_WEIGHT) * similarity
+
+            # 2. Sum per set, normalize (0 to 10 scale approx -> cap at 1.0) and bucket
+            totals = np.bincount(set_index, weights=contributions, minlength=len(incident_sets))
+            final_scores = np.minimum(totals, 10) / 10.0
+            levels = LEVELS[np.searchsorted(LEVEL_THRESHOLDS, final_scores, side="left")]
+
+            # 3. Assemble per-set results
+            results = []
+            start = 0
+            for i, incident_set in enumerate(incident_sets):
+                end = start + len(incident_set)
+                if not incident_set:
+                    results.append({"level": "UNKNOWN", "score": 0.0, "reason": "No historical data found"})
+                    continue
+
+                reasons = [
+                    f"Past event '{incidents[j].get('incident', 'Unknown')}' had outcome: {matches[j][1]}"
+                    for j in range(start, end) if matches[j][1]
+                ]
+                results.append({
+                    "level": str(levels[i]),
+                    "score": round(float(final_scores[i]), 2),
+                    "flagged_factors": reasons[:2] # Show top 2 reasons
+                })
+                start = end
+            return results
 
 # Singleton
-risk_agent = RiskAgent()
\ No newline at end of file
+risk_agent = RiskAgent()
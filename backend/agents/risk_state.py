@@ -0,0 +1,86 @@
+import os
+import math
+import time
+import heapq
+import threading
+
+from agents.risk import LEVELS, LEVEL_THRESHOLDS
+
+
+class LocationRiskState:
+    """
+    Incrementally maintained, exponentially decaying risk per location.
+
+    Updates are O(1): the location's score is decayed and bumped in place.
+    Ordering is deferred to top(). Every location decays at the same rate,
+    so the ranking key ln(score) + decay * last_update never changes
+    between updates, and top-N is one heapq.nlargest pass over the
+    locations (O(L log N)) without touching Qdrant or re-decaying scores.
+    """
+
+    def __init__(self, half_life_seconds=None):
+        self.half_life = half_life_seconds or float(os.getenv("RISK_HALF_LIFE_SECONDS", "900"))
+        self.decay = math.log(2) / self.half_life
+
+        self._state = {}   # location -> {"score", "ts", "events"}
+        self._lock = threading.Lock()
+
+    def update(self, location, contribution, ts=None):
+        """
+        Input: location, risk contribution (0..1) of a new intel point, its timestamp
+        Output: The location's current state
+        """
+        ts = ts or time.time()
+        with self._lock:
+            entry = self._state.get(location)
+            if entry is None:
+                entry = self._state[location] = {"score": 0.0, "ts": ts, "events": 0}
+
+            # Decay what we had up to `ts`, then add the new evidence.
+            # Late (out-of-order) points are decayed to the stored time instead.
+            if ts >= entry["ts"]:
+                entry["score"] = entry["score"] * math.exp(-self.decay * (ts - entry["ts"])) + contribution
+                entry["ts"] = ts
+            else:
+                entry["score"] += contribution * math.exp(-self.decay * (entry["ts"] - ts))
+
+            entry["events"] += 1
+            return self._view(location, entry, time.time())
+
+    def current(self, location, now=None):
+        with self._lock:
+            entry = self._state.get(location)
+            return self._view(location, entry, now or time.time()) if entry else None
+
+    def top(self, n=10, now=None):
+        """Top-N riskiest locations right now (decayed scores)."""
+        now = now or time.time()
+        with self._lock:
+            ranked = heapq.nlargest(
+                n, ((location, entry) for location, entry in self._state.items() if entry["score"] > 0),
+                key=lambda item: self._rank_key(item[1])
+            )
+            return [self._view(location, entry, now) for location, entry in ranked]
+
+    def __len__(self):
+        return len(self._state)
+
+    # --- INTERNALS ---
+    def _rank_key(self, entry):
+        return math.log(entry["score"]) + self.decay * entry["ts"]
+
+    def _view(self, location, entry, now):
+        score = entry["score"] * math.exp(-self.decay * max(0.0, now - entry["ts"]))
+        capped = min(score, 1.0)
+        level = LEVELS[sum(capped > t for t in LEVEL_THRESHOLDS)]
+        return {
+            "location": location,
+            "score": round(score, 4),
+            "level": str(level),
+            "events": entry["events"],
+            "last_update": entry["ts"]
+        }
+
+
+# Singleton
+risk_state = LocationRiskState()
@@ -0,0 +1,261 @@
+import os
+import time
+import asyncio
+from collections import deque, OrderedDict
+
+from agents.perception import perception_agent
+from agents.memory import memory_agent
+from agents.risk import risk_agent
+from agents.risk_state import risk_state
+
+DROP_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+
+class SlidingWindow:
+    """Time-based window over one sensor stream with O(1) mean and amortized O(1) max."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.values = deque()   # (ts, value)
+        self._maxes = deque()   # monotonic (ts, value), decreasing values
+        self.total = 0.0
+
+    def add(self, ts, value):
+        self.values.append((ts, value))
+        self.total += value
+        while self._maxes and self._maxes[-1][1] <= value:
+            self._maxes.pop()
+        self._maxes.append((ts, value))
+        self.evict(ts)
+
+    def evict(self, now):
+        cutoff = now - self.seconds
+        while self.values and self.values[0][0] < cutoff:
+            _, old = self.values.popleft()
+            self.total -= old
+        while self._maxes and self._maxes[0][0] < cutoff:
+            self._maxes.popleft()
+
+    def snapshot(self):
+        count = len(self.values)
+        return {
+            "mean": round(self.total / count, 3) if count else 0.0,
+            "max": self._maxes[0][1] if self._maxes else 0.0,
+            "count": count
+        }
+
+
+class SensorAggregator:
+    """
+    Aggregates frames per location over sliding windows and decides when a
+    location's window has changed enough to be worth a full analysis.
+
+    Locations are client-supplied, so their state is bounded: a location
+    whose windows have all emptied (and that is past min_interval) is
+    dropped every window_seconds, and at most SENSOR_MAX_LOCATIONS are
+    kept (least recently updated evicted first).
+    """
+
+    def __init__(self, window_seconds=None, change_threshold=None, min_interval=None, max_locations=None):
+        self.window_seconds = window_seconds or float(os.getenv("SENSOR_WINDOW_SECONDS", "10"))
+        self.change_threshold = change_threshold or float(os.getenv("SENSOR_CHANGE_THRESHOLD", "0.25"))
+        self.min_interval = min_interval or float(os.getenv("SENSOR_MIN_TRIGGER_SECONDS", "2"))
+        self.max_locations = max_locations or int(os.getenv("SENSOR_MAX_LOCATIONS", "10000"))
+
+        self.windows = OrderedDict()  # location -> {sensor: SlidingWindow}, least recently updated first
+        self.notes = {}               # location -> deque of recent free-text notes
+        self.last_trigger = {}        # location -> (ts, {sensor: mean}, last note)
+        self._last_prune = time.time()
+        self.stats = {"frames": 0, "invalid": 0, "triggers": 0, "locations_evicted": 0}
+
+    def add(self, frame):
+        """
+        Input: {"location", "sensor", "value", "text"?, "ts"?}
+        Output: Window summary if this frame changed the location materially, else None
+        """
+        try:
+            location = str(frame["location"])
+            sensor = str(frame.get("sensor", "generic"))
+            value = float(frame.get("value", 0.0))
+            ts = float(frame.get("ts") or time.time())
+        except (KeyError, TypeError, ValueError, AttributeError):
+            self.stats["invalid"] += 1
+            return None
+
+        self.stats["frames"] += 1
+        self._bound_locations(location)
+
+        sensors = self.windows.setdefault(location, {})
+        self.windows.move_to_end(location)
+        window = sensors.get(sensor)
+        if window is None:
+            window = sensors[sensor] = SlidingWindow(self.window_seconds)
+        window.add(ts, value)
+
+        if frame.get("text"):
+            self.notes.setdefault(location, deque(maxlen=3)).append(str(frame["text"]))
+
+        return self._maybe_trigger(location, ts)
+
+    def prune(self, now=None):
+        """Drops locations with nothing left in their windows and no trigger pending. Output: count dropped."""
+        now = now or time.time()
+        idle = []
+        for location, sensors in self.windows.items():
+            for sensor, window in list(sensors.items()):
+                window.evict(now)
+                if not window.values:
+                    del sensors[sensor]
+            last = self.last_trigger.get(location)
+            if not sensors and (last is None or now - last[0] >= self.min_interval):
+                idle.append(location)
+        for location in idle:
+            self._forget(location)
+        self._last_prune = now
+        return len(idle)
+
+    def _bound_locations(self, location):
+        now = time.time()
+        if now - self._last_prune >= self.window_seconds:
+            self.prune(now)
+        while location not in self.windows and len(self.windows) >= self.max_locations:
+            self._forget(next(iter(self.windows)))
+
+    def _forget(self, location):
+        self.windows.pop(location, None)
+        self.notes.pop(location, None)
+        self.last_trigger.pop(location, None)
+        self.stats["locations_evicted"] += 1
+
+    def summary(self, location, now=None):
+        now = now or time.time()
+        sensors = {}
+        for sensor, window in self.windows.get(location, {}).items():
+            window.evict(now)
+            if window.values:
+                sensors[sensor] = window.snapshot()
+        return {"location": location, "sensors": sensors, "notes": list(self.notes.get(location, []))}
+
+    def _maybe_trigger(self, location, now):
+        last = self.last_trigger.get(location)
+        if last and now - last[0] < self.min_interval:
+            return None
+
+        summary = self.summary(location, now)
+        means = {sensor: s["mean"] for sensor, s in summary["sensors"].items()}
+        note = summary["notes"][-1] if summary["notes"] else None
+
+        if last is not None:
+            _, last_means, last_note = last
+            changed = note != last_note or set(means) != set(last_means) or any(
+                abs(means[s] - last_means[s]) > self.change_threshold * max(abs(last_means[s]), 1e-6)
+                for s in means
+            )
+            if not changed:
+                return None
+
+        self.last_trigger[location] = (now, means, note)
+        self.stats["triggers"] += 1
+        return summary
+
+
+class SensorGateway:
+    """
+    Runs the perception -> memory -> risk chain for windows the aggregator
+    flags, at most one chain per location at a time and
+    SENSOR_MAX_CHAINS overall.
+    """
+
+    def __init__(self):
+        self.aggregator = SensorAggregator()
+        self.queue_size = int(os.getenv("SENSOR_QUEUE_SIZE", "1000"))
+        self.max_chains = int(os.getenv("SENSOR_MAX_CHAINS", "4"))
+        self._chain_slots = None
+        self._in_flight = set()
+        self.stats = {"connections": 0, "dropped": 0, "chains_run": 0, "chains_skipped": 0, "frame_errors": 0}
+
+    async def enqueue(self, queue, frame, policy):
+        """Applies the connection's backpressure / drop policy."""
+        if policy == "block":
+            await queue.put(frame)  # Stops reading the socket -> TCP pushes back on the sender
+            return True
+        if not queue.full():
+            queue.put_nowait(frame)
+            return True
+
+        self.stats["dropped"] += 1
+        if policy == "drop_oldest":
+            queue.get_nowait()
+            queue.put_nowait(frame)
+        return False
+
+    async def consume(self, queue, send):
+        """
+        Drains one connection's queue into the aggregator; `send` delivers alerts.
+        The connection's chains are held here (the loop only keeps weak
+        references to tasks) and cancelled when the connection closes.
+        """
+        chains = set()
+        try:
+            while True:
+                frame = await queue.get()
+                try:
+                    summary = self.aggregator.add(frame)
+                except Exception as e:
+                    # One bad frame must not end the connection's consumer (the socket
+                    # loop would then block forever on a full queue)
+                    self.stats["frame_errors"] += 1
+                    print(f"⚠️ Sensor Gateway: skipped frame ({e}).")
+                    continue
+                if summary is None:
+                    continue
+
+                # Claimed before the task starts: queue.get() doesn't yield while
+                # frames are waiting, so the chain itself would claim it too late
+                location = summary["location"]
+                if location in self._in_flight:
+                    self.stats["chains_skipped"] += 1
+                    continue
+                self._in_flight.add(location)
+                task = asyncio.create_task(self._run_chain(summary, send))
+                chains.add(task)
+                task.add_done_callback(chains.discard)
+                task.add_done_callback(lambda _, location=location: self._in_flight.discard(location))
+        finally:
+            for task in chains:
+                task.cancel()
+
+    async def _run_chain(self, summary, send):
+        if self._chain_slots is None:
+            self._chain_slots = asyncio.Semaphore(self.max_chains)
+
+        location = summary["location"]
+        try:
+            async with self._chain_slots:
+                # Perception -> Memory -> Risk
+                description = perception_agent.describe_sensor_window(summary)
+                incidents = await asyncio.to_thread(memory_agent.recall_patterns, description)
+                risk = risk_agent.assess_risk(incidents)
+                risk_state.update(location, risk["score"])
+                self.stats["chains_run"] += 1
+                await send({
+                    "type": "alert",
+                    "location": location,
+                    "description": description,
+                    "risk": risk,
+                    "similar_incidents": incidents
+                })
+        except Exception as e:
+            print(f"❌ Sensor Chain Error ({location}): {e}")
+
+    def report(self):
+        return dict(
+            self.stats,
+            **self.aggregator.stats,
+            locations=len(self.aggregator.windows),
+            chains_in_flight=len(self._in_flight)
+        )
+
+
+# Singleton (one gateway per node, shared by every connection)
+sensor_gateway = SensorGateway()
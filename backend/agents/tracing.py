@@ -0,0 +1,357 @@
+import os
+import re
+import sys
+import time
+import random
+import threading
+import contextvars
+from collections import deque, Counter
+
+# Latency buckets (seconds) shared by every span histogram
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_current = contextvars.ContextVar("aura_current_span", default=None)
+
+
+class Span:
+    """
+    One timed operation. Use as `with tracer.span(...)` (works in sync and
+    async code alike: the parent span travels in a contextvar, so tasks and
+    asyncio.to_thread calls nest under whoever started them).
+
+    String attributes become metric labels (keep them low-cardinality:
+    model, collection, vector name...); numeric ones (batch_size, tokens)
+    are summed per span name and kept on the recent-span record.
+    """
+    __slots__ = ("tracer", "name", "attributes", "trace_id", "span_id", "parent_id",
+                 "started_at", "_t0", "_token", "duration", "status")
+
+    def __init__(self, tracer, name, attributes):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+        self.status = "ok"
+
+    def set(self, key, value):
+        if value is not None:
+            self.attributes[key] = value
+        return self
+
+    def add(self, key, amount=1):
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+        return self
+
+    def __enter__(self):
+        parent = _current.get()
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.trace_id = parent.trace_id if parent is not None else f"{random.getrandbits(128):032x}"
+        self.parent_id = parent.span_id if parent is not None else None
+        self._token = _current.set(self)
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self._t0
+        if exc_type is not None:
+            self.status = "error"
+            self.attributes.setdefault("error", exc_type.__name__)
+        try:
+            _current.reset(self._token)
+        except ValueError:
+            # Exited from another context (e.g. an async generator resumed elsewhere)
+            _current.set(None)
+        self.tracer._finish(self)
+        return False
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return self.__exit__(exc_type, exc, tb)
+
+
+class _NoopSpan:
+    """Returned when tracing is off: same interface, no bookkeeping."""
+    trace_id = span_id = parent_id = None
+
+    def set(self, key, value):
+        return self
+
+    def add(self, key, amount=1):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """
+    In-process tracing for the hot paths (perception, embedding, Qdrant,
+    risk, LLM). Finished spans are folded into per-(name, labels) latency
+    histograms served as Prometheus text from GET /metrics, and the last
+    TRACING_RECENT_SPANS spans are kept for GET /traces.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.enabled = os.getenv("TRACING_ENABLED", "1") != "0"
+        self.buckets = tuple(buckets)
+        self.recent = deque(maxlen=int(os.getenv("TRACING_RECENT_SPANS", "512")))
+        self._histograms = {}   # (name, labels) -> {"buckets": [...], "sum", "count", "errors"}
+        self._attributes = {}   # (name, attribute) -> running sum
+        self._lock = threading.Lock()
+
+    def span(self, name, **attributes):
+        if not self.enabled:
+            return NOOP_SPAN
+        return Span(self, name, attributes)
+
+    def _finish(self, span):
+        labels = tuple(sorted(
+            (key, str(value)) for key, value in span.attributes.items()
+            if isinstance(value, (str, bool)) and key != "error"
+        ))
+        numeric = [
+            (key, value) for key, value in span.attributes.items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)
+        ]
+
+        with self._lock:
+            histogram = self._histograms.get((span.name, labels))
+            if histogram is None:
+                histogram = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0, "errors": 0}
+                self._histograms[(span.name, labels)] = histogram
+            for i, bound in enumerate(self.buckets):
+                if span.duration <= bound:
+                    histogram["buckets"][i] += 1
+            histogram["sum"] += span.duration
+            histogram["count"] += 1
+            if span.status == "error":
+                histogram["errors"] += 1
+            for key, value in numeric:
+                self._attributes[(span.name, key)] = self._attributes.get((span.name, key), 0) + value
+
+        self.recent.append({
+            "trace_id": span.trace_id,
+            "span_id": span.span_id,
+            "parent_id": span.parent_id,
+            "name": span.name,
+            "started_at": span.started_at,
+            "duration_ms": round(span.duration * 1000, 3),
+            "status": span.status,
+            "attributes": dict(span.attributes)
+        })
+
+    # --- READ SIDE ---
+    def traces(self, limit=50, name=None, min_ms=0.0):
+        """Most recent spans first, optionally filtered by name / minimum duration."""
+        spans = [
+            s for s in reversed(self.recent)
+            if (name is None or s["name"] == name) and s["duration_ms"] >= min_ms
+        ]
+        return spans[:limit]
+
+    def render_prometheus(self):
+        """All span histograms + attribute sums in Prometheus text exposition format."""
+        with self._lock:
+            histograms = {key: dict(h, buckets=list(h["buckets"])) for key, h in self._histograms.items()}
+            attributes = dict(self._attributes)
+
+        lines = [
+            "# HELP aura_span_duration_seconds Latency of traced operations.",
+            "# TYPE aura_span_duration_seconds histogram"
+        ]
+        for (name, labels), h in sorted(histograms.items()):
+            base = _labels((("span", name),) + labels)
+            for bound, count in zip(self.buckets, h["buckets"]):
+                lines.append(f"aura_span_duration_seconds_bucket{_labels((('span', name),) + labels + (('le', repr(bound)),))} {count}")
+            lines.append(f"aura_span_duration_seconds_bucket{_labels((('span', name),) + labels + (('le', '+Inf'),))} {h['count']}")
+            lines.append(f"aura_span_duration_seconds_sum{base} {h['sum']:.6f}")
+            lines.append(f"aura_span_duration_seconds_count{base} {h['count']}")
+
+        lines += ["# HELP aura_span_errors_total Traced operations that raised.", "# TYPE aura_span_errors_total counter"]
+        for (name, labels), h in sorted(histograms.items()):
+            lines.append(f"aura_span_errors_total{_labels((('span', name),) + labels)} {h['errors']}")
+
+        lines += [
+            "# HELP aura_span_attribute_total Sum of numeric span attributes (batch sizes, tokens, points...).",
+            "# TYPE aura_span_attribute_total counter"
+        ]
+        for (name, key), value in sorted(attributes.items()):
+            lines.append(f"aura_span_attribute_total{_labels((('span', name), ('attribute', key)))} {value}")
+
+        lines += profiler.prometheus_lines()
+        return "\n".join(lines) + "\n"
+
+    def report(self):
+        with self._lock:
+            spans = {}
+            for (name, _), h in self._histograms.items():
+                entry = spans.setdefault(name, {"count": 0, "errors": 0, "total_seconds": 0.0})
+                entry["count"] += h["count"]
+                entry["errors"] += h["errors"]
+                entry["total_seconds"] += h["sum"]
+        for entry in spans.values():
+            entry["mean_ms"] = round(entry.pop("total_seconds") / entry["count"] * 1000, 3) if entry["count"] else 0.0
+        return {"enabled": self.enabled, "spans": spans, "profiler": profiler.report()}
+
+
+def current_span():
+    """The innermost open span (a no-op span outside of any trace)."""
+    return _current.get() or NOOP_SPAN
+
+
+def _labels(pairs):
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# --- SAMPLING PROFILER ---
+# Leaf frames of threads that are parked, not working
+IDLE_FRAMES = {
+    ("threading.py", "wait"), ("queue.py", "get"), ("selectors.py", "select"),
+    ("thread.py", "_worker"), ("connection.py", "wait"), ("base_events.py", "_run_once")
+}
+
+
+class SamplingProfiler:
+    """
+    Wall-clock stack sampler for production: a daemon thread reads
+    sys._current_frames() every 1/PROFILER_HZ seconds and counts collapsed
+    stacks (flamegraph.pl / speedscope "collapsed" format). No tracing hooks
+    are installed, so the cost is one stack walk per thread per sample.
+
+    PROFILER_MODE = off (default) | on_demand (GET /debug/profile?seconds=N)
+                  | continuous (sampling from startup, low rate)
+    """
+
+    def __init__(self, hz=None, max_depth=None, max_stacks=None):
+        self.mode = os.getenv("PROFILER_MODE", "off").lower()
+        self.hz = hz or float(os.getenv("PROFILER_HZ", "19"))  # Off-round, so it doesn't lock step with timers
+        self.max_depth = max_depth or int(os.getenv("PROFILER_MAX_DEPTH", "48"))
+        self.max_stacks = max_stacks or int(os.getenv("PROFILER_MAX_STACKS", "5000"))
+        self.skip_idle = os.getenv("PROFILER_SKIP_IDLE", "1") != "0"
+
+        self.stacks = Counter()
+        self.samples = 0
+        self.sampling_seconds = 0.0
+        self.started_at = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._loop, name="aura-profiler", daemon=True)
+        self._thread.start()
+        print(f"🔬 Profiler: sampling stacks at {self.hz:g} Hz.")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+        self._thread = None
+
+    def _loop(self):
+        interval = 1.0 / self.hz
+        while not self._stop.wait(interval):
+            t0 = time.perf_counter()
+            self.sample()
+            self.sampling_seconds += time.perf_counter() - t0
+
+    def sample(self):
+        own = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        collapsed = []
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                code = frame.f_code
+                stack.append((os.path.basename(code.co_filename), code.co_name))
+                frame = frame.f_back
+            if not stack or (self.skip_idle and stack[0] in IDLE_FRAMES):
+                continue
+            thread = re.sub(r"[-_]?\d+$", "", names.get(ident, "thread"))
+            collapsed.append(";".join([thread] + [f"{filename}:{func}" for filename, func in reversed(stack)]))
+
+        with self._lock:
+            self.samples += 1
+            for key in collapsed:
+                if key in self.stacks or len(self.stacks) < self.max_stacks:
+                    self.stacks[key] += 1
+                else:
+                    self.stacks["[other]"] += 1
+
+    def collapsed(self, top=None):
+        """'thread;file:func;...;file:func count' lines, hottest first."""
+        with self._lock:
+            items = self.stacks.most_common(top)
+        return "\n".join(f"{stack} {count}" for stack, count in items) + ("\n" if items else "")
+
+    def reset(self):
+        with self._lock:
+            self.stacks.clear()
+            self.samples = 0
+            self.sampling_seconds = 0.0
+
+    def report(self):
+        elapsed = time.time() - self.started_at if self.started_at else 0.0
+        return {
+            "mode": self.mode,
+            "running": self.running,
+            "hz": self.hz,
+            "samples": self.samples,
+            "distinct_stacks": len(self.stacks),
+            # Share of one core spent walking stacks
+            "overhead": round(self.sampling_seconds / elapsed, 5) if elapsed and self.running else 0.0
+        }
+
+    def prometheus_lines(self):
+        return [
+            "# HELP aura_profiler_samples_total Stack samples taken by the sampling profiler.",
+            "# TYPE aura_profiler_samples_total counter",
+            f"aura_profiler_samples_total {self.samples}"
+        ]
+
+
+def capture_profile(seconds, hz=None, top=None):
+    """
+    On-demand profile: samples for `seconds` with a fresh profiler (the
+    continuous one, if any, keeps running untouched). Blocking: call
+    through asyncio.to_thread.
+    """
+    window = SamplingProfiler(hz=hz)
+    window.mode = "on_demand"
+    window.start()
+    time.sleep(seconds)
+    window.stop()
+    return window.collapsed(top)
+
+
+# Singletons (shared by every agent)
+profiler = SamplingProfiler()
+tracer = Tracer()
@@ -0,0 +1,163 @@
+import io
+import os
+import wave
+import threading
+from abc import ABC, abstractmethod
+
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+MOCK_TRANSCRIPT = "Emergency reported. Heavy smoke detected in Sector 4. Chemical smell present."
+WHISPER_SAMPLE_RATE = 16000  # What Whisper models expect
+
+
+def pcm_to_wav(pcm, sample_rate):
+    """16-bit mono PCM -> in-memory WAV file (for APIs that want a file)."""
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    buf.seek(0)
+    buf.name = "chunk.wav"
+    return buf
+
+
+def pcm_to_float(pcm, sample_rate):
+    """16-bit mono PCM -> float32 samples at 16 kHz (linear resample if needed)."""
+    samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+    if sample_rate != WHISPER_SAMPLE_RATE and len(samples):
+        duration = len(samples) / sample_rate
+        target = np.linspace(0, duration, int(duration * WHISPER_SAMPLE_RATE), endpoint=False)
+        samples = np.interp(target, np.arange(len(samples)) / sample_rate, samples).astype(np.float32)
+    return samples
+
+
+class TranscriptionBackend(ABC):
+    """
+    Speech -> text. Blocking: always call through asyncio.to_thread.
+    `transcribe` takes a whole recording (path or file object),
+    `transcribe_pcm` one chunk of 16-bit mono PCM from a live stream.
+    """
+    name = "base"
+
+    @abstractmethod
+    def transcribe(self, source):
+        """Input: path or file object. Output: the transcript text."""
+
+    def transcribe_pcm(self, pcm, sample_rate):
+        return self.transcribe(pcm_to_wav(pcm, sample_rate))
+
+
+class OpenAITranscriber(TranscriptionBackend):
+    """Hosted Whisper via the OpenAI SDK (v1 client, legacy module API as a fallback)."""
+    name = "openai"
+
+    def __init__(self, api_key=None, model=None):
+        import openai
+
+        self.model = model or os.getenv("OPENAI_TRANSCRIBE_MODEL", "whisper-1")
+        api_key = api_key or os.getenv("OPENAI_API_KEY")
+        base_url = os.getenv("OPENAI_BASE_URL")  # e.g. python -m bench.stub_llm for offline runs
+        if hasattr(openai, "OpenAI"):
+            self._client = openai.OpenAI(api_key=api_key, base_url=base_url or None)
+            self._legacy = None
+        else:
+            openai.api_key = api_key
+            if base_url:
+                openai.api_base = base_url
+            self._client = None
+            self._legacy = openai
+
+    def transcribe(self, source):
+        if not hasattr(source, "read"):
+            with open(source, "rb") as audio:
+                return self.transcribe(audio)
+
+        if self._client is not None:
+            return self._client.audio.transcriptions.create(model=self.model, file=source).text
+        return self._legacy.Audio.transcribe(self.model, source)["text"]
+
+
+class FasterWhisperTranscriber(TranscriptionBackend):
+    """Local CPU Whisper (pip install faster-whisper). Model loads on first use."""
+    name = "local"
+
+    def __init__(self, model_size=None, compute_type=None, threads=None):
+        self.model_size = model_size or os.getenv("WHISPER_MODEL", "base")
+        self.compute_type = compute_type or os.getenv("WHISPER_COMPUTE_TYPE", "int8")
+        self.threads = threads or int(os.getenv("WHISPER_THREADS", "4"))
+        self._model = None
+        self._lock = threading.Lock()
+
+    def _get_model(self):
+        with self._lock:
+            if self._model is None:
+                from faster_whisper import WhisperModel
+
+                print(f"📦 Transcription: Loading local Whisper '{self.model_size}' ({self.compute_type})...")
+                self._model = WhisperModel(
+                    self.model_size, device="cpu", compute_type=self.compute_type, cpu_threads=self.threads
+                )
+            return self._model
+
+    def _run(self, audio):
+        segments, _ = self._get_model().transcribe(audio, vad_filter=True)
+        return " ".join(segment.text.strip() for segment in segments).strip()
+
+    def transcribe(self, source):
+        return self._run(source)
+
+    def transcribe_pcm(self, pcm, sample_rate):
+        # No WAV round trip: faster-whisper takes raw 16 kHz float samples
+        return self._run(pcm_to_float(pcm, sample_rate))
+
+
+class MockTranscriber(TranscriptionBackend):
+    """Fixed transcript, for demos and offline tests."""
+    name = "mock"
+
+    def transcribe(self, source):
+        return MOCK_TRANSCRIPT
+
+    def transcribe_pcm(self, pcm, sample_rate):
+        return MOCK_TRANSCRIPT
+
+
+BACKENDS = {
+    "openai": OpenAITranscriber,
+    "local": FasterWhisperTranscriber,
+    "mock": MockTranscriber,
+}
+
+
+def select_backend(name=None):
+    """
+    TRANSCRIPTION_BACKEND = openai | local | mock | auto (default).
+    auto: OpenAI if OPENAI_API_KEY is set, else local Whisper if
+    faster-whisper is installed, else the mock transcript.
+    """
+    name = (name or os.getenv("TRANSCRIPTION_BACKEND", "auto")).lower()
+    if name == "auto":
+        if os.getenv("OPENAI_API_KEY"):
+            name = "openai"
+        else:
+            try:
+                import faster_whisper  # noqa: F401
+                name = "local"
+            except ImportError:
+                print("⚠️ No OpenAI Key or local Whisper found. Using Mock Transcription.")
+                name = "mock"
+
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown transcription backend '{name}' (expected one of {sorted(BACKENDS)} or 'auto')")
+    backend = BACKENDS[name]()
+    print(f"🎙️ Transcription: '{backend.name}' backend.")
+    return backend
+
+
+# Singleton
+transcriber = select_backend()
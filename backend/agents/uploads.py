@@ -0,0 +1,183 @@
+import os
+import io
+import asyncio
+import hashlib
+import zipfile
+import tempfile
+
+CHUNK_SIZE = int(os.getenv("INGEST_CHUNK_BYTES", str(1024 * 1024)))
+AUDIO_SPILL_BYTES = int(os.getenv("INGEST_AUDIO_SPILL_BYTES", str(8 * 1024 * 1024)))
+MAX_IMAGE_BYTES = int(os.getenv("INGEST_MAX_IMAGE_BYTES", str(25 * 1024 * 1024)))
+# Audio and .zip parts (spilled to disk, so this only bounds temp disk use)
+MAX_UPLOAD_BYTES = int(os.getenv("INGEST_MAX_UPLOAD_BYTES", str(256 * 1024 * 1024)))
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".gif", ".webp", ".tif", ".tiff"}
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class IngestedUpload:
+    """
+    An upload read chunk by chunk: hashed on the fly, held in memory, or
+    spilled to a uniquely named temp file once it grows past the spill limit.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename or "upload"
+        self.sha256 = None
+        self.size = 0
+        self.buffer = io.BytesIO()
+        self.path = None  # Set when spilled to disk
+
+    @property
+    def source(self):
+        """What Pillow / the transcriber should open: a path or a seekable buffer."""
+        if self.path:
+            return self.path
+        self.buffer.seek(0)
+        self.buffer.name = self.filename  # Some SDKs infer the format from .name
+        return self.buffer
+
+    async def cleanup(self):
+        if self.path:
+            await asyncio.to_thread(_remove_quietly, self.path)
+            self.path = None
+
+
+async def read_upload(file, spill_bytes=None, max_bytes=None):
+    """
+    Input: FastAPI UploadFile
+    Output: IngestedUpload (sha256 + size computed while streaming)
+
+    spill_bytes: move to a temp file past this size (audio); None = stay in memory
+    max_bytes: reject uploads bigger than this (raises UploadTooLarge)
+    """
+    upload = IngestedUpload(file.filename)
+    digest = hashlib.sha256()
+    spill_file = None
+
+    try:
+        while True:
+            chunk = await file.read(CHUNK_SIZE)
+            if not chunk:
+                break
+
+            digest.update(chunk)
+            upload.size += len(chunk)
+            if max_bytes and upload.size > max_bytes:
+                raise UploadTooLarge(f"Upload exceeds {max_bytes} bytes")
+
+            if spill_file is not None:
+                await asyncio.to_thread(spill_file.write, chunk)
+                continue
+
+            upload.buffer.write(chunk)
+            if spill_bytes and upload.buffer.tell() > spill_bytes:
+                # Unique name per upload: no collisions between concurrent feeds
+                suffix = os.path.splitext(upload.filename)[1]
+                spill_file = await asyncio.to_thread(
+                    tempfile.NamedTemporaryFile, prefix="aura_", suffix=suffix, delete=False
+                )
+                upload.path = spill_file.name
+                await asyncio.to_thread(spill_file.write, upload.buffer.getvalue())
+                upload.buffer = io.BytesIO()
+    except BaseException:
+        if spill_file is not None:
+            await asyncio.to_thread(spill_file.close)
+        await upload.cleanup()
+        raise
+
+    if spill_file is not None:
+        await asyncio.to_thread(spill_file.close)
+
+    upload.sha256 = digest.hexdigest()
+    return upload
+
+
+def upload_limits(modality, filename):
+    """
+    Output: (spill_bytes, max_bytes) for one uploaded part.
+    Images stay in memory under MAX_IMAGE_BYTES; audio and archives spill to
+    disk past AUDIO_SPILL_BYTES and are capped at MAX_UPLOAD_BYTES.
+    """
+    if is_archive(filename):
+        return AUDIO_SPILL_BYTES, MAX_UPLOAD_BYTES
+    if modality not in ("image", "audio"):
+        modality = guess_modality(filename)
+    if modality == "image":
+        return None, MAX_IMAGE_BYTES
+    return AUDIO_SPILL_BYTES, MAX_UPLOAD_BYTES
+
+
+def expand_archive(upload, modality="auto"):
+    """
+    Blocking (run via asyncio.to_thread): unpacks a .zip upload into one
+    IngestedUpload per member file, with the same limits as a direct upload
+    (see upload_limits).
+    Output: (members, rejected) - rejected = [(filename, message)] for
+    members over their size limit.
+    """
+    members, rejected = [], []
+    try:
+        with zipfile.ZipFile(upload.source) as archive:
+            for info in archive.infolist():
+                if info.is_dir():
+                    continue
+                filename = os.path.basename(info.filename)
+                spill_bytes, max_bytes = upload_limits(modality, filename)
+                if is_archive(filename):
+                    rejected.append((filename, "Nested archives are not supported"))
+                elif info.file_size > max_bytes:
+                    rejected.append((filename, f"Upload exceeds {max_bytes} bytes"))
+                else:
+                    members.append(_read_member(archive, info, filename, spill_bytes))
+    except BaseException:
+        for member in members:
+            if member.path:
+                _remove_quietly(member.path)
+        raise
+    return members, rejected
+
+
+def _read_member(archive, info, filename, spill_bytes):
+    member = IngestedUpload(filename)
+    digest = hashlib.sha256()
+    spill_file = None
+    if spill_bytes and info.file_size > spill_bytes:
+        spill_file = tempfile.NamedTemporaryFile(prefix="aura_", suffix=os.path.splitext(filename)[1], delete=False)
+        member.path = spill_file.name
+
+    try:
+        with archive.open(info) as source:
+            target = spill_file or member.buffer
+            for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+                member.size += len(chunk)
+                target.write(chunk)
+    except BaseException:
+        if spill_file is not None:
+            spill_file.close()
+            _remove_quietly(member.path)
+        raise
+    if spill_file is not None:
+        spill_file.close()
+
+    member.sha256 = digest.hexdigest()
+    return member
+
+
+def is_archive(filename):
+    return (filename or "").lower().endswith(".zip")
+
+
+def guess_modality(filename):
+    return "image" if os.path.splitext(filename or "")[1].lower() in IMAGE_EXTENSIONS else "audio"
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,34 @@
+import os
+import threading
+from dotenv import load_dotenv
+from qdrant_client import QdrantClient
+
+load_dotenv()
+
+_client = None
+_lock = threading.Lock()
+
+
+def get_qdrant_client():
+    """
+    The process-wide QdrantClient, built on first call and shared by the
+    API and the agents (one connection pool, and one store in local mode).
+
+    QDRANT_URL (+ QDRANT_API_KEY)   Qdrant Cloud / a Qdrant server
+    QDRANT_LOCATION=:memory:        in-process local mode, nothing persisted
+    QDRANT_PATH=<dir>               in-process local mode, persisted to <dir>
+    The local modes need no server (offline dev, benchmarks); run
+    init_memory.setup_cloud_memory(client) once to create the collections.
+    """
+    global _client
+    with _lock:
+        if _client is None:
+            if os.getenv("QDRANT_PATH"):
+                print(f"💾 Qdrant: local mode at '{os.getenv('QDRANT_PATH')}'.")
+                _client = QdrantClient(path=os.getenv("QDRANT_PATH"))
+            elif os.getenv("QDRANT_LOCATION") == ":memory:":
+                print("💾 Qdrant: in-memory local mode.")
+                _client = QdrantClient(location=":memory:")
+            else:
+                _client = QdrantClient(url=os.getenv("QDRANT_URL"), api_key=os.getenv("QDRANT_API_KEY"))
+        return _client
@@ -0,0 +1,173 @@
+import os
+import json
+import threading
+import numpy as np
+
+# Optional: approximate (HNSW) search once the collection grows
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+
+class LocalVectorIndex:
+    """
+    In-process copy of one named vector of a Qdrant collection.
+
+    Exact cosine search over a normalized NumPy matrix; switches to an HNSW
+    graph (hnswlib, if installed) once the index holds `ann_threshold` points.
+    """
+
+    def __init__(self, vector_name="text_vec", dim=384, ann_threshold=None):
+        self.vector_name = vector_name
+        self.dim = dim
+        self.ann_threshold = ann_threshold or int(os.getenv("MEMORY_ANN_THRESHOLD", "20000"))
+
+        self.ids = []
+        self.payloads = []
+        self.matrix = np.zeros((0, dim), dtype=np.float32)
+        self._ann = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.ids)
+
+    # --- BUILD / SYNC ---
+    def add(self, ids, vectors, payloads):
+        """Adds (or replaces) points. Zero/missing vectors are skipped."""
+        rows, keep_ids, keep_payloads = [], [], []
+        for point_id, vector, payload in zip(ids, vectors, payloads):
+            if vector is None:
+                continue
+            v = np.asarray(vector, dtype=np.float32)
+            norm = np.linalg.norm(v)
+            if norm == 0:
+                continue
+            rows.append(v / norm)
+            keep_ids.append(str(point_id))
+            keep_payloads.append(payload or {})
+
+        if not rows:
+            return 0
+
+        with self._lock:
+            # Replace existing ids in place, append the rest
+            positions = {point_id: i for i, point_id in enumerate(self.ids)}
+            fresh, replaced = [], []
+            for row, point_id, payload in zip(rows, keep_ids, keep_payloads):
+                if point_id in positions:
+                    self.matrix[positions[point_id]] = row
+                    self.payloads[positions[point_id]] = payload
+                    replaced.append(positions[point_id])
+                else:
+                    fresh.append((row, point_id, payload))
+
+            if fresh:
+                self.matrix = np.vstack([self.matrix, np.stack([r for r, _, _ in fresh])])
+                self.ids.extend(p for _, p, _ in fresh)
+                self.payloads.extend(p for _, _, p in fresh)
+
+            self._refresh_ann(replaced)
+        return len(rows)
+
+    def load_from_qdrant(self, client, collection, batch_size=256):
+        """Snapshots the collection via scroll. Returns the number of points indexed."""
+        offset = None
+        while True:
+            points, offset = client.scroll(
+                collection_name=collection,
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=[self.vector_name]
+            )
+            self.add(
+                [p.id for p in points],
+                [(p.vector or {}).get(self.vector_name) for p in points],
+                [p.payload for p in points]
+            )
+            if offset is None:
+                break
+        return len(self)
+
+    # --- DISK SNAPSHOT ---
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._lock:
+            np.savez(
+                path,
+                matrix=self.matrix,
+                ids=np.array(self.ids, dtype=str),
+                payloads=np.array([json.dumps(p) for p in self.payloads], dtype=str)
+            )
+
+    def load(self, path):
+        data = np.load(path, allow_pickle=False)
+        with self._lock:
+            self.matrix = data["matrix"].astype(np.float32)
+            self.ids = [str(i) for i in data["ids"]]
+            self.payloads = [json.loads(p) for p in data["payloads"]]
+            self._ann = None
+            self._refresh_ann()
+        return len(self)
+
+    # --- QUERY ---
+    def search(self, vector, limit=3):
+        """
+        Input: Query vector
+        Output: List of (id, cosine score, payload), best first
+        """
+        q = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(q)
+        if norm == 0 or not self.ids:
+            return []
+        q = q / norm
+
+        with self._lock:
+            k = min(limit, len(self.ids))
+            if self._ann is not None:
+                labels, distances = self._ann.knn_query(q, k=k)
+                hits = [(int(i), 1.0 - float(d)) for i, d in zip(labels[0], distances[0])]
+            else:
+                scores = self.matrix @ q
+                top = np.argpartition(-scores, k - 1)[:k]
+                top = top[np.argsort(-scores[top])]
+                hits = [(int(i), float(scores[i])) for i in top]
+
+            return [(self.ids[i], score, self.payloads[i]) for i, score in hits]
+
+    def score(self, vector, ids):
+        """Exact cosine score of `vector` against specific points: {id: score}."""
+        q = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(q)
+        if norm == 0:
+            return {}
+        wanted = {str(i) for i in ids}
+        with self._lock:
+            rows = [i for i, point_id in enumerate(self.ids) if point_id in wanted]
+            scores = self.matrix[rows] @ (q / norm) if rows else []
+            return {self.ids[i]: float(s) for i, s in zip(rows, scores)}
+
+    def _refresh_ann(self, replaced=()):
+        # Maintained under the caller's lock; only used past the size threshold
+        if hnswlib is None or len(self.ids) < self.ann_threshold:
+            self._ann = None
+            return
+
+        if self._ann is None:
+            self._ann = hnswlib.Index(space="cosine", dim=self.dim)
+            self._ann.init_index(max_elements=len(self.ids) * 2, ef_construction=200, M=16)
+            self._ann.set_ef(64)
+            start = 0
+        else:
+            start = self._ann.get_current_count()
+            if len(self.ids) > self._ann.get_max_elements():
+                self._ann.resize_index(len(self.ids) * 2)
+
+        if start < len(self.ids):
+            self._ann.add_items(self.matrix[start:], np.arange(start, len(self.ids)))
+
+        # Replaced rows keep their label; re-adding updates the stored vector
+        stale = [i for i in replaced if i < start]
+        if stale:
+            self._ann.add_items(self.matrix[stale], np.array(stale))
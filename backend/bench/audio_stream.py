@@ -0,0 +1,102 @@
+"""
+Time to first insight on a long recording: streamed over /ws/audio vs
+uploaded whole to /ingest once the recording has finished.
+
+Start the API first (python main.py), then:
+    python -m bench.audio_stream --wav capture.wav --speed 1
+    python -m bench.audio_stream --seconds 120 --speed 4   # synthetic audio
+
+The recording is "played" at --speed x real time, as a radio capture
+would arrive. Needs 16-bit mono WAV input.
+"""
+import io
+import json
+import time
+import wave
+import asyncio
+import argparse
+
+import numpy as np
+import requests
+import websockets
+
+
+def load_pcm(path, seconds, sample_rate=16000):
+    if path:
+        with wave.open(path, "rb") as wav:
+            if wav.getsampwidth() != 2 or wav.getnchannels() != 1:
+                raise SystemExit("❌ Need a 16-bit mono WAV file.")
+            return wav.readframes(wav.getnframes()), wav.getframerate()
+
+    # Synthetic "radio chatter": a warbling tone with noise bursts
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    signal = 0.3 * np.sin(2 * np.pi * (300 + 80 * np.sin(t)) * t) + 0.05 * np.random.default_rng(1).standard_normal(len(t))
+    return (signal * 32767).astype(np.int16).tobytes(), sample_rate
+
+
+async def stream(ws_url, pcm, sample_rate, speed, frame_ms=200):
+    frame_bytes = int(sample_rate * frame_ms / 1000) * 2
+    started = time.perf_counter()
+    first_partial = None
+    partials = 0
+
+    async with websockets.connect(f"{ws_url}/ws/audio?location=Bench&sample_rate={sample_rate}", max_size=None) as ws:
+        async def listen():
+            nonlocal first_partial, partials
+            async for message in ws:
+                event = json.loads(message)
+                if event["type"] == "partial":
+                    partials += 1
+                    first_partial = first_partial or time.perf_counter() - started
+                elif event["type"] == "final":
+                    return event
+
+        listener = asyncio.create_task(listen())
+        for i in range(0, len(pcm), frame_bytes):
+            await ws.send(pcm[i:i + frame_bytes])
+            await asyncio.sleep(frame_ms / 1000 / speed)
+        await ws.send(json.dumps({"event": "end"}))
+        final = await listener
+
+    return first_partial, time.perf_counter() - started, partials, final
+
+
+def upload_whole(base_url, pcm, sample_rate, duration, speed):
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+
+    # Nothing can be sent until the recording is over
+    t0 = time.perf_counter()
+    r = requests.post(
+        f"{base_url}/ingest",
+        files={"file": ("capture.wav", buf.getvalue(), "audio/wav")},
+        data={"type": "audio", "location": "Bench"},
+        timeout=600
+    )
+    r.raise_for_status()
+    return duration / speed + (time.perf_counter() - t0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Streamed vs whole-file audio ingest")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--wav", default=None, help="16-bit mono WAV (default: synthetic audio)")
+    parser.add_argument("--seconds", type=float, default=60, help="Synthetic recording length")
+    parser.add_argument("--speed", type=float, default=1.0, help="Playback speed vs real time")
+    args = parser.parse_args()
+
+    pcm, sample_rate = load_pcm(args.wav, args.seconds)
+    duration = len(pcm) / 2 / sample_rate
+    print(f"🎙️ {duration:.1f}s of audio at {sample_rate} Hz, played at {args.speed}x")
+
+    ws_url = args.url.replace("http", "ws", 1)
+    first, total, partials, final = asyncio.run(stream(ws_url, pcm, sample_rate, args.speed))
+    whole = upload_whole(args.url, pcm, sample_rate, duration, args.speed)
+
+    print(f"   streamed: first partial after {first or float('nan'):.2f}s, final after {total:.2f}s ({partials} partials)")
+    print(f"   whole upload: first (and only) insight after {whole:.2f}s")
+    print(f"   final transcript: {final.get('text', '')[:120]!r}")
@@ -0,0 +1,87 @@
+"""
+Filtered vs unfiltered live_intel query latency.
+
+Runs against an in-process Qdrant stand-in by default (no server needed):
+    python -m bench.filtered_recall --points 50000
+Or against a real instance, where the payload indexes actually kick in:
+    python -m bench.filtered_recall --url http://localhost:6333 --points 1000000
+"""
+import time
+import uuid
+import argparse
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.models import PointStruct
+
+from init_memory import setup_cloud_memory
+from agents.memory import intel_filter
+
+COLLECTION = "live_intel"
+
+
+def populate(client, n, locations, batch=1000, seed=5):
+    rng = np.random.default_rng(seed)
+    now = time.time()
+    for start in range(0, n, batch):
+        size = min(batch, n - start)
+        text = rng.standard_normal((size, 384)).astype(np.float32)
+        image = rng.standard_normal((size, 512)).astype(np.float32)
+        points = [
+            PointStruct(
+                id=str(uuid.uuid4()),
+                # Sparse like the real write path: one named vector per point
+                vector={"image_vec": image[i].tolist()} if i % 2 else {"text_vec": text[i].tolist()},
+                payload={
+                    "type": "image" if i % 2 else "audio",
+                    "location": f"Sector {rng.integers(locations)}",
+                    "timestamp": now - float(rng.uniform(0, 7 * 24 * 3600)),  # last 7 days
+                    "description": "bench"
+                }
+            )
+            for i in range(size)
+        ]
+        client.upsert(collection_name=COLLECTION, points=points, wait=True)
+
+
+def measure(client, queries, query_filter, vector_name, limit):
+    latencies = []
+    for q in queries:
+        t0 = time.perf_counter()
+        client.query_points(
+            collection_name=COLLECTION, query=q.tolist(), using=vector_name,
+            query_filter=query_filter, limit=limit, with_payload=True
+        )
+        latencies.append((time.perf_counter() - t0) * 1000)
+    lat = np.array(latencies)
+    return np.percentile(lat, 50), np.percentile(lat, 95), np.percentile(lat, 99)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Filtered recall latency")
+    parser.add_argument("--url", default=None, help="Qdrant URL (default: in-process stand-in)")
+    parser.add_argument("--points", type=int, default=20000)
+    parser.add_argument("--locations", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--limit", type=int, default=5)
+    args = parser.parse_args()
+
+    client = QdrantClient(url=args.url) if args.url else QdrantClient(location=":memory:")
+    setup_cloud_memory(client)
+
+    print(f"🌱 Loading {args.points:,} synthetic live_intel points...")
+    populate(client, args.points, args.locations)
+
+    queries = np.random.default_rng(9).standard_normal((args.queries, 512)).astype(np.float32)
+    cases = [
+        ("unfiltered", None, "text_vec"),
+        ("location", intel_filter(location="Sector 7"), "text_vec"),
+        ("location + 30 min", intel_filter(location="Sector 7", window_minutes=30), "text_vec"),
+        ("location + 30 min + image", intel_filter(location="Sector 7", intel_type="image", window_minutes=30), "image_vec"),
+    ]
+
+    print(f"📊 {args.queries} queries per case, limit={args.limit} ({'Qdrant ' + args.url if args.url else 'in-process stand-in'})")
+    for label, query_filter, vector_name in cases:
+        dim = 512 if vector_name == "image_vec" else 384
+        p50, p95, p99 = measure(client, queries[:, :dim], query_filter, vector_name, args.limit)
+        print(f"   {label:<28} p50={p50:7.2f}ms  p95={p95:7.2f}ms  p99={p99:7.2f}ms")
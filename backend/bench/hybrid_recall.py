@@ -0,0 +1,114 @@
+"""
+Offline relevance + latency: dense vs hybrid (dense + BM25, RRF) recall.
+
+Seeds a synthetic incident history into an in-process Qdrant stand-in and
+asks operator-style queries whose answer hinges on an exact term (sector
+number, chemical). Each query has exactly one relevant incident.
+
+    python -m bench.hybrid_recall --incidents 2000 --queries 200
+
+Reports hit rate @k, MRR and p50/p95 recall latency per mode.
+"""
+import time
+import random
+import argparse
+
+import numpy as np
+from qdrant_client import QdrantClient
+
+from init_memory import setup_cloud_memory
+from agents.memory import memory_agent, HISTORY_COLLECTION
+
+HAZARDS = [
+    ("Warehouse fire with thick black smoke", "smoke pouring out of a storage building"),
+    ("Gas leak near the loading docks", "strong gas smell around the docks"),
+    ("Partial roof collapse after heavy rain", "roof caved in after the storm"),
+    ("Chemical spill on the highway", "tanker leaking on the road"),
+    ("Electrical fire in a substation", "sparks and flames at the power station"),
+]
+CHEMICALS = ["chlorine", "ammonia", "toluene", "acetone", "hydrogen sulfide", "benzene", "methanol", "sulfuric acid"]
+OUTCOMES = [
+    "Flashover occurred in 5 mins. Roof collapsed.",
+    "Toxic cloud drifted South. Respiratory distress reported.",
+    "Contained within 20 minutes. No injuries.",
+    "Power grid failed across two blocks.",
+]
+
+
+def synthetic_history(n, sectors, seed=21):
+    rng = random.Random(seed)
+    records = []
+    for i in range(n):
+        hazard, _ = rng.choice(HAZARDS)
+        sector, chemical = rng.randint(1, sectors), rng.choice(CHEMICALS)
+        records.append({
+            "text": f"{hazard} in Sector {sector}. {chemical.capitalize()} stored on site.",
+            "payload": {
+                "incident_name": f"Incident {i:05d}",
+                "year": str(rng.randint(2015, 2024)),
+                "outcome": rng.choice(OUTCOMES),
+                "action_taken": f"Cordoned off Sector {sector}. Hazmat team for {chemical}.",
+                "bench_key": f"{hazard}|{sector}|{chemical}"
+            }
+        })
+    return records
+
+
+def synthetic_queries(records, n, seed=22):
+    """Paraphrased queries; the relevant incident is the only one with that hazard/sector/chemical."""
+    rng = random.Random(seed)
+    counts = {}
+    for r in records:
+        counts[r["payload"]["bench_key"]] = counts.get(r["payload"]["bench_key"], 0) + 1
+    unique = [r for r in records if counts[r["payload"]["bench_key"]] == 1]
+
+    queries = []
+    for r in rng.sample(unique, min(n, len(unique))):
+        hazard, sector, chemical = r["payload"]["bench_key"].split("|")
+        paraphrase = dict(HAZARDS)[hazard]
+        queries.append((f"{paraphrase}, sector {sector}, crews report {chemical}", r["payload"]["incident_name"]))
+    return queries
+
+
+def evaluate(queries, limit):
+    hits, reciprocal, latencies = 0, 0.0, []
+    for text, expected in queries:
+        t0 = time.perf_counter()
+        results = memory_agent.recall_patterns(text, limit=limit)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        names = [r["incident"] for r in results]
+        if expected in names:
+            hits += 1
+            reciprocal += 1.0 / (names.index(expected) + 1)
+    lat = np.array(latencies)
+    return hits / len(queries), reciprocal / len(queries), np.percentile(lat, 50), np.percentile(lat, 95)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dense vs hybrid recall")
+    parser.add_argument("--incidents", type=int, default=2000)
+    parser.add_argument("--sectors", type=int, default=40)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=3)
+    args = parser.parse_args()
+
+    # Offline: point the Memory Agent at an in-process stand-in
+    memory_agent.client = QdrantClient(location=":memory:")
+    setup_cloud_memory(memory_agent.client)
+
+    records = synthetic_history(args.incidents, args.sectors)
+    queries = synthetic_queries(records, args.queries)
+    print(f"🌱 Seeding {len(records):,} incidents, {len(queries)} labelled queries...")
+    memory_agent.store_patterns(records, collection=HISTORY_COLLECTION)
+
+    # Warm the query embedding cache so both modes pay the same encode cost
+    for text, _ in queries:
+        memory_agent._embed_query(text)
+    memory_agent.keyword_index(HISTORY_COLLECTION)
+
+    print(f"📊 hit@{args.limit} / MRR / latency over {len(queries)} queries")
+    for mode in ("dense", "hybrid"):
+        memory_agent.retrieval = mode
+        memory_agent.invalidate(HISTORY_COLLECTION)
+        hit_rate, mrr, p50, p95 = evaluate(queries, args.limit)
+        print(f"   {mode:<7} hit={hit_rate:6.3f}  mrr={mrr:6.3f}  p50={p50:7.2f}ms  p95={p95:7.2f}ms")
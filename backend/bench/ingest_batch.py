@@ -0,0 +1,79 @@
+"""
+Compares N single-item /ingest calls with one /ingest/batch call.
+
+Start the API first (python main.py), then:
+    python -m bench.ingest_batch --items 200 --concurrency 8
+"""
+import io
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+from PIL import Image
+
+
+def synthetic_frames(n, size=224, seed=7):
+    """Random 'drone frames' encoded as JPEG bytes."""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for i in range(n):
+        pixels = rng.integers(0, 255, size=(size, size, 3), dtype=np.uint8)
+        buf = io.BytesIO()
+        Image.fromarray(pixels).save(buf, format="JPEG", quality=80)
+        frames.append((f"frame_{i:05d}.jpg", buf.getvalue()))
+    return frames
+
+
+def run_single(base_url, frames, location, concurrency):
+    def post(frame):
+        name, data = frame
+        r = requests.post(
+            f"{base_url}/ingest",
+            files={"file": (name, data, "image/jpeg")},
+            data={"type": "image", "location": location},
+            timeout=120
+        )
+        return r.ok and r.json().get("status") == "success"
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        ok = list(pool.map(post, frames))
+    return sum(ok), time.perf_counter() - started
+
+
+def run_batch(base_url, frames, location, batch_size):
+    started = time.perf_counter()
+    stored = 0
+    for i in range(0, len(frames), batch_size):
+        chunk = frames[i:i + batch_size]
+        r = requests.post(
+            f"{base_url}/ingest/batch",
+            files=[("files", (name, data, "image/jpeg")) for name, data in chunk],
+            data={"type": "image", "location": location},
+            timeout=600
+        )
+        r.raise_for_status()
+        stored += r.json()["summary"]["stored"]
+    return stored, time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Single vs batch ingest benchmark")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8, help="parallel clients for the single-item path")
+    parser.add_argument("--batch-size", type=int, default=100, help="files per /ingest/batch request")
+    parser.add_argument("--location", default="Bench Sector")
+    args = parser.parse_args()
+
+    frames = synthetic_frames(args.items)
+    print(f"🖼️ {len(frames)} synthetic frames ready.")
+
+    single_ok, single_s = run_single(args.base_url, frames, args.location, args.concurrency)
+    batch_ok, batch_s = run_batch(args.base_url, frames, args.location, args.batch_size)
+
+    print(f"📊 single /ingest : {single_ok}/{len(frames)} stored in {single_s:.2f}s  ({single_ok / single_s:.1f} items/s)")
+    print(f"📊 /ingest/batch  : {batch_ok}/{len(frames)} stored in {batch_s:.2f}s  ({batch_ok / batch_s:.1f} items/s)")
+    print(f"🚀 speed-up: {single_s / batch_s:.2f}x")
@@ -0,0 +1,59 @@
+"""
+Load-tests DecisionAgent.generate_plan through the LLM gateway with no network.
+
+Start the stub first:  python -m bench.stub_llm --latency-ms 300 --failure-rate 0.05
+Then:                  python -m bench.llm_load --requests 200 --concurrency 32
+"""
+import os
+import time
+import asyncio
+import argparse
+
+import numpy as np
+
+
+async def main(args):
+    # Must be set before the agents read their config
+    os.environ["GROQ_BASE_URL"] = args.base_url
+    os.environ.setdefault("GROQ_API_KEY", "stub")
+    os.environ["LLM_MAX_CONCURRENCY"] = str(args.max_in_flight)
+    if not args.use_cache:
+        os.environ["LLM_CACHE_ENABLED"] = "0"  # Measure the gateway, not the response cache
+
+    from agents.decision import decision_agent
+    from agents.llm import llm_gateway
+
+    incidents = [
+        {"incident": "Metro Textile Fire", "outcome": "Flashover occurred in 5 mins.", "action_taken": "Evacuated North Wing."}
+    ]
+    risk = {"level": "HIGH", "score": 0.6}
+    gate = asyncio.Semaphore(args.concurrency)
+    latencies = []
+
+    async def one(i):
+        async with gate:
+            t0 = time.perf_counter()
+            plan = await decision_agent.generate_plan(f"Heavy smoke detected in Sector {i % 9}", risk, incidents)
+            latencies.append((time.perf_counter() - t0) * 1000)
+            return "error" not in plan
+
+    started = time.perf_counter()
+    ok = await asyncio.gather(*(one(i) for i in range(args.requests)))
+    wall = time.perf_counter() - started
+    await llm_gateway.aclose()
+
+    lat = np.array(latencies)
+    print(f"📊 {args.requests} plans | concurrency {args.concurrency} | in-flight cap {args.max_in_flight}")
+    print(f"   ok: {sum(ok)}  failed: {len(ok) - sum(ok)}  throughput: {args.requests / wall:.1f} plans/s")
+    print(f"   latency ms  p50={np.percentile(lat, 50):.1f}  p95={np.percentile(lat, 95):.1f}  p99={np.percentile(lat, 99):.1f}")
+    print(f"   gateway: {llm_gateway.stats}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LLM gateway load test")
+    parser.add_argument("--base-url", default="http://127.0.0.1:9100/v1")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--max-in-flight", type=int, default=8)
+    parser.add_argument("--use-cache", action="store_true", help="keep the LLM response cache enabled")
+    asyncio.run(main(parser.parse_args()))
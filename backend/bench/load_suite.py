@@ -0,0 +1,309 @@
+"""
+Reproducible API load test with no cloud services: the FastAPI app runs
+against an in-process Qdrant (local mode) with the LLM and transcription
+calls answered by bench.stub_llm, all inside this one process.
+
+    python -m bench.load_suite --requests 200 --concurrency 16 --out results.json
+    python -m bench.load_suite --baseline results.json   # exit 1 on regression
+
+Each scenario (image ingest, audio ingest, memory recall, the /analyze
+agent chain) runs on its own, then all of them at once ("mixed"). Per
+endpoint: p50/p95/p99 latency, throughput and errors, written as JSON.
+Embedding models are the real ones, so the first run downloads them.
+"""
+import io
+import os
+import sys
+import json
+import time
+import wave
+import socket
+import random
+import asyncio
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+
+import numpy as np
+
+PHRASES = [
+    "heavy smoke", "chemical smell", "structural cracks", "people trapped", "gas leak",
+    "flooding", "sparks from the roof", "thick black smoke", "collapsed stairwell", "burning tyres"
+]
+PLACES = ["warehouse", "textile factory", "metro station", "loading dock", "school", "apartment block", "refinery"]
+OUTCOMES = [
+    "Flashover occurred in 5 mins.", "Roof collapse after 20 mins.", "Toxic plume, 3 casualties.",
+    "Contained without injuries.", "Explosion in storage area.", "Critical failure of sprinklers."
+]
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def serve_in_thread(app, port):
+    """Runs a uvicorn server on a daemon thread; returns once it accepts connections."""
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, name=f"uvicorn-{port}", daemon=True).start()
+    deadline = time.time() + 60
+    while not server.started:
+        if time.time() > deadline:
+            raise SystemExit(f"❌ Server on port {port} did not start.")
+        time.sleep(0.05)
+    return server
+
+
+def configure(args, stub_url):
+    """Environment for the app; must be set before anything imports the agents."""
+    os.environ.update({
+        "QDRANT_LOCATION": ":memory:",
+        "GROQ_BASE_URL": stub_url, "GROQ_API_KEY": "stub",
+        "OPENAI_BASE_URL": stub_url, "OPENAI_API_KEY": "stub",
+        "TRANSCRIPTION_BACKEND": "openai",
+        "RETENTION_ENABLED": "0",
+        "LLM_CACHE_PATH": os.path.join(tempfile.mkdtemp(prefix="aura-bench-"), "llm.sqlite3"),
+    })
+    os.environ.pop("QDRANT_PATH", None)
+    if not args.llm_cache:
+        os.environ["LLM_CACHE_ENABLED"] = "0"  # Measure the chain, not the response cache
+    if not args.dedup:
+        os.environ["DEDUP_ENABLED"] = "0"      # Synthetic uploads repeat; measure the full write path
+
+
+def seed_history(count, rng):
+    """Synthetic historical incidents so recall and risk have something to find."""
+    from init_memory import setup_cloud_memory
+    from agents.memory import memory_agent
+
+    setup_cloud_memory(memory_agent.client)
+    records = []
+    for i in range(count):
+        description = f"{rng.choice(PHRASES).capitalize()} and {rng.choice(PHRASES)} at a {rng.choice(PLACES)}"
+        records.append({"text": description, "payload": {
+            "incident_name": f"Incident {i}", "year": str(2000 + i % 25),
+            "outcome": rng.choice(OUTCOMES), "action_taken": "Evacuated and cordoned off the area."
+        }})
+    for i in range(0, len(records), 256):
+        memory_agent.store_patterns(records[i:i + 256])
+
+
+def make_images(count, rng):
+    from PIL import Image
+
+    images = []
+    for _ in range(count):
+        pixels = np.random.default_rng(rng.randrange(1 << 30)).integers(0, 255, (240, 320, 3), dtype=np.uint8)
+        buf = io.BytesIO()
+        Image.fromarray(pixels).save(buf, format="JPEG", quality=85)
+        images.append(buf.getvalue())
+    return images
+
+
+def make_wav(seconds, sample_rate=16000):
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    pcm = (0.3 * np.sin(2 * np.pi * 440 * t) * 32767).astype(np.int16).tobytes()
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return buf.getvalue()
+
+
+def scenarios(images, wav, rng):
+    """name -> async fn(http, i) issuing one request (raises on a non-2xx answer)."""
+    async def ingest_image(http, i):
+        r = await http.post("/ingest", files={"file": (f"{i}.jpg", images[i % len(images)], "image/jpeg")},
+                            data={"type": "image", "location": f"Sector {i % 12}"})
+        r.raise_for_status()
+
+    async def ingest_audio(http, i):
+        r = await http.post("/ingest", files={"file": (f"{i}.wav", wav, "audio/wav")},
+                            data={"type": "audio", "location": f"Sector {i % 12}"})
+        r.raise_for_status()
+
+    async def memory(http, i):
+        # Mix of fresh and repeated operator queries (the caches see both)
+        query = f"{rng.choice(PHRASES)} near the {rng.choice(PLACES)}" if i % 4 else "heavy smoke near the warehouse"
+        r = await http.get("/agent/memory", params={"query": query})
+        r.raise_for_status()
+
+    async def analyze(http, i):
+        description = f"{rng.choice(PHRASES).capitalize()} reported at the {rng.choice(PLACES)} in Sector {i % 12}"
+        async with http.stream("POST", "/analyze", json={"description": description, "limit": 3}) as r:
+            r.raise_for_status()
+            async for _ in r.aiter_lines():  # Whole NDJSON stream = the full agent chain
+                pass
+
+    return {"ingest_image": ingest_image, "ingest_audio": ingest_audio, "memory": memory, "analyze": analyze}
+
+
+async def drive(http, fn, requests, concurrency, offset=0):
+    gate = asyncio.Semaphore(concurrency)
+    latencies, errors = [], []
+
+    async def one(i):
+        async with gate:
+            t0 = time.perf_counter()
+            try:
+                await fn(http, offset + i)
+                latencies.append((time.perf_counter() - t0) * 1000)
+            except Exception as e:
+                errors.append(type(e).__name__)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+def summarize(latencies, errors, wall):
+    lat = np.array(latencies or [float("nan")])
+    return {
+        "requests": len(latencies) + len(errors),
+        "errors": len(errors),
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else 0.0,
+        "latency_ms": {
+            "p50": round(float(np.percentile(lat, 50)), 2),
+            "p95": round(float(np.percentile(lat, 95)), 2),
+            "p99": round(float(np.percentile(lat, 99)), 2),
+            "mean": round(float(lat.mean()), 2)
+        },
+        "wall_seconds": round(wall, 3)
+    }
+
+
+async def run(args, base_url, work):
+    import httpx
+
+    limits = httpx.Limits(max_connections=args.concurrency * len(work), max_keepalive_connections=args.concurrency * len(work))
+    results = {"isolated": {}, "mixed": {}}
+    async with httpx.AsyncClient(base_url=base_url, timeout=120.0, limits=limits) as http:
+        # Warm-up: model loads, first Qdrant segments, connection pools
+        for fn in work.values():
+            await asyncio.gather(*(fn(http, i) for i in range(args.warmup)), return_exceptions=True)
+
+        for name, fn in work.items():
+            results["isolated"][name] = await drive(http, fn, args.requests, args.concurrency)
+            print_row("isolated", name, results["isolated"][name])
+
+        if not args.no_mixed:
+            # Everything at once, as during a live incident
+            mixed = await asyncio.gather(*(
+                drive(http, fn, args.requests, max(1, args.concurrency // 2), offset=args.requests)
+                for fn in work.values()
+            ))
+            for name, summary in zip(work, mixed):
+                results["mixed"][name] = summary
+                print_row("mixed", name, summary)
+    return results
+
+
+def print_row(phase, name, s):
+    lat = s["latency_ms"]
+    print(f"   {phase:<9}{name:<14} p50={lat['p50']:>8.1f}  p95={lat['p95']:>8.1f}  p99={lat['p99']:>8.1f} ms"
+          f"  {s['throughput_rps']:>7.1f} req/s  errors={s['errors']}")
+
+
+def compare(results, baseline, tolerance):
+    """Regressions vs a previous run: p95 up or throughput down by more than `tolerance`."""
+    regressions = []
+    for phase, endpoints in results.items():
+        for name, now in endpoints.items():
+            before = baseline.get("results", {}).get(phase, {}).get(name)
+            if not before:
+                continue
+            p95_then, p95_now = before["latency_ms"]["p95"], now["latency_ms"]["p95"]
+            if p95_then and p95_now > p95_then * (1 + tolerance):
+                regressions.append(f"{phase}/{name}: p95 {p95_then:.1f} -> {p95_now:.1f} ms")
+            if before["throughput_rps"] and now["throughput_rps"] < before["throughput_rps"] * (1 - tolerance):
+                regressions.append(f"{phase}/{name}: throughput {before['throughput_rps']} -> {now['throughput_rps']} req/s")
+            if now["errors"] > before["errors"]:
+                regressions.append(f"{phase}/{name}: errors {before['errors']} -> {now['errors']}")
+    return regressions
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return None
+
+
+def main(args):
+    rng = random.Random(args.seed)
+
+    # 1. Stub LLM + transcription server
+    from bench import stub_llm
+
+    stub_llm.CONFIG.update(latency_ms=args.llm_latency_ms, jitter_ms=args.jitter_ms, transcribe_ms=args.transcribe_latency_ms)
+    stub_port = free_port()
+    serve_in_thread(stub_llm.app, stub_port)
+    configure(args, f"http://127.0.0.1:{stub_port}/v1")
+
+    # 2. The app itself, on in-memory Qdrant with seeded history
+    import main as api
+
+    seed_history(args.history, rng)
+    api_port = free_port()
+    serve_in_thread(api.app, api_port)
+    print(f"🚀 API on :{api_port}, stub LLM/Whisper on :{stub_port}, {args.history} historical incidents seeded.")
+
+    work = scenarios(make_images(32, rng), make_wav(args.audio_seconds), rng)
+    if args.scenarios:
+        work = {name: fn for name, fn in work.items() if name in args.scenarios.split(",")}
+    print(f"📊 {args.requests} requests per scenario, concurrency {args.concurrency}")
+    results = asyncio.run(run(args, f"http://127.0.0.1:{api_port}", work))
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "config": vars(args)
+        },
+        "results": results
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Results written to {args.out}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s) vs {args.baseline} (tolerance {args.tolerance:.0%}):")
+            for line in regressions:
+                print(f"   {line}")
+            sys.exit(1)
+        print(f"✅ No regressions vs {args.baseline} (tolerance {args.tolerance:.0%}).")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline API load test (in-process Qdrant + stub LLM/Whisper)")
+    parser.add_argument("--requests", type=int, default=100, help="Requests per scenario and phase")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=4, help="Unmeasured requests per scenario first")
+    parser.add_argument("--scenarios", default=None, help="Comma list (default: ingest_image,ingest_audio,memory,analyze)")
+    parser.add_argument("--no-mixed", action="store_true", help="Skip the all-scenarios-at-once phase")
+    parser.add_argument("--history", type=int, default=2000, help="Synthetic incidents seeded into historical_patterns")
+    parser.add_argument("--audio-seconds", type=float, default=5.0)
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0)
+    parser.add_argument("--transcribe-latency-ms", type=float, default=800.0)
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--llm-cache", action="store_true", help="Keep the LLM response cache enabled")
+    parser.add_argument("--dedup", action="store_true", help="Keep ingest dedup enabled")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", default=None, help="Write results JSON here")
+    parser.add_argument("--baseline", default=None, help="Previous results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed p95 / throughput drift vs baseline")
+    main(parser.parse_args())
@@ -0,0 +1,82 @@
+"""
+Images/sec: in-process CLIP encoding vs the perception process pool.
+
+    python -m bench.perception_pool --images 200 --concurrency 16 --workers 1,2,4
+
+Runs PerceptionAgent.process_image end to end (decode + CLIP), first on
+the in-process embedding engine, then with the pool at each worker count.
+Worker model loading is excluded from the timings.
+"""
+import io
+import time
+import asyncio
+import argparse
+
+import numpy as np
+from PIL import Image
+
+from agents.perception import perception_agent
+from agents.perception_pool import perception_pool
+
+
+def synthetic_frames(n, size=640, seed=7):
+    """Random 'drone frames' as JPEG buffers (decode cost ~ a real camera frame)."""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for _ in range(n):
+        pixels = rng.integers(0, 255, size=(size, size, 3), dtype=np.uint8)
+        buf = io.BytesIO()
+        Image.fromarray(pixels).save(buf, format="JPEG", quality=85)
+        frames.append(buf.getvalue())
+    return frames
+
+
+async def run(frames, concurrency):
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(data):
+        async with gate:
+            return await perception_agent.process_image(io.BytesIO(data))
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(one(data) for data in frames))
+    elapsed = time.perf_counter() - started
+    failed = sum(1 for r in results if r is None)
+    return len(frames) / elapsed, failed
+
+
+async def main(args):
+    frames = synthetic_frames(args.images, size=args.size)
+    print(f"🖼️ {len(frames)} frames ({args.size}x{args.size} JPEG), concurrency {args.concurrency}")
+
+    # Warm the in-process model, then measure
+    await run(frames[:2], 1)
+    rate, failed = await run(frames, args.concurrency)
+    print(f"   in-process          {rate:8.2f} img/s  (failed: {failed})")
+    baseline = rate
+
+    for workers in [int(w) for w in args.workers.split(",")]:
+        perception_pool.workers_wanted = workers
+        perception_pool.start()
+        try:
+            # One image per worker so every process has CLIP loaded
+            await asyncio.gather(*(perception_pool.aencode(frames[0]) for _ in range(workers)))
+            rate, failed = await run(frames, args.concurrency)
+            report = perception_pool.report()
+            print(
+                f"   pool x{workers:<3}           {rate:8.2f} img/s  ({rate / baseline:4.2f}x, "
+                f"failed: {failed}, fallbacks: {report['fallbacks']}, restarts: {report['restarts']})"
+            )
+        finally:
+            perception_pool.close()
+            perception_pool.stats.update(encoded=0, rejected=0, fallbacks=0, crashes=0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Perception pool throughput")
+    parser.add_argument("--images", type=int, default=200)
+    parser.add_argument("--size", type=int, default=640)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated pool sizes to try")
+    args = parser.parse_args()
+    asyncio.run(main(args))
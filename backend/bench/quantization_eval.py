@@ -0,0 +1,152 @@
+"""
+Recall vs latency for the compact storage modes (none / int8 / binary).
+
+Copies the seeded history vectors into one scratch collection per mode,
+grows them to a realistic size with jittered neighbours of the seeded
+points, and measures recall@k (against an exact float32 search) plus
+query latency for each oversampling setting:
+
+    python -m bench.quantization_eval --url http://localhost:6333 --points 50000
+    python -m bench.quantization_eval --url ... --source live_intel --vector image_vec
+
+Pick the cheapest mode whose recall is acceptable and set it with
+QDRANT_QUANTIZATION_<COLLECTION> (see init_memory.py). Without --url it runs
+on the in-process stand-in, which ignores quantization: useful only to
+check the harness itself.
+"""
+import time
+import uuid
+import argparse
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.models import PointStruct, VectorParams, Distance, SearchParams
+
+from init_memory import VECTOR_SIZES
+from agents.quantization import QUANTIZATION_MODES, quantization_config, search_params
+
+SCRATCH_PREFIX = "quant_eval"
+BYTES_PER_DIM = {"none": 4.0, "int8": 1.0, "binary": 1 / 8}
+
+
+def seed_vectors(client, source, vector_name, dim, fallback=64, seed=3):
+    """Seeded history vectors from `source`, or random centres if it's missing/empty."""
+    vectors = []
+    if client.collection_exists(source):
+        offset = None
+        while True:
+            points, offset = client.scroll(
+                collection_name=source, limit=256, offset=offset, with_payload=False, with_vectors=[vector_name]
+            )
+            vectors += [p.vector[vector_name] for p in points if (p.vector or {}).get(vector_name)]
+            if offset is None:
+                break
+    if not vectors:
+        print(f"⚠️ No '{vector_name}' vectors in '{source}'. Using {fallback} random centres.")
+        vectors = np.random.default_rng(seed).standard_normal((fallback, dim))
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def grow(centres, n, noise=0.35, seed=4):
+    """n vectors scattered around the seeded ones (same neighbourhood structure)."""
+    rng = np.random.default_rng(seed)
+    centres = centres / np.linalg.norm(centres, axis=1, keepdims=True)
+    picks = centres[rng.integers(len(centres), size=n)]
+    jitter = rng.standard_normal(picks.shape).astype(np.float32) * noise / np.sqrt(centres.shape[1])
+    return picks + jitter
+
+
+def build(client, mode, vector_name, corpus, ids, batch=1000):
+    name = f"{SCRATCH_PREFIX}_{mode}"
+    if client.collection_exists(name):
+        client.delete_collection(name)
+    client.create_collection(
+        collection_name=name,
+        vectors_config={vector_name: VectorParams(size=corpus.shape[1], distance=Distance.COSINE, on_disk=mode != "none")},
+        quantization_config=quantization_config(mode)
+    )
+    for start in range(0, len(corpus), batch):
+        # Same ids in every scratch collection, so results compare point for point
+        client.upsert(
+            collection_name=name,
+            points=[
+                PointStruct(id=point_id, vector={vector_name: v.tolist()})
+                for point_id, v in zip(ids[start:start + batch], corpus[start:start + batch])
+            ],
+            wait=True
+        )
+    return name
+
+
+def wait_indexed(client, name, timeout=300):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if str(client.get_collection(name).status).lower().endswith("green"):
+            return
+        time.sleep(1)
+    print(f"⚠️ {name} still optimizing after {timeout}s; numbers may be pessimistic.")
+
+
+def run(client, name, vector_name, queries, limit, params):
+    ids, latencies = [], []
+    for q in queries:
+        t0 = time.perf_counter()
+        result = client.query_points(
+            collection_name=name, query=q.tolist(), using=vector_name, limit=limit, search_params=params
+        )
+        latencies.append((time.perf_counter() - t0) * 1000)
+        ids.append([hit.id for hit in result.points])
+    return ids, np.array(latencies)
+
+
+def recall_at_k(truth, found):
+    return float(np.mean([len(set(t) & set(f)) / max(len(t), 1) for t, f in zip(truth, found)]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Quantization recall/latency evaluation")
+    parser.add_argument("--url", default=None, help="Qdrant URL (default: in-process stand-in)")
+    parser.add_argument("--api-key", default=None)
+    parser.add_argument("--source", default="historical_patterns", help="Collection holding the seeded vectors")
+    parser.add_argument("--vector", default="text_vec", choices=list(VECTOR_SIZES))
+    parser.add_argument("--points", type=int, default=20000, help="Corpus size per scratch collection")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--oversampling", default="1.0,1.5,2.0,3.0", help="Comma-separated values to try")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch collections afterwards")
+    args = parser.parse_args()
+
+    client = QdrantClient(url=args.url, api_key=args.api_key) if args.url else QdrantClient(location=":memory:")
+    dim = VECTOR_SIZES[args.vector]
+    oversampling = [float(x) for x in args.oversampling.split(",")]
+
+    centres = seed_vectors(client, args.source, args.vector, dim)
+    corpus = grow(centres, args.points)
+    queries = grow(centres, args.queries, seed=5)
+    print(f"🌱 {len(centres)} seeded vectors -> {len(corpus):,} point corpus ({args.vector}, {dim}d)")
+
+    ids = [str(uuid.uuid4()) for _ in range(len(corpus))]
+    collections = {}
+    for mode in QUANTIZATION_MODES:
+        collections[mode] = build(client, mode, args.vector, corpus, ids)
+        wait_indexed(client, collections[mode])
+
+    truth, _ = run(client, collections["none"], args.vector, queries, args.limit, SearchParams(exact=True))
+
+    print(f"📊 recall@{args.limit} over {args.queries} queries ({'Qdrant ' + args.url if args.url else 'in-process stand-in'})")
+    print(f"   {'mode':<7} {'oversample':>10} {'rescore':>8} {'recall':>7} {'p50':>9} {'p95':>9} {'vec RAM':>9}")
+    for mode in QUANTIZATION_MODES:
+        ram_mb = len(corpus) * dim * BYTES_PER_DIM[mode] / 1e6
+        settings = [(None, None)] if mode == "none" else [(1.0, False)] + [(o, True) for o in oversampling]
+        for factor, rescore in settings:
+            params = search_params(collections[mode], mode=mode, oversampling=factor, rescore=rescore)
+            found, lat = run(client, collections[mode], args.vector, queries, args.limit, params)
+            print(
+                f"   {mode:<7} {factor or '-':>10} {str(rescore) if rescore is not None else '-':>8} "
+                f"{recall_at_k(truth, found):7.3f} {np.percentile(lat, 50):7.2f}ms {np.percentile(lat, 95):7.2f}ms "
+                f"{ram_mb:7.1f}MB"
+            )
+
+    if not args.keep:
+        for name in collections.values():
+            client.delete_collection(name)
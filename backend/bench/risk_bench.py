@@ -0,0 +1,69 @@
+"""
+Micro-benchmark for the RiskAgent scoring engine.
+
+    python -m bench.risk_bench --sets 20000 --min-throughput 50000
+
+Exits non-zero when batch throughput (incident sets/s) falls below
+--min-throughput, so it can guard releases.
+"""
+import sys
+import time
+import random
+import argparse
+
+from agents.risk import risk_agent
+
+OUTCOMES = [
+    "Flashover occurred in 5 mins. Roof collapsed.",
+    "Roads blocked by debris. Power grid failed.",
+    "Toxic cloud drifted South. Respiratory distress reported.",
+    "Fire contained within 20 minutes. No injuries.",
+    "Two casualties; structural failure of the east stairwell.",
+    "Minor smoke damage, building reopened next day.",
+]
+
+
+def synthetic_sets(n, per_set=3, seed=11):
+    rng = random.Random(seed)
+    return [
+        [
+            {"incident": f"Incident {rng.randint(1, 500)}", "outcome": rng.choice(OUTCOMES), "score": round(rng.random(), 2)}
+            for _ in range(per_set)
+        ]
+        for _ in range(n)
+    ]
+
+
+def best_of(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    return min(timings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Risk scoring throughput")
+    parser.add_argument("--sets", type=int, default=20000)
+    parser.add_argument("--per-set", type=int, default=3)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--min-throughput", type=float, default=50000.0, help="fail below this many sets/s (batch path, 0 = report only)")
+    args = parser.parse_args()
+
+    sets = synthetic_sets(args.sets, args.per_set)
+
+    per_call = best_of(lambda: [risk_agent.assess_risk(s) for s in sets], args.repeats)
+    batched = best_of(lambda: risk_agent.assess_batch(sets), args.repeats)
+
+    # Both paths must agree
+    assert [risk_agent.assess_risk(s) for s in sets[:200]] == risk_agent.assess_batch(sets[:200])
+
+    batch_rate = args.sets / batched
+    print(f"📊 {args.sets} sets x {args.per_set} incidents (best of {args.repeats})")
+    print(f"   assess_risk loop : {args.sets / per_call:,.0f} sets/s")
+    print(f"   assess_batch     : {batch_rate:,.0f} sets/s  ({per_call / batched:.1f}x)")
+
+    if args.min_throughput and batch_rate < args.min_throughput:
+        print(f"❌ Below floor of {args.min_throughput:,.0f} sets/s")
+        sys.exit(1)
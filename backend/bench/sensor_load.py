@@ -0,0 +1,95 @@
+"""
+Local load generator for the /ws/sensors gateway.
+
+Simulates thousands of sensors spread over a few connections (like field
+gateways multiplexing many devices) and reports send rate, alerts and the
+server-side gateway counters.
+
+    python -m bench.sensor_load --sensors 5000 --connections 20 --hz 2 --seconds 30
+"""
+import json
+import time
+import random
+import asyncio
+import argparse
+
+import requests
+import websockets
+
+
+async def run_connection(url, sensors, hz, seconds, batch, counters):
+    async with websockets.connect(url, max_queue=None) as ws:
+        async def listen():
+            async for message in ws:
+                event = json.loads(message)
+                counters[event.get("type", "other")] = counters.get(event.get("type", "other"), 0) + 1
+
+        listener = asyncio.create_task(listen())
+        interval = 1.0 / hz
+        deadline = time.perf_counter() + seconds
+
+        while time.perf_counter() < deadline:
+            tick = time.perf_counter()
+            now = time.time()
+            frames = [
+                {
+                    "location": s["location"],
+                    "sensor": s["sensor"],
+                    # Mostly steady readings, occasional spikes to trigger analysis
+                    "value": s["base"] * (3.0 if random.random() < 0.001 else random.uniform(0.95, 1.05)),
+                    "ts": now
+                }
+                for s in sensors
+            ]
+            for i in range(0, len(frames), batch):
+                await ws.send(json.dumps(frames[i:i + batch]))
+            counters["frames_sent"] += len(frames)
+            await asyncio.sleep(max(0.0, interval - (time.perf_counter() - tick)))
+
+        await asyncio.sleep(1.0)  # Let in-flight alerts arrive
+        listener.cancel()
+
+
+async def main(args):
+    rng = random.Random(3)
+    sensors = [
+        {
+            "location": f"Sector {rng.randint(1, args.locations)}",
+            "sensor": rng.choice(["thermal", "smoke", "vibration", "co2"]),
+            "base": rng.uniform(10, 100)
+        }
+        for _ in range(args.sensors)
+    ]
+    per_conn = [sensors[i::args.connections] for i in range(args.connections)]
+    counters = {"frames_sent": 0}
+
+    url = f"{args.ws_url}?policy={args.policy}"
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        run_connection(url, group, args.hz, args.seconds, args.batch, counters) for group in per_conn
+    ))
+    elapsed = time.perf_counter() - started
+
+    print(f"📡 {args.sensors} sensors / {args.locations} locations / {args.connections} connections @ {args.hz} Hz")
+    print(f"   sent: {counters['frames_sent']:,} frames in {elapsed:.1f}s ({counters['frames_sent'] / elapsed:,.0f} frames/s)")
+    print(f"   received: {', '.join(f'{k}={v}' for k, v in counters.items() if k != 'frames_sent') or 'nothing'}")
+
+    try:
+        stats = requests.get(args.stats_url, timeout=5).json().get("sensors", {})
+        print(f"   gateway: {stats}")
+    except Exception as e:
+        print(f"   gateway stats unavailable: {e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sensor WebSocket load generator")
+    parser.add_argument("--ws-url", default="ws://127.0.0.1:8000/ws/sensors")
+    parser.add_argument("--stats-url", default="http://127.0.0.1:8000/stats")
+    parser.add_argument("--sensors", type=int, default=5000)
+    parser.add_argument("--locations", type=int, default=50)
+    parser.add_argument("--connections", type=int, default=20)
+    parser.add_argument("--hz", type=float, default=2.0, help="frames per sensor per second")
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--batch", type=int, default=250, help="frames per WebSocket message")
+    parser.add_argument("--policy", default="drop_oldest", choices=["drop_oldest", "drop_newest", "block"])
+    asyncio.run(main(parser.parse_args()))
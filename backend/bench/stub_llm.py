@@ -0,0 +1,96 @@
+"""
+Local stand-in for Groq's OpenAI-compatible chat API (and OpenAI's
+Whisper transcription endpoint).
+
+Run:   python -m bench.stub_llm --port 9100 --latency-ms 400 --failure-rate 0.1
+Then:  GROQ_BASE_URL=http://127.0.0.1:9100/v1 GROQ_API_KEY=stub \
+       OPENAI_BASE_URL=http://127.0.0.1:9100/v1 OPENAI_API_KEY=stub TRANSCRIPTION_BACKEND=openai python main.py
+"""
+import json
+import time
+import random
+import asyncio
+import argparse
+
+from fastapi import FastAPI, Request, UploadFile, File, Form
+from fastapi.responses import JSONResponse
+
+app = FastAPI(title="Aura Stub LLM")
+
+# Tunables (overridden from the command line)
+CONFIG = {"latency_ms": 300.0, "jitter_ms": 50.0, "failure_rate": 0.0, "retry_after": "0.2", "transcribe_ms": 800.0}
+STUB_TRANSCRIPT = "Caller reports heavy smoke and a chemical smell near the loading dock in Sector 4."
+
+
+def _reply_for(prompt):
+    # Shape the JSON like the real agents expect
+    if "Transparency Officer" in prompt:
+        return {
+            "narrative": "Recommended evacuation because a similar past event escalated quickly.",
+            "confidence_reasoning": "Stub response."
+        }
+    return {
+        "immediate_actions": ["Evacuate Sector 4", "Deploy hazmat team"],
+        "priority": "HIGH",
+        "summary": "Stub plan."
+    }
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    delay = max(0.0, random.gauss(CONFIG["latency_ms"], CONFIG["jitter_ms"])) / 1000.0
+    await asyncio.sleep(delay)
+
+    # Simulated rate limiting / upstream errors
+    if random.random() < CONFIG["failure_rate"]:
+        status = random.choice([429, 503])
+        return JSONResponse(
+            {"error": {"message": "stub failure"}},
+            status_code=status,
+            headers={"retry-after": CONFIG["retry_after"]} if status == 429 else {}
+        )
+
+    prompt = " ".join(m.get("content", "") for m in body.get("messages", []))
+    content = json.dumps(_reply_for(prompt))
+    prompt_tokens = len(prompt) // 4
+    completion_tokens = len(content) // 4
+    return {
+        "id": f"stub-{int(time.time() * 1000)}",
+        "object": "chat.completion",
+        "model": body.get("model"),
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+    }
+
+
+@app.post("/v1/audio/transcriptions")
+async def transcriptions(file: UploadFile = File(...), model: str = Form("whisper-1")):
+    audio = await file.read()
+    # Whisper-style latency: fixed overhead plus a little per second of audio (16-bit mono 16 kHz)
+    seconds = len(audio) / 32000
+    delay = max(0.0, random.gauss(CONFIG["transcribe_ms"], CONFIG["jitter_ms"])) / 1000.0 + seconds * 0.02
+    await asyncio.sleep(delay)
+    return {"text": STUB_TRANSCRIPT}
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Stub Groq server")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=CONFIG["latency_ms"])
+    parser.add_argument("--jitter-ms", type=float, default=CONFIG["jitter_ms"])
+    parser.add_argument("--failure-rate", type=float, default=CONFIG["failure_rate"])
+    parser.add_argument("--transcribe-latency-ms", type=float, default=CONFIG["transcribe_ms"])
+    args = parser.parse_args()
+
+    CONFIG.update(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, failure_rate=args.failure_rate,
+        transcribe_ms=args.transcribe_latency_ms
+    )
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
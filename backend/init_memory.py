@@ -1,7 +1,9 @@
 import os
 from dotenv import load_dotenv
 from qdrant_client import QdrantClient
-from qdrant_client.models import VectorParams, Distance
+from qdrant_client.models import VectorParams, VectorParamsDiff, Distance, PayloadSchemaType, Disabled
+
+from agents.quantization import quantization_mode, quantization_config
 
 # 1. Load your cloud secrets
 load_dotenv()
@@ -9,33 +11,106 @@ load_dotenv()
 QDRANT_URL = os.getenv("QDRANT_URL")
 QDRANT_API_KEY = os.getenv("QDRANT_API_KEY")
 
-if not QDRANT_URL:
-    print("❌ Error: .env file is missing or empty! Check Step 3.")
-    exit()
+# We define the 3 core memory banks
+COLLECTIONS = ["live_intel", "historical_patterns", "action_outcomes"]
+
+# Named vectors: a point only stores the ones it actually has
+VECTOR_SIZES = {
+    "text_vec": 384,   # For Reports/Audio Text (MiniLM)
+    "image_vec": 512   # For Drone Images (CLIP)
+}
+
+# Payload indexes backing filtered recall ("same location, last 30 min, image only")
+PAYLOAD_INDEXES = {
+    "live_intel": {
+        "location": PayloadSchemaType.KEYWORD,
+        "type": PayloadSchemaType.KEYWORD,
+        "timestamp": PayloadSchemaType.FLOAT
+    },
+    "historical_patterns": {
+        "year": PayloadSchemaType.KEYWORD
+    },
+    "action_outcomes": {
+        "location": PayloadSchemaType.KEYWORD,
+        "type": PayloadSchemaType.KEYWORD,
+        "timestamp": PayloadSchemaType.FLOAT
+    }
+}
 
-print("🔌 Connecting to Qdrant Cloud...")
-client = QdrantClient(url=QDRANT_URL, api_key=QDRANT_API_KEY)
+def connect():
+    if not QDRANT_URL:
+        print("❌ Error: .env file is missing or empty! Check Step 3.")
+        exit()
 
-def setup_cloud_memory():
-    # We define the 3 core memory banks
-    collections = ["live_intel", "historical_patterns", "action_outcomes"]
-    
-    for name in collections:
+    print("🔌 Connecting to Qdrant Cloud...")
+    return QdrantClient(url=QDRANT_URL, api_key=QDRANT_API_KEY)
+
+def setup_cloud_memory(client):
+    for name in COLLECTIONS:
         # Check if exists, if not create
         if not client.collection_exists(name):
-            print(f"Creating memory bank: {name}...")
+            mode = quantization_mode(name)
+            print(f"Creating memory bank: {name} (vectors: {mode})...")
             client.create_collection(
                 collection_name=name,
                 vectors_config={
-                    # We use "Named Vectors" to store BOTH Text and Image vectors in one point
-                    "text_vec": VectorParams(size=384, distance=Distance.COSINE),  # For Reports/Audio Text
-                    "image_vec": VectorParams(size=512, distance=Distance.COSINE)  # For Drone Images (CLIP)
-                }
+                    # "Named Vectors": Text and Image spaces side by side, each optional per point.
+                    # Quantized collections keep the float32 originals on disk for rescoring.
+                    vector_name: VectorParams(size=size, distance=Distance.COSINE, on_disk=mode != "none")
+                    for vector_name, size in VECTOR_SIZES.items()
+                },
+                quantization_config=quantization_config(mode)
             )
             print(f"✅ {name} created successfully.")
         else:
             print(f"⚠️ {name} already exists. Skipping.")
 
+    # New and existing collections both get their payload indexes and storage mode
+    migrate_payload_indexes(client)
+    migrate_quantization(client)
+
+def migrate_payload_indexes(client):
+    """
+    Migration step: creates any payload index from PAYLOAD_INDEXES that an
+    existing collection is missing. Safe to re-run.
+    """
+    for name, fields in PAYLOAD_INDEXES.items():
+        if not client.collection_exists(name):
+            continue
+
+        existing = client.get_collection(name).payload_schema or {}
+        for field, schema in fields.items():
+            if field in existing:
+                continue
+            print(f"🗂️ Indexing {name}.{field} ({schema.value})...")
+            client.create_payload_index(collection_name=name, field_name=field, field_schema=schema, wait=True)
+
+def migrate_quantization(client):
+    """
+    Migration step: brings existing collections in line with their
+    QDRANT_QUANTIZATION(_<COLLECTION>) setting. Qdrant rebuilds the
+    quantized segments in the background. Safe to re-run.
+    """
+    for name in COLLECTIONS:
+        if not client.collection_exists(name):
+            continue
+
+        mode = quantization_mode(name)
+        wanted = quantization_config(mode)
+        current = client.get_collection(name).config.quantization_config
+        if type(current) is type(wanted):
+            continue
+
+        print(f"🗜️ Switching {name} vectors to '{mode}'...")
+        client.update_collection(
+            collection_name=name,
+            vectors_config={
+                vector_name: VectorParamsDiff(on_disk=mode != "none") for vector_name in VECTOR_SIZES
+            },
+            quantization_config=wanted or Disabled.DISABLED
+        )
+
 if __name__ == "__main__":
-    setup_cloud_memory()
-    print("\n🎉 Aura Infrastructure Ready: All Agents have memory access.")
\ No newline at end of file
+    client = connect()
+    setup_cloud_memory(client)
+    print("\n🎉 Aura Infrastructure Ready: All Agents have memory access.")
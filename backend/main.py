@@ -1,22 +1,39 @@
-import os
-import shutil
-import uuid
+import json
+import asyncio
 import time
-from typing import List, Any
+import zipfile
+from typing import List, Any, Optional
 from dotenv import load_dotenv
 
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, WebSocket, WebSocketDisconnect, Request, Query
 from pydantic import BaseModel
-from qdrant_client import QdrantClient
-from qdrant_client.models import PointStruct
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse, PlainTextResponse
 
 # --- AGENT IMPORTS ---
 from agents.perception import perception_agent  # Agent 1
-from agents.memory import memory_agent          # Agent 2
+from agents.memory import memory_agent, HISTORY_COLLECTION  # Agent 2
 from agents.risk import risk_agent              # Agent 3
 from agents.decision import decision_agent
 from agents.explain import explain_agent
+from agents.embedding import embedding_engine
+from agents.models import model_registry, warmup_targets
+from agents.pipeline import run_pipeline, as_ndjson, as_sse, PIPELINE_MODES, DEFAULT_MODE
+from agents.llm import llm_gateway
+from agents.llm_cache import response_cache
+from agents.uploads import (
+    read_upload, expand_archive, guess_modality, is_archive, upload_limits, UploadTooLarge, MAX_IMAGE_BYTES
+)
+from agents.intel_store import IntelStore, LIVE_COLLECTION
+from agents.dedup import IntelDeduplicator
+from agents.retention import RetentionJob
+from agents.sensor_gateway import sensor_gateway, DROP_POLICIES
+from agents.risk_state import risk_state
+from agents.perception_pool import perception_pool
+from agents.audio_stream import audio_streamer, PCMChunker, join_transcripts
+from agents.tracing import tracer, profiler, capture_profile
+from agents.vector_db import get_qdrant_client
+from agents.context import context_builder
 
 app = FastAPI(title="Aura-MAS Command Center")
 
@@ -34,18 +51,114 @@ load_dotenv()
 
 app = FastAPI(title="Aura-MAS Command Center")
 
-# Connect to Qdrant Cloud (Global Connection)
-client = QdrantClient(
-    url=os.getenv("QDRANT_URL"),
-    api_key=os.getenv("QDRANT_API_KEY")
-)
+# Connect to Qdrant (Global Connection, shared with the Memory Agent)
+client = get_qdrant_client()
 
 # Constants
-COLLECTION_NAME = "live_intel"
+COLLECTION_NAME = LIVE_COLLECTION
+PROFILE_MAX_SECONDS = 120.0  # Longest on-demand /debug/profile capture
+
+# Write path for live intel (single + batched upserts)
+intel_store = IntelStore(client, COLLECTION_NAME)
+
+# Near-duplicate frames/transcripts merge into the point they repeat
+intel_dedup = IntelDeduplicator(client, COLLECTION_NAME)
+
+# Hot / aged / expired tiers for live_intel (aged intel is summarized into action_outcomes)
+retention_job = RetentionJob(client, COLLECTION_NAME)
+
+# --- TRACING: one root span per HTTP request (agent spans nest under it) ---
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    span = tracer.span("http.request", method=request.method).__enter__()
+    try:
+        response = await call_next(request)
+    except BaseException as e:
+        span.__exit__(type(e), e, e.__traceback__)
+        raise
+    # Route template, not the raw path, so labels stay low-cardinality
+    route = request.scope.get("route")
+    span.set("route", getattr(route, "path", "unmatched"))
+    span.set("status_code", str(response.status_code))
+    # The body (NDJSON / SSE streams included) is produced after we return:
+    # the span ends once the last chunk has been sent
+    response.body_iterator = _end_span_after(response.body_iterator, span)
+    return response
+
+async def _end_span_after(body, span):
+    exc_info = (None, None, None)
+    try:
+        async for chunk in body:
+            yield chunk
+    except BaseException as e:
+        exc_info = (type(e), e, e.__traceback__)
+        raise
+    finally:
+        span.__exit__(*exc_info)
+
+# --- OPTIONAL MODEL WARM-UP (AURA_WARMUP_MODELS=all | name,name) ---
+@app.on_event("startup")
+async def warm_up_models():
+    targets = warmup_targets()
+    if not targets:
+        print("💤 Models will load lazily on first use.")
+        return
+
+    report = await asyncio.to_thread(model_registry.warm_up, targets)
+    for name, info in report.items():
+        if info["loaded"]:
+            print(f"⏱️ Startup: {name} loaded in {info['load_seconds']}s")
+
+# --- LOCAL VECTOR INDEX (MEMORY_INDEX=local) ---
+@app.on_event("startup")
+async def load_local_index():
+    if memory_agent.index_mode != "local":
+        return
+    try:
+        await asyncio.to_thread(memory_agent.local_index)
+    except Exception as e:
+        print(f"⚠️ Local index not ready yet (will retry on first recall): {e}")
+
+# --- PERCEPTION PROCESS POOL (PERCEPTION_POOL_WORKERS > 0) ---
+@app.on_event("startup")
+async def start_perception_pool():
+    if not perception_pool.enabled:
+        return
+    await asyncio.to_thread(perception_pool.start)
+    asyncio.create_task(perception_pool.monitor())
+
+# --- RETENTION / COMPACTION (RETENTION_ENABLED) ---
+@app.on_event("startup")
+async def start_retention():
+    if retention_job.enabled:
+        asyncio.create_task(retention_job.run_forever())
+
+# --- SAMPLING PROFILER (PROFILER_MODE=continuous) ---
+@app.on_event("startup")
+async def start_profiler():
+    if profiler.mode == "continuous":
+        profiler.start()
+
+@app.on_event("shutdown")
+async def stop_profiler():
+    profiler.stop()
+
+@app.on_event("shutdown")
+async def close_llm_gateway():
+    await llm_gateway.aclose()
+
+@app.on_event("shutdown")
+async def stop_perception_pool():
+    await asyncio.to_thread(perception_pool.close)
 
 # --- DATA MODELS ---
 class RiskInput(BaseModel):
     similar_incidents: List[Any]  # Expects the list returned by Agent 2
+    location: Optional[str] = None     # If set, folds the result into that location's risk state
+    timestamp: Optional[float] = None
+
+class RiskBatchInput(BaseModel):
+    incident_sets: List[List[Any]]  # One incident list per candidate (e.g. per location)
 
 class DecisionInput(BaseModel):
     current_description: str
@@ -57,11 +170,82 @@ class ExplainInput(BaseModel):
     risk_data: dict
     past_incidents: List[Any]
 
+class AnalyzeInput(BaseModel):
+    description: str
+    limit: int = 3
+
 # --- SYSTEM HEALTH CHECK ---
 @app.get("/")
 def health_check():
     return {"status": "Aura System Online", "agents_active": 3}
 
+# --- SYSTEM STATS (Throughput vs Tail Latency Tuning) ---
+@app.get("/stats")
+def system_stats():
+    return {
+        "embedding": embedding_engine.stats(),
+        "models": model_registry.report(),
+        "memory_cache": memory_agent.cache_stats(),
+        "llm": dict(llm_gateway.stats, max_concurrency=llm_gateway.max_concurrency),
+        "llm_cache": response_cache.stats(),
+        "sensors": sensor_gateway.report(),
+        "perception_pool": perception_pool.report(),
+        "audio_streams": audio_streamer.report(),
+        "dedup": intel_dedup.report(),
+        "retention": retention_job.report(),
+        "tracing": tracer.report(),
+        "context": context_builder.report()
+    }
+
+# --- METRICS / TRACES / PROFILES ---
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Span latency histograms in Prometheus text format (scrape target)."""
+    return PlainTextResponse(tracer.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+@app.get("/traces")
+def recent_traces(limit: int = 50, name: Optional[str] = None, min_ms: float = 0.0):
+    """Most recent finished spans, e.g. ?name=llm.chat&min_ms=500 for the slow completions."""
+    return {"status": "success", "data": tracer.traces(limit=limit, name=name, min_ms=min_ms)}
+
+@app.get("/debug/profile", response_class=PlainTextResponse)
+async def sampled_profile(
+    seconds: Optional[float] = Query(None, ge=0.1, le=PROFILE_MAX_SECONDS),
+    top: Optional[int] = Query(None, ge=1)
+):
+    """
+    Collapsed stacks (flamegraph.pl / speedscope input).
+    ?seconds=N samples for N seconds now (PROFILER_MODE=on_demand or continuous);
+    without it, the continuous profiler's totals since startup.
+    """
+    if profiler.mode == "off":
+        raise HTTPException(status_code=404, detail="Profiler disabled (set PROFILER_MODE=on_demand or continuous)")
+    if seconds:
+        return await asyncio.to_thread(capture_profile, seconds, None, top)
+    if not profiler.running:
+        raise HTTPException(status_code=400, detail="No continuous profile running; pass ?seconds=N")
+    return profiler.collapsed(top)
+
+@app.post("/retention/run")
+async def run_retention():
+    """Runs one retention / compaction pass now (same work as the background timer)."""
+    if not retention_job.enabled:
+        raise HTTPException(status_code=409, detail="Retention is disabled (opt in with RETENTION_ENABLED=1)")
+    run = await retention_job.arun_once()
+    if run is None:
+        return {"status": "skipped", "detail": "A pass is already running or failed; see /stats", "data": retention_job.report()}
+    return {"status": "success", "data": run}
+
+def track_location_risk(points):
+    """O(1) per point: fold fresh intel into the per-location risk state."""
+    for point in points:
+        payload = point.payload
+        risk_state.update(payload["location"], risk_agent.intel_signal(payload["description"]), payload["timestamp"])
+
+def track_sighting_risk(location, processed_data, seen_at=None):
+    """A merged duplicate is still a fresh sighting: it counts toward location risk."""
+    risk_state.update(location, risk_agent.intel_signal(processed_data["description"]), seen_at or time.time())
+
 # --- ENDPOINT 1: INGEST INTEL (Uses Perception Agent) ---
 @app.post("/ingest")
 async def ingest_intel(
@@ -74,72 +258,170 @@ async def ingest_intel(
     and saves them to Qdrant Memory.
     """
     
-    # 1. Save file temporarily (Perception needs a file path)
-    temp_filename = f"temp_{file.filename}"
-    with open(temp_filename, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-        
+    # 1. Stream the upload in chunks (hashing as it arrives). Images stay in
+    #    memory; large audio spills to a unique temp file off the event loop.
+    try:
+        spill_bytes, max_bytes = upload_limits(type, file.filename)
+        upload = await read_upload(file, spill_bytes=spill_bytes, max_bytes=max_bytes)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
     try:
         # 2. Pass to Perception Agent
         processed_data = None
         
         if type == "image":
-            # For images, we can pass the file path directly to Pillow inside the agent
-            processed_data = perception_agent.process_image(temp_filename)
-            
-            # Prepare Vector Structure (Named Vectors)
-            # Image goes to 'image_vec', Text is dummy (zeros)
-            vector_struct = {
-                "image_vec": processed_data["vector"],
-                "text_vec": [0.0] * 384 # Empty text vector
-            }
-            
+            # Pillow decodes straight from the in-memory buffer
+            processed_data = await perception_agent.process_image(upload.source)
         elif type == "audio":
-            processed_data = perception_agent.process_audio(temp_filename)
-            
-            # Prepare Vector Structure
-            # Text goes to 'text_vec', Image is dummy
-            vector_struct = {
-                "image_vec": [0.0] * 512, # Empty image vector
-                "text_vec": processed_data["vector"]
-            }
+            processed_data = await perception_agent.process_audio(upload.source)
 
         if not processed_data:
             raise HTTPException(status_code=500, detail="Agent failed to process file")
 
-        # 3. Store in Qdrant (The Memory Step)
-        point_id = str(uuid.uuid4())
-        
-        client.upsert(
-            collection_name=COLLECTION_NAME,
-            points=[
-                PointStruct(
-                    id=point_id,
-                    vector=vector_struct,
-                    payload={
-                        "type": type,
-                        "description": processed_data["description"],
-                        "location": location,
-                        "timestamp": time.time(),
-                        "processed_by": "PerceptionAgent_v1"
-                    }
-                )
-            ]
+        # 3. Same scene / message seen moments ago here? Count it, don't store it again
+        duplicate = await intel_dedup.check(type, processed_data, location)
+        if duplicate is not None:
+            seen_at = time.time()
+            hit_count = await intel_dedup.merge(duplicate, location, seen_at)
+            track_sighting_risk(location, processed_data, seen_at)
+            return {
+                "status": "duplicate",
+                "id": duplicate["id"],
+                "hit_count": hit_count,
+                "intel": processed_data["description"],
+                "sha256": upload.sha256
+            }
+
+        # 4. Store in Qdrant (The Memory Step)
+        point = intel_store.build_point(
+            type, processed_data, location,
+            extra_payload={"sha256": upload.sha256, "bytes": upload.size}
         )
+        point_id = await intel_store.store(point)
+        intel_dedup.remember([point])
+        track_location_risk([point])
         
         return {
             "status": "success", 
             "id": point_id, 
-            "intel": processed_data["description"]
+            "intel": processed_data["description"],
+            "sha256": upload.sha256
         }
 
     except Exception as e:
         return {"status": "error", "message": str(e)}
         
     finally:
-        # Cleanup temp file
-        if os.path.exists(temp_filename):
-            os.remove(temp_filename)
+        # Cleanup spilled audio (if any)
+        await upload.cleanup()
+
+# --- ENDPOINT 1b: BULK INGEST (Drone fleets / sensor gateways) ---
+@app.post("/ingest/batch")
+async def ingest_batch(
+    files: List[UploadFile] = File(...),
+    location: str = Form(...),
+    type: str = Form("auto") # "image", "audio" or "auto" (by file extension)
+):
+    """
+    Accepts many files (and/or .zip archives of them) in one request.
+    Perception runs over the whole batch (the embedding engine batches the
+    encodes) and points are written in chunked, parallel upserts.
+    """
+    started = time.perf_counter()
+
+    # 1. Read every upload (archives are expanded in a worker thread). Every
+    #    part - and every archive member - gets the size limit / spill path of its type.
+    items = []
+    for file in files:
+        try:
+            spill_bytes, max_bytes = upload_limits(type, file.filename)
+            upload = await read_upload(file, spill_bytes=spill_bytes, max_bytes=max_bytes)
+        except UploadTooLarge as e:
+            items.append({"filename": file.filename, "status": "error", "message": str(e)})
+            continue
+
+        if is_archive(upload.filename):
+            try:
+                members, rejected = await asyncio.to_thread(expand_archive, upload, type)
+            except zipfile.BadZipFile as e:
+                items.append({"filename": upload.filename, "status": "error", "message": str(e)})
+                continue
+            finally:
+                await upload.cleanup()
+            items.extend({"upload": m, "filename": m.filename} for m in members)
+            items.extend({"filename": name, "status": "error", "message": message} for name, message in rejected)
+        else:
+            items.append({"upload": upload, "filename": upload.filename})
+
+    pending = [item for item in items if "upload" in item]
+    for item in pending:
+        item["type"] = type if type in ("image", "audio") else guess_modality(item["filename"])
+
+    # 2. Perception over the whole batch, concurrently
+    processed = await perception_agent.process_batch(
+        [(item["type"], item["upload"].source) for item in pending]
+    )
+
+    ok = []
+    for item, processed_data in zip(pending, processed):
+        upload = item.pop("upload")
+        await upload.cleanup()
+        if not processed_data:
+            item.update(status="error", message="Agent failed to process file")
+            continue
+        ok.append((item, upload, processed_data))
+
+    # 3. Dedup against recent intel (one batched lookup) and within the batch
+    matches = await intel_dedup.check_batch([(item["type"], data) for item, _, data in ok], location)
+
+    points, batch_points, duplicates = [], {}, 0
+    for index, ((item, upload, processed_data), match) in enumerate(zip(ok, matches)):
+        if match is None:
+            point = intel_store.build_point(
+                item["type"], processed_data, location,
+                extra_payload={"sha256": upload.sha256, "bytes": upload.size}
+            )
+            points.append(point)
+            batch_points[index] = point
+            item.update(status="success", id=point.id, intel=processed_data["description"], sha256=upload.sha256)
+        elif "batch_index" in match:
+            # Repeats a frame stored by this same request: count it on that point
+            point = batch_points[match["batch_index"]]
+            point.payload["hit_count"] += 1
+            track_sighting_risk(location, processed_data)
+            duplicates += 1
+            item.update(status="duplicate", id=point.id, intel=processed_data["description"], sha256=upload.sha256)
+        else:
+            seen_at = time.time()
+            hit_count = await intel_dedup.merge(match, location, seen_at)
+            track_sighting_risk(location, processed_data, seen_at)
+            duplicates += 1
+            item.update(status="duplicate", id=match["id"], hit_count=hit_count, sha256=upload.sha256)
+
+    # 4. Chunked, parallel upserts
+    try:
+        upsert_calls = await intel_store.store_batch(points)
+        intel_dedup.remember(points)
+        track_location_risk(points)
+    except Exception as e:
+        return {"status": "error", "message": str(e), "items": items}
+
+    elapsed = time.perf_counter() - started
+    succeeded = sum(1 for item in items if item.get("status") == "success")
+    return {
+        "status": "success",
+        "items": items,
+        "summary": {
+            "received": len(items),
+            "stored": succeeded,
+            "duplicates": duplicates,
+            "failed": len(items) - succeeded - duplicates,
+            "upsert_calls": upsert_calls,
+            "seconds": round(elapsed, 3),
+            "items_per_second": round((succeeded + duplicates) / elapsed, 2) if elapsed else None
+        }
+    }
 
 # --- ENDPOINT 2: RECALL PATTERNS (Uses Memory Agent) ---
 @app.get("/agent/memory")
@@ -155,6 +437,68 @@ def search_memory(query: str):
     
     return {"status": "success", "data": results}
 
+@app.get("/agent/memory/live")
+def search_live_intel(
+    query: str,
+    location: Optional[str] = None,
+    type: Optional[str] = None, # "image" or "audio"
+    window_minutes: Optional[float] = None,
+    limit: int = 5
+):
+    """
+    Filtered recall over live intel.
+    Example: ?query=smoke&location=Sector 4&type=image&window_minutes=30
+    """
+    results = memory_agent.recall_intel(query, location=location, intel_type=type, window_minutes=window_minutes, limit=limit)
+
+    if not results:
+        return {"status": "no_matches", "data": []}
+
+    return {"status": "success", "data": results}
+
+@app.post("/agent/memory/multimodal")
+async def search_multimodal(
+    query: Optional[str] = Form(None),
+    file: Optional[UploadFile] = File(None), # Image (e.g. a drone frame)
+    collection: str = Form(LIVE_COLLECTION), # live_intel or historical_patterns
+    location: Optional[str] = Form(None),
+    window_minutes: Optional[float] = Form(None),
+    limit: int = Form(5)
+):
+    """
+    Cross-modal recall with a text query, an image, or both. All per-vector
+    searches (text_vec, image_vec) go out as one batched Qdrant request and
+    come back as a single fused ranking.
+    """
+    if not query and file is None:
+        raise HTTPException(status_code=422, detail="Provide a query, an image file, or both")
+    if collection not in (LIVE_COLLECTION, HISTORY_COLLECTION):
+        raise HTTPException(status_code=422, detail=f"Unknown collection '{collection}'")
+
+    image_vector = None
+    if file is not None:
+        try:
+            upload = await read_upload(file, max_bytes=MAX_IMAGE_BYTES)
+        except UploadTooLarge as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        try:
+            processed = await perception_agent.process_image(upload.source)
+        finally:
+            await upload.cleanup()
+        if not processed:
+            raise HTTPException(status_code=422, detail="Could not read image")
+        image_vector = processed["vector"]
+
+    results = await asyncio.to_thread(
+        memory_agent.recall_multimodal, query, image_vector,
+        collection=collection, location=location, window_minutes=window_minutes, limit=limit
+    )
+
+    if not results:
+        return {"status": "no_matches", "data": []}
+
+    return {"status": "success", "data": results}
+
 # --- ENDPOINT 3: RISK ASSESSMENT (Uses Risk Agent) ---
 @app.post("/agent/risk")
 def assess_risk(data: RiskInput):
@@ -162,15 +506,40 @@ def assess_risk(data: RiskInput):
     Takes the output of Agent 2 (Past Incidents) and calculates Risk Level.
     """
     assessment = risk_agent.assess_risk(data.similar_incidents)
+    if data.location:
+        assessment["location_state"] = risk_state.update(data.location, assessment["score"], data.timestamp)
     return {"status": "success", "data": assessment}
 
+@app.post("/agent/risk/batch")
+def assess_risk_batch(data: RiskBatchInput):
+    """
+    Scores many incident sets in one vectorized pass (city-wide re-assessment).
+    """
+    assessments = risk_agent.assess_batch(data.incident_sets)
+    return {"status": "success", "data": assessments}
+
+@app.get("/risk/top")
+def riskiest_locations(n: int = 10):
+    """
+    Current top-N riskiest locations from the in-memory, decaying risk state
+    (no Qdrant scan - cheap enough for high-frequency dashboard polling).
+    """
+    return {"status": "success", "tracked_locations": len(risk_state), "data": risk_state.top(n)}
+
+@app.get("/risk/location/{location}")
+def location_risk(location: str):
+    state = risk_state.current(location)
+    if state is None:
+        raise HTTPException(status_code=404, detail=f"No intel recorded for '{location}'")
+    return {"status": "success", "data": state}
+
 # --- ENDPOINT 4: DECISION SUPPORT (Uses Groq) ---
 @app.post("/agent/decision")
-def make_decision(data: DecisionInput):
+async def make_decision(data: DecisionInput):
     """
     Synthesizes Intel + Risk + Memory to generate an Action Plan.
     """
-    plan = decision_agent.generate_plan(
+    plan = await decision_agent.generate_plan(
         data.current_description,
         data.risk_data,
         data.past_incidents
@@ -179,17 +548,144 @@ def make_decision(data: DecisionInput):
 
 # --- ENDPOINT 5: EXPLAINABILITY (Uses Groq) ---
 @app.post("/agent/explain")
-def explain_logic(data: ExplainInput):
+async def explain_logic(data: ExplainInput):
     """
     Returns the 'Why' behind the decision.
     """
-    explanation = explain_agent.explain_decision(
+    explanation = await explain_agent.explain_decision(
         data.plan,
         data.risk_data,
         data.past_incidents
     )
     return {"status": "success", "data": explanation}
 
+# --- ENDPOINT 6: FULL PIPELINE (Memory -> Risk -> Decision -> Explain) ---
+@app.post("/analyze")
+async def analyze(data: AnalyzeInput, stream: str = "ndjson", mode: str = DEFAULT_MODE):
+    """
+    One round trip instead of four. Streams each stage's result (with its
+    timing) as soon as it is ready.
+    stream = "ndjson" (default) or "sse" (Server-Sent Events)
+    mode = "sequential" or "speculative" (plan + explanation in parallel)
+    """
+    if mode not in PIPELINE_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of {PIPELINE_MODES}")
+
+    events = run_pipeline(data.description, limit=data.limit, mode=mode)
+
+    if stream == "sse":
+        return StreamingResponse(as_sse(events), media_type="text/event-stream")
+    return StreamingResponse(as_ndjson(events), media_type="application/x-ndjson")
+
+# --- ENDPOINT 7: REAL-TIME SENSOR GATEWAY (WebSocket) ---
+@app.websocket("/ws/sensors")
+async def sensor_stream(websocket: WebSocket, policy: str = "drop_oldest"):
+    """
+    High-rate sensor frames in, alerts out.
+    Each message is one frame or a list of frames:
+      {"location": "Sector 4", "sensor": "thermal", "value": 81.5, "text": "...", "ts": 1700000000.0}
+    policy = "drop_oldest" | "drop_newest" | "block" (when the connection's queue is full)
+    The perception -> memory -> risk chain only runs when a location's
+    sliding window changes materially.
+    """
+    await websocket.accept()
+    if policy not in DROP_POLICIES:
+        await websocket.close(code=1008, reason=f"policy must be one of {DROP_POLICIES}")
+        return
+
+    queue = asyncio.Queue(maxsize=sensor_gateway.queue_size)
+    consumer = asyncio.create_task(sensor_gateway.consume(queue, websocket.send_json))
+    sensor_gateway.stats["connections"] += 1
+    dropped = notified = 0
+
+    try:
+        while True:
+            message = await websocket.receive_text()
+            try:
+                frames = json.loads(message)
+            except ValueError:
+                continue
+            for frame in frames if isinstance(frames, list) else [frames]:
+                if not await sensor_gateway.enqueue(queue, frame, policy):
+                    dropped += 1
+
+            # Tell the sender it is outrunning us (at most once per 100 drops)
+            if dropped - notified >= 100:
+                notified = dropped
+                await websocket.send_json({"type": "backpressure", "dropped": dropped, "policy": policy})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        consumer.cancel()
+        sensor_gateway.stats["connections"] -= 1
+
+# --- ENDPOINT 8: LIVE AUDIO (Chunked transcription while recording) ---
+@app.websocket("/ws/audio")
+async def audio_stream(websocket: WebSocket, location: str, sample_rate: int = 16000):
+    """
+    Binary messages: raw 16-bit mono PCM at `sample_rate`.
+    Text message {"event": "end"} (or disconnecting) ends the recording.
+    Every AUDIO_CHUNK_SECONDS of audio is transcribed, stored in live_intel
+    and recalled against history; the client gets a "partial" message per
+    chunk and a "final" message with the full transcript.
+    """
+    await websocket.accept()
+    if not 8000 <= sample_rate <= 48000:
+        await websocket.close(code=1008, reason="sample_rate must be between 8000 and 48000")
+        return
+
+    stream = audio_streamer.open(location, sample_rate, intel_store)
+    chunker = PCMChunker(sample_rate)
+    queue = asyncio.Queue(maxsize=audio_streamer.queue_size)
+    consumer = asyncio.create_task(audio_streamer.consume(queue, stream, websocket.send_json))
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect()
+            if message.get("bytes"):
+                for chunk in chunker.feed(message["bytes"]):
+                    await audio_streamer.enqueue(queue, chunk, consumer)
+            elif message.get("text") and _is_end_event(message["text"]):
+                break
+
+        # Last partial chunk, then wait for the transcripts to drain
+        tail = chunker.flush()
+        if tail:
+            await audio_streamer.enqueue(queue, tail, consumer)
+        await audio_streamer.enqueue(queue, None, consumer)
+        transcripts = await consumer
+
+        await websocket.send_json({
+            "type": "final",
+            "stream_id": stream["id"],
+            "audio_seconds": round(chunker.seconds(), 2),
+            "chunks": len(transcripts),
+            "text": join_transcripts(transcripts)
+        })
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        # The consumer died (e.g. the live_intel store failed): tell the client, close cleanly
+        print(f"❌ Audio Stream Error: {e}")
+        audio_streamer.stats["errors"] += 1
+        try:
+            await websocket.send_json({"type": "error", "stream_id": stream["id"], "detail": str(e)})
+            await websocket.close(code=1011)
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+    finally:
+        consumer.cancel()
+        audio_streamer.close(stream, chunker.seconds())
+
+def _is_end_event(text):
+    try:
+        return json.loads(text).get("event") == "end"
+    except (ValueError, AttributeError):
+        return False
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,103 @@
+"""
+One-off migration: drops the zero-padded dummy vectors older points were
+written with (every audio point carried a 512-d zero `image_vec`, every
+image point a 384-d zero `text_vec`, every history record a zero
+`image_vec`).
+
+Streams each collection in batches, so it never holds more than one page
+of vectors in memory, and reports stored vectors / estimated RAM before
+and after.
+
+    python migrate_sparse_vectors.py               # all collections
+    python migrate_sparse_vectors.py --dry-run     # report only
+    python migrate_sparse_vectors.py --collection live_intel --batch 512
+"""
+import argparse
+
+import numpy as np
+
+from init_memory import connect, COLLECTIONS, VECTOR_SIZES
+
+HNSW_DEFAULT_M = 16
+
+
+def estimate_bytes(counts, m):
+    """Raw float32 vectors + HNSW level-0 links (2*m u32 ids per vector)."""
+    return sum(count * (VECTOR_SIZES[name] * 4 + 2 * m * 4) for name, count in counts.items())
+
+
+def hnsw_m(client, collection):
+    try:
+        return client.get_collection(collection).config.hnsw_config.m or HNSW_DEFAULT_M
+    except Exception:
+        return HNSW_DEFAULT_M
+
+
+def migrate_collection(client, collection, batch=256, dry_run=False):
+    """
+    Input: collection name
+    Output: ({vector_name: stored count before}, {vector_name: zero vectors removed})
+    """
+    stored = {name: 0 for name in VECTOR_SIZES}
+    removed = {name: 0 for name in VECTOR_SIZES}
+
+    offset = None
+    while True:
+        points, offset = client.scroll(
+            collection_name=collection,
+            limit=batch,
+            offset=offset,
+            with_payload=False,
+            with_vectors=list(VECTOR_SIZES)
+        )
+
+        empty = {name: [] for name in VECTOR_SIZES}
+        for point in points:
+            for name, vector in (point.vector or {}).items():
+                if name not in stored:
+                    continue
+                stored[name] += 1
+                if not np.any(np.asarray(vector, dtype=np.float32)):
+                    empty[name].append(point.id)
+
+        for name, ids in empty.items():
+            if not ids:
+                continue
+            removed[name] += len(ids)
+            if not dry_run:
+                client.delete_vectors(collection_name=collection, vectors=[name], points=ids, wait=True)
+
+        if offset is None:
+            break
+    return stored, removed
+
+
+def report(collection, stored, removed, m, dry_run):
+    after = {name: stored[name] - removed[name] for name in stored}
+    before_mb = estimate_bytes(stored, m) / 1e6
+    after_mb = estimate_bytes(after, m) / 1e6
+    verb = "would drop" if dry_run else "dropped"
+
+    print(f"📦 {collection}:")
+    for name in stored:
+        print(f"   {name:<10} {stored[name]:>9,} -> {after[name]:>9,} vectors ({verb} {removed[name]:,} zero vectors)")
+    saved = (1 - after_mb / before_mb) * 100 if before_mb else 0.0
+    print(f"   est. RAM   {before_mb:9.2f}MB -> {after_mb:9.2f}MB ({saved:.0f}% smaller)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Remove zero-padded named vectors")
+    parser.add_argument("--collection", action="append", help="Collection to migrate (repeatable, default: all)")
+    parser.add_argument("--batch", type=int, default=256, help="Points per scroll page")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be removed")
+    args = parser.parse_args()
+
+    client = connect()
+    for collection in args.collection or COLLECTIONS:
+        if not client.collection_exists(collection):
+            print(f"⚠️ {collection} does not exist. Skipping.")
+            continue
+        stored, removed = migrate_collection(client, collection, batch=args.batch, dry_run=args.dry_run)
+        report(collection, stored, removed, hnsw_m(client, collection), args.dry_run)
+
+    print("\n🎉 Sparse vector migration complete." if not args.dry_run else "\n🔎 Dry run only, nothing changed.")
@@ -1,19 +1,11 @@
-import os
 from dotenv import load_dotenv
-from qdrant_client import QdrantClient
-from qdrant_client.models import PointStruct
-from sentence_transformers import SentenceTransformer
-import uuid
+
+from agents.memory import memory_agent, HISTORY_COLLECTION
 
 load_dotenv()
 
-# 1. Connect
-client = QdrantClient(
-    url=os.getenv("QDRANT_URL"),
-    api_key=os.getenv("QDRANT_API_KEY")
-)
-model = SentenceTransformer('all-MiniLM-L6-v2')
-COLLECTION = "historical_patterns"
+# 1. Connect (Memory Agent owns the Qdrant client + write path)
+COLLECTION = HISTORY_COLLECTION
 
 # 2. Define Fake History (The "Knowledge Base")
 history_data = [
@@ -48,17 +40,5 @@ history_data = [
 
 # 3. Insert into Qdrant
 print("🌱 Seeding History...")
-points = []
-for item in history_data:
-    # Convert text description to vector
-    vector = model.encode(item["text"]).tolist()
-    
-    # Create Point
-    points.append(PointStruct(
-        id=str(uuid.uuid4()),
-        vector={"text_vec": vector, "image_vec": [0.0]*512}, # Image vec empty for text history
-        payload=item["payload"]
-    ))
-
-client.upsert(collection_name=COLLECTION, points=points)
-print(f"✅ Successfully added {len(points)} past incidents to memory.")
\ No newline at end of file
+count = memory_agent.store_patterns(history_data, collection=COLLECTION)
+print(f"✅ Successfully added {count} past incidents to memory.")
@@ -0,0 +1,9 @@
+import os
+import sys
+
+# Tests run from backend/ against in-process stand-ins: no Qdrant Cloud, no API keys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QDRANT_LOCATION", ":memory:")
+os.environ.setdefault("TRANSCRIPTION_BACKEND", "mock")
+os.environ.setdefault("LLM_CACHE_ENABLED", "0")
+os.environ.setdefault("RETENTION_ENABLED", "0")
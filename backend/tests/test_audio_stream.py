@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+
+from agents.audio_stream import PCMChunker, AudioStreamer, join_transcripts
+
+
+def test_chunks_carry_the_previous_tail():
+    chunker = PCMChunker(10, chunk_seconds=1, overlap_seconds=0.2)
+    chunks = chunker.feed(bytes(range(40)))
+    assert len(chunks) == 2
+    assert chunks[1][:4] == chunks[0][-4:]
+
+
+def test_join_trims_words_repeated_across_the_overlap():
+    transcripts = ["Water is rising near the", "near the bridge. Send boats", "send boats now"]
+    assert join_transcripts(transcripts) == "Water is rising near the bridge. Send boats now"
+
+
+def test_join_keeps_chunks_without_overlap():
+    assert join_transcripts(["fire on Main Street", "smoke visible"]) == "fire on Main Street smoke visible"
+
+
+def test_enqueue_raises_the_consumer_error_instead_of_blocking():
+    streamer = AudioStreamer()
+
+    async def run():
+        queue = asyncio.Queue(maxsize=1)
+
+        async def failing_consumer():
+            await asyncio.sleep(0.01)
+            raise ConnectionError("live_intel store failed")
+
+        consumer = asyncio.create_task(failing_consumer())
+        await streamer.enqueue(queue, b"first", consumer)
+        await streamer.enqueue(queue, b"second", consumer)  # Queue full; consumer dies
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(run())
@@ -0,0 +1,30 @@
+from agents import decision, explain
+from agents.context import ContextBuilder
+
+
+def test_evidence_merges_repeated_outcomes_within_budget():
+    builder = ContextBuilder()
+    incidents = [
+        {"incident": "Flood A", "outcome": "Bridge collapsed", "score": 0.9},
+        {"incident": "Flood B", "outcome": "bridge collapsed!", "score": 0.8},
+        {"incident": "Fire C", "outcome": "Contained", "score": 0.5}
+    ]
+    evidence = builder.evidence(incidents)
+    assert evidence["merged"] == 1 and evidence["kept"] == 3
+    assert evidence["text"].startswith("- E1 Flood A +1 similar")
+
+
+def test_saved_latency_is_reported_as_an_estimate():
+    builder = ContextBuilder()
+    builder.record("test", "x" * 40, 1000)
+    report = builder.report()
+    assert report["estimated_saved_ms"] == builder.ms_per_1k_tokens
+    assert "not measured" in report["saved_ms_basis"]
+
+
+def test_response_cache_keys_carry_the_prompt_version(monkeypatch):
+    risk = {"level": "HIGH", "score": 80}
+    key = explain.explain_agent._cache_key("explain", {"a": 1}, risk, [])
+    monkeypatch.setattr(explain, "PROMPT_VERSION", explain.PROMPT_VERSION + 1)
+    assert explain.explain_agent._cache_key("explain", {"a": 1}, risk, []) != key
+    assert decision.PROMPT_VERSION >= 2
@@ -0,0 +1,45 @@
+import asyncio
+import time
+
+from qdrant_client import QdrantClient
+
+from agents.dedup import IntelDeduplicator
+from agents.intel_store import IntelStore
+from init_memory import setup_cloud_memory
+
+
+def _setup():
+    client = QdrantClient(location=":memory:")
+    setup_cloud_memory(client)
+    return client, IntelStore(client), IntelDeduplicator(client)
+
+
+def test_merge_refreshes_timestamp_and_keeps_first_seen():
+    client, store, dedup = _setup()
+    point = store.build_point("image", {"vector": [0.1] * 512, "description": "frame", "dhash": "ff00ff00ff00ff00"}, "S1")
+    asyncio.run(store.store(point))
+    dedup.remember([point])
+    first_seen = point.payload["timestamp"]
+
+    seen_at = first_seen + 120
+    match = asyncio.run(dedup.check("image", {"vector": [0.1] * 512, "dhash": "ff00ff00ff00ff00"}, "S1"))
+    assert match["id"] == point.id
+    assert asyncio.run(dedup.merge(match, "S1", seen_at)) == 2
+
+    payload = client.retrieve("live_intel", ids=[point.id], with_payload=True)[0].payload
+    assert payload["hit_count"] == 2
+    assert payload["timestamp"] == payload["last_seen"] == seen_at
+    assert payload["first_seen"] == first_seen
+
+
+def test_merged_entry_moves_to_the_back_of_the_hash_window():
+    _, store, dedup = _setup()
+    now = time.time()
+    points = [
+        store.build_point("image", {"vector": [0.1 * (i + 1)] * 512, "description": "frame", "dhash": f"{i:016x}"}, "S1")
+        for i in range(2)
+    ]
+    asyncio.run(store.store_batch(points, wait=True))
+    dedup.remember(points)
+    asyncio.run(dedup.merge({"id": str(points[0].id)}, "S1", now + 1))
+    assert [entry["id"] for entry in dedup.recent["S1"]] == [str(points[1].id), str(points[0].id)]
@@ -0,0 +1,82 @@
+import asyncio
+import threading
+from concurrent.futures import CancelledError
+
+import numpy as np
+import pytest
+
+from agents.embedding import EmbeddingEngine
+
+
+class StubModel:
+    """Records batch sizes; encodes "text" -> [len(text), 1.0]."""
+
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+        self.lock = threading.Lock()
+
+    def encode(self, items, batch_size):
+        with self.lock:
+            self.batches.append(len(items))
+        if self.fail:
+            raise RuntimeError("model crashed")
+        return np.array([[float(len(item)), 1.0] for item in items])
+
+
+def _engine(model, **settings):
+    engine = EmbeddingEngine(workers=2, **settings)
+    engine.register("stub", model)
+    return engine
+
+
+def test_concurrent_requests_share_a_batch_and_resolve_in_order():
+    model = StubModel()
+    engine = _engine(model, max_batch=32, max_wait_ms=200)
+
+    futures = [engine.submit("stub", "x" * i) for i in range(1, 11)]
+    assert [f.result(timeout=5) for f in futures] == [[float(i), 1.0] for i in range(1, 11)]
+    assert model.batches == [10]
+    assert engine.stats()["models"]["stub"]["batch_size"]["max"] == 10
+
+
+def test_batches_are_capped_at_max_batch():
+    model = StubModel()
+    engine = _engine(model, max_batch=4, max_wait_ms=200)
+
+    futures = [engine.submit("stub", "abc") for _ in range(10)]
+    for future in futures:
+        future.result(timeout=5)
+    assert sorted(model.batches, reverse=True) == [4, 4, 2]
+
+
+def test_a_failed_batch_fails_every_future():
+    engine = _engine(StubModel(fail=True), max_batch=8, max_wait_ms=50)
+
+    futures = [engine.submit("stub", "abc") for _ in range(3)]
+    for future in futures:
+        with pytest.raises(RuntimeError, match="model crashed"):
+            future.result(timeout=5)
+    assert engine.stats()["models"]["stub"]["errors"] == 1
+
+
+def test_cancelled_requests_are_skipped():
+    model = StubModel()
+    engine = _engine(model, max_batch=8, max_wait_ms=200)
+
+    cancelled = engine.submit("stub", "gone")
+    kept = engine.submit("stub", "kept")
+    assert cancelled.cancel()
+    assert kept.result(timeout=5) == [4.0, 1.0]
+    assert model.batches == [1]
+    with pytest.raises(CancelledError):
+        cancelled.result()
+
+
+def test_aencode_awaits_without_blocking_the_loop():
+    engine = _engine(StubModel(), max_batch=8, max_wait_ms=20)
+
+    async def run():
+        return await asyncio.gather(engine.aencode("stub", "ab"), engine.aencode("stub", "abcd"))
+
+    assert asyncio.run(run()) == [[2.0, 1.0], [4.0, 1.0]]
@@ -0,0 +1,28 @@
+import io
+
+import numpy as np
+from PIL import Image
+
+from agents.fingerprint import dhash, hamming
+from agents.perception import _decode_image
+
+
+def _jpeg(seed, shift=0):
+    pixels = np.random.default_rng(seed).integers(0, 255, (64, 64, 3), dtype=np.uint8)
+    pixels = np.clip(pixels.astype(int) + shift, 0, 255).astype(np.uint8)
+    buf = io.BytesIO()
+    Image.fromarray(pixels).save(buf, format="JPEG")
+    buf.seek(0)
+    return buf
+
+
+def test_near_identical_frames_have_close_hashes():
+    a, b, other = (dhash(Image.open(_jpeg(*args))) for args in ((1,), (1, 3), (2,)))
+    assert hamming(a, b) <= 6
+    assert hamming(a, other) > 6
+
+
+def test_decode_returns_loaded_image_and_its_hash():
+    img, fingerprint = _decode_image(_jpeg(1))
+    assert img.size == (64, 64)
+    assert fingerprint == dhash(img)
@@ -0,0 +1,79 @@
+import asyncio
+
+import httpx
+import pytest
+
+from agents.llm import LLMGateway, LLMError, _parse_seconds
+
+COMPLETION = {"choices": [{"message": {"content": "{}"}}], "usage": {"prompt_tokens": 10}}
+
+
+def _gateway(handler, **settings):
+    """A gateway whose HTTP client answers from `handler` (no network)."""
+    gateway = LLMGateway()
+    gateway.api_key = "test"
+    gateway.backoff_base = 0.01
+    gateway.backoff_cap = 0.02
+    for key, value in settings.items():
+        setattr(gateway, key, value)
+
+    def http():
+        if gateway._client is None:
+            gateway._client = httpx.AsyncClient(base_url="http://stub", transport=httpx.MockTransport(handler))
+            gateway._semaphore = asyncio.Semaphore(gateway.max_concurrency)
+        return gateway._client
+
+    gateway._http = http
+    return gateway
+
+
+def _chat(gateway):
+    async def run():
+        try:
+            return await gateway.chat([{"role": "user", "content": "hi"}], model="m")
+        finally:
+            await gateway.aclose()
+    return asyncio.run(run())
+
+
+def test_retries_429_and_5xx_then_succeeds():
+    statuses = iter([429, 503])
+
+    def handler(request):
+        status = next(statuses, 200)
+        return httpx.Response(status, json=COMPLETION if status == 200 else {"error": "busy"})
+
+    gateway = _gateway(handler, max_retries=3)
+    assert _chat(gateway) == COMPLETION
+    assert gateway.stats == {"calls": 1, "retries": 2, "failures": 0}
+
+
+def test_gives_up_after_max_retries():
+    gateway = _gateway(lambda request: httpx.Response(500, text="down"), max_retries=2)
+    with pytest.raises(LLMError, match="HTTP 500"):
+        _chat(gateway)
+    assert gateway.stats["retries"] == 2
+    assert gateway.stats["failures"] == 1
+
+
+def test_client_errors_are_not_retried():
+    gateway = _gateway(lambda request: httpx.Response(400, text="bad request"), max_retries=3)
+    with pytest.raises(LLMError, match="HTTP 400"):
+        _chat(gateway)
+    assert gateway.stats["retries"] == 0
+
+
+def test_deadline_covers_retries():
+    # Retry-After keeps it waiting far past the deadline
+    gateway = _gateway(lambda request: httpx.Response(429, headers={"retry-after": "5"}), max_retries=10, deadline=0.2)
+    with pytest.raises(LLMError, match="Deadline"):
+        _chat(gateway)
+    assert gateway.stats["failures"] == 1
+
+
+def test_retry_after_hint_raises_the_backoff():
+    gateway = LLMGateway()
+    response = httpx.Response(429, headers={"x-ratelimit-reset-requests": "1m30s"})
+    assert gateway._retry_delay(response, 0) == 90.0
+    assert _parse_seconds("250ms") == 0.25
+    assert _parse_seconds("soon") is None
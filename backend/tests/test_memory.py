@@ -0,0 +1,42 @@
+from agents.memory import fuse_scores, normalize_query
+
+
+def test_fused_scores_stay_in_range_with_negative_cosines():
+    rankings = {
+        "text_vec:text": [("a", 0.62, {}), ("b", 0.40, {})],
+        "image_vec:text": [("b", -0.05, {}), ("a", -0.12, {})]
+    }
+    fused = fuse_scores(rankings)
+    assert all(0.0 <= score <= 1.0 for _, score, _, _ in fused)
+    assert fused[0][3] == {"text_vec:text": 0.62, "image_vec:text": -0.12}
+
+
+def test_weak_list_does_not_outweigh_a_strong_one():
+    rankings = {
+        "text_vec:text": [("strong", 0.9, {}), ("weak", 0.3, {})],
+        "image_vec:text": [("weak", 0.05, {})]
+    }
+    weights = {"text_vec:text": 1.0, "image_vec:text": 0.25}
+    assert [point_id for point_id, _, _, _ in fuse_scores(rankings, weights=weights)] == ["strong", "weak"]
+
+
+def test_scores_are_not_rescaled_per_list():
+    rankings = {"text_vec:text": [("a", 0.8, {})], "image_vec:image": [("a", 0.2, {})]}
+    assert fuse_scores(rankings)[0][1] == 0.5
+
+
+def test_normalize_query():
+    assert normalize_query("  Fire with CHEMICAL smell!! ") == "fire with chemical smell"
+
+
+def test_query_is_embedded_verbatim_and_cached_normalized(monkeypatch):
+    from agents import memory
+
+    seen = []
+    monkeypatch.setattr(memory.embedding_engine, "encode", lambda model, text: seen.append(text) or [0.1] * 384)
+    agent = memory.memory_agent
+    agent.embedding_cache.invalidate()
+
+    agent._embed_query("Fire with CHEMICAL smell!!")
+    agent._embed_query("fire with chemical smell")
+    assert seen == ["Fire with CHEMICAL smell!!"]
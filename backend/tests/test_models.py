@@ -0,0 +1,60 @@
+import time
+import threading
+
+from agents import models
+from agents.models import ModelRegistry, warmup_targets, ALL_MODELS
+
+
+def _registry(load_seconds=0.05):
+    registry = ModelRegistry()
+    loads = []
+
+    def load(name):
+        loads.append(name)
+        time.sleep(load_seconds)
+        return object()
+
+    registry._load = load
+    return registry, loads
+
+
+def test_concurrent_gets_load_once_and_share_the_instance():
+    registry, loads = _registry()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("m"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert loads == ["m"]
+    assert len({id(model) for model in results}) == 1
+
+
+def test_loading_one_model_does_not_block_another():
+    registry, _ = _registry(load_seconds=0.5)
+    slow = threading.Thread(target=registry.get, args=("slow",))
+    slow.start()
+    time.sleep(0.05)
+
+    registry._load = lambda name: object()
+    started = time.perf_counter()
+    registry.get("fast")
+    assert time.perf_counter() - started < 0.25
+    slow.join()
+
+
+def test_nothing_loads_until_asked():
+    registry, loads = _registry(load_seconds=0)
+    assert not any(info["loaded"] for info in registry.report().values())
+    registry.warm_up(["a"])
+    assert loads == ["a"] and registry.is_loaded("a")
+
+
+def test_warmup_targets(monkeypatch):
+    monkeypatch.setenv("AURA_WARMUP_MODELS", "")
+    assert warmup_targets() == []
+    monkeypatch.setenv("AURA_WARMUP_MODELS", "all")
+    assert warmup_targets() == ALL_MODELS
+    monkeypatch.setenv("AURA_WARMUP_MODELS", f" {models.TEXT_MODEL} , ")
+    assert warmup_targets() == [models.TEXT_MODEL]
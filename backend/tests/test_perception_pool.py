@@ -0,0 +1,71 @@
+import time
+import threading
+
+import pytest
+
+from agents.perception_pool import PerceptionPool, PoolUnavailable
+
+
+class FakeWorker:
+    """Stands in for _Worker: no process, encode() is scripted."""
+
+    def __init__(self, index=0, encode=None):
+        self.index = index
+        self.lock = threading.Lock()
+        self.generation = 0
+        self.restarts = 0
+        self.ready = True
+        self._encode = encode or (lambda data: ([0.0] * 512, "0" * 16))
+
+    def encode(self, data, timeout, load_timeout):
+        return self._encode(data)
+
+    def alive(self):
+        return False
+
+    def ping(self, timeout):
+        return False
+
+    def restart(self):
+        self.restarts += 1
+        self.generation += 1
+
+
+def _pool(*workers):
+    pool = PerceptionPool(workers=len(workers), slot_bytes=1024, timeout=30)
+    for worker in workers:
+        pool.workers.append(worker)
+        pool._idle.put(worker)
+    return pool
+
+
+def test_busy_pool_falls_back_without_waiting():
+    pool = _pool(FakeWorker())
+    pool._idle.get_nowait()  # The only worker is busy
+
+    started = time.perf_counter()
+    with pytest.raises(PoolUnavailable):
+        pool.encode_bytes(b"jpeg")
+    assert time.perf_counter() - started < 1
+    assert pool.stats["fallbacks"] == 1
+
+
+def test_dead_worker_is_restarted_once():
+    def crash(data):
+        raise EOFError("worker died")
+
+    worker = FakeWorker(encode=crash)
+    pool = _pool(worker)
+    seen_by_health_check = worker.generation  # The health check saw the same dead process
+
+    with pytest.raises(PoolUnavailable):
+        pool.encode_bytes(b"jpeg")
+    assert pool._restart(worker, seen_by_health_check, "unhealthy") is False
+    assert worker.restarts == 1
+    assert pool.stats["crashes"] == 1
+
+
+def test_health_check_restarts_unhealthy_workers():
+    pool = _pool(FakeWorker(0), FakeWorker(1))
+    assert pool.health_check() == 2
+    assert pool.report()["crashes"] == 2
@@ -0,0 +1,102 @@
+import json
+import asyncio
+
+from fastapi.testclient import TestClient
+
+import main
+from agents import pipeline
+
+
+def _stub_stages(monkeypatch, started, cancelled):
+    async def slow(name, result):
+        started.append(name)
+        try:
+            await asyncio.sleep(0.05 if name == "plan" else 10)
+        except asyncio.CancelledError:
+            cancelled.append(name)
+            raise
+        return result
+
+    monkeypatch.setattr(pipeline.memory_agent, "recall_patterns", lambda description, limit: [])
+    monkeypatch.setattr(pipeline.decision_agent, "generate_plan", lambda *a: slow("plan", {"actions": ["evacuate"]}))
+    monkeypatch.setattr(pipeline.explain_agent, "draft_explanation", lambda *a: slow("draft", {"narrative": "draft"}))
+
+
+def test_speculative_draft_is_cancelled_when_the_client_disconnects(monkeypatch):
+    started, cancelled = [], []
+    _stub_stages(monkeypatch, started, cancelled)
+
+    async def run():
+        events = pipeline.run_pipeline("flooding", mode="speculative")
+        async for event in events:
+            if event["stage"] == "decision":
+                break
+        await events.aclose()  # What StreamingResponse does on disconnect
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert started == ["plan", "draft"]
+    assert cancelled == ["draft"]
+
+
+def test_speculative_explanation_is_conditioned_on_the_plan(monkeypatch):
+    monkeypatch.setattr(pipeline.memory_agent, "recall_patterns", lambda description, limit: [])
+
+    async def plan(*a):
+        return {"actions": ["evacuate"]}
+
+    async def draft(*a):
+        return {"narrative": "draft"}
+
+    async def refine(draft, plan, risk, incidents):
+        return {"narrative": f"{draft['narrative']} -> {plan['actions'][0]}"}
+
+    monkeypatch.setattr(pipeline.decision_agent, "generate_plan", plan)
+    monkeypatch.setattr(pipeline.explain_agent, "draft_explanation", draft)
+    monkeypatch.setattr(pipeline.explain_agent, "refine_explanation", refine)
+
+    async def run():
+        return [event async for event in pipeline.run_pipeline("flooding", mode="speculative")]
+
+    events = {event["stage"]: event for event in asyncio.run(run())}
+    assert events["explain"]["data"]["narrative"] == "draft -> evacuate"
+    assert "explain_refine" in events["done"]["timings_ms"]
+    assert "saved_ms_est" in events["done"]["metadata"]
+
+
+def _stub_agents(monkeypatch):
+    monkeypatch.setattr(pipeline.memory_agent, "recall_patterns",
+                        lambda description, limit: [{"incident": "Fire A", "outcome": "Flashover", "score": 0.9}])
+
+    async def plan(*a):
+        return {"actions": ["evacuate"]}
+
+    async def explain(*a):
+        return {"narrative": "because Fire A"}
+
+    monkeypatch.setattr(pipeline.decision_agent, "generate_plan", plan)
+    monkeypatch.setattr(pipeline.explain_agent, "explain_decision", explain)
+
+
+def test_analyze_streams_every_stage_as_ndjson(monkeypatch):
+    _stub_agents(monkeypatch)
+    with TestClient(main.app) as client:
+        response = client.post("/analyze", json={"description": "smoke in sector 4"})
+
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert [event["stage"] for event in events] == ["memory", "risk", "decision", "explain", "done"]
+    assert events[1]["data"]["level"] in ("LOW", "MEDIUM", "HIGH", "CRITICAL")
+    assert set(events[-1]["timings_ms"]) == {"memory", "risk", "decision", "explain"}
+
+
+def test_analyze_sse_and_bad_mode(monkeypatch):
+    _stub_agents(monkeypatch)
+    with TestClient(main.app) as client:
+        response = client.post("/analyze", params={"stream": "sse"}, json={"description": "smoke"})
+        assert client.post("/analyze", params={"mode": "turbo"}, json={"description": "smoke"}).status_code == 400
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert [line for line in response.text.splitlines() if line.startswith("event:")] == [
+        "event: memory", "event: risk", "event: decision", "event: explain", "event: done"
+    ]
@@ -0,0 +1,72 @@
+from types import SimpleNamespace
+
+import pytest
+from qdrant_client.models import ScalarQuantization, BinaryQuantization, Disabled
+
+from agents.quantization import quantization_mode, quantization_config, search_params
+from init_memory import migrate_quantization, COLLECTIONS
+
+
+def test_per_collection_setting_overrides_the_default(monkeypatch):
+    monkeypatch.setenv("QDRANT_QUANTIZATION", "binary")
+    monkeypatch.setenv("QDRANT_QUANTIZATION_LIVE_INTEL", "INT8")
+    assert quantization_mode("live_intel") == "int8"
+    assert quantization_mode("historical_patterns") == "binary"
+
+    monkeypatch.setenv("QDRANT_QUANTIZATION", "int4")
+    with pytest.raises(ValueError):
+        quantization_mode("historical_patterns")
+
+
+def test_configs_and_search_params(monkeypatch):
+    monkeypatch.delenv("MEMORY_QUANT_OVERSAMPLING", raising=False)
+    monkeypatch.delenv("MEMORY_QUANT_RESCORE", raising=False)
+    assert quantization_config("none") is None
+    assert isinstance(quantization_config("int8"), ScalarQuantization)
+    assert isinstance(quantization_config("binary"), BinaryQuantization)
+
+    assert search_params("x", mode="none") is None
+    binary = search_params("x", mode="binary").quantization
+    assert binary.rescore is True and binary.oversampling == 3.0
+    assert search_params("x", mode="int8").quantization.oversampling == 1.5
+
+
+class RecordingClient:
+    """Just enough of QdrantClient for migrate_quantization."""
+
+    def __init__(self, current):
+        self.current = current
+        self.updates = []
+
+    def collection_exists(self, name):
+        return True
+
+    def get_collection(self, name):
+        return SimpleNamespace(config=SimpleNamespace(quantization_config=self.current))
+
+    def update_collection(self, collection_name, vectors_config, quantization_config):
+        self.updates.append((collection_name, quantization_config, {v.on_disk for v in vectors_config.values()}))
+
+
+def test_migration_switches_mismatched_collections_only(monkeypatch):
+    monkeypatch.delenv("QDRANT_QUANTIZATION_LIVE_INTEL", raising=False)
+    monkeypatch.setenv("QDRANT_QUANTIZATION", "int8")
+
+    client = RecordingClient(current=None)
+    migrate_quantization(client)
+    assert [name for name, _, _ in client.updates] == list(COLLECTIONS)
+    assert all(isinstance(config, ScalarQuantization) and on_disk == {True} for _, config, on_disk in client.updates)
+
+    client = RecordingClient(current=quantization_config("int8"))
+    migrate_quantization(client)
+    assert client.updates == []
+
+
+def test_migration_back_to_full_precision(monkeypatch):
+    monkeypatch.delenv("QDRANT_QUANTIZATION_LIVE_INTEL", raising=False)
+    monkeypatch.setenv("QDRANT_QUANTIZATION", "none")
+
+    client = RecordingClient(current=quantization_config("binary"))
+    migrate_quantization(client)
+    assert {config for _, config, _ in client.updates} == {Disabled.DISABLED}
+    assert all(on_disk == {False} for _, _, on_disk in client.updates)
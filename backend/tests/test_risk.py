@@ -0,0 +1,23 @@
+from agents.risk import RiskAgent, _match_outcome
+
+
+def test_strongest_signal_wins():
+    agent = RiskAgent()
+    assert agent.match_outcome("Minor failure, then a structural COLLAPSE") == (10.0, "collapse", "structural")
+    assert agent.match_outcome("casualties reported") == (10.0, "casualties", "life_safety")
+    assert agent.match_outcome("Contained quickly") == (0.0, None, None)
+
+
+def test_matcher_cache_is_shared_across_agents():
+    _match_outcome.cache_clear()
+    RiskAgent().match_outcome("toxic smoke")
+    RiskAgent().match_outcome("toxic smoke")
+    assert _match_outcome.cache_info().hits == 1
+
+
+def test_levels_follow_the_score():
+    agent = RiskAgent()
+    assert agent.assess_risk([])["level"] == "UNKNOWN"
+    assert agent.assess_risk([{"outcome": "Contained", "score": 0.5}])["level"] == "LOW"
+    high = agent.assess_risk([{"outcome": "Explosion and collapse", "score": 0.95}] * 3)
+    assert high["level"] == "CRITICAL"
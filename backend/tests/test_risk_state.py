@@ -0,0 +1,56 @@
+import math
+
+import pytest
+
+from agents.risk_state import LocationRiskState
+
+
+def test_score_halves_every_half_life():
+    state = LocationRiskState(half_life_seconds=100)
+    state.update("A", 0.8, ts=1000.0)
+
+    assert state.current("A", now=1000.0)["score"] == pytest.approx(0.8)
+    assert state.current("A", now=1100.0)["score"] == pytest.approx(0.4)
+    assert state.current("A", now=1200.0)["score"] == pytest.approx(0.2)
+
+
+def test_new_evidence_adds_to_the_decayed_score():
+    state = LocationRiskState(half_life_seconds=100)
+    state.update("A", 0.5, ts=1000.0)
+    view = state.update("A", 0.5, ts=1100.0)
+
+    assert view["events"] == 2
+    assert state.current("A", now=1100.0)["score"] == pytest.approx(0.75)
+
+
+def test_late_points_are_decayed_to_the_stored_time():
+    state = LocationRiskState(half_life_seconds=100)
+    state.update("A", 0.5, ts=1100.0)
+    state.update("A", 0.4, ts=1000.0)  # Arrives after a newer point
+
+    assert state.current("A", now=1100.0)["score"] == pytest.approx(0.7)
+    assert state.current("A", now=1100.0)["last_update"] == 1100.0
+
+
+def test_top_orders_by_decayed_score():
+    state = LocationRiskState(half_life_seconds=100)
+    state.update("old-but-high", 0.9, ts=1000.0)   # 0.225 by t=1200
+    state.update("fresh-low", 0.3, ts=1200.0)
+    state.update("fresh-mid", 0.5, ts=1190.0)      # ~0.467
+    state.update("nothing", 0.0, ts=1200.0)
+
+    top = state.top(n=3, now=1200.0)
+    assert [entry["location"] for entry in top] == ["fresh-mid", "fresh-low", "old-but-high"]
+    assert [entry["location"] for entry in state.top(n=1, now=1200.0)] == ["fresh-mid"]
+    assert len(state) == 4
+
+
+def test_top_follows_later_updates():
+    state = LocationRiskState(half_life_seconds=100)
+    state.update("A", 0.5, ts=1000.0)
+    state.update("B", 0.4, ts=1000.0)
+    state.update("B", 0.4, ts=1000.0)
+
+    assert [entry["location"] for entry in state.top(n=2, now=1000.0)] == ["B", "A"]
+    assert state.top(n=1, now=1000.0)[0]["score"] == pytest.approx(0.8)
+    assert math.isclose(state.top(n=2, now=1100.0)[1]["score"], 0.25, rel_tol=1e-3)
@@ -0,0 +1,139 @@
+import asyncio
+
+from agents.sensor_gateway import SensorAggregator, SensorGateway
+
+
+def test_malformed_frames_are_counted_as_invalid():
+    aggregator = SensorAggregator(window_seconds=10, change_threshold=0.25, min_interval=0.01)
+    for frame in (
+        {"location": "A", "value": 1, "ts": "abc"},
+        {"location": "A", "value": "hot"},
+        {"value": 1},
+        ["not", "a", "frame"],
+        None,
+    ):
+        assert aggregator.add(frame) is None
+
+    assert aggregator.stats["invalid"] == 5
+    assert aggregator.stats["frames"] == 0
+
+    aggregator.add({"location": "A", "sensor": "temp", "value": 21.5, "ts": 100.0})
+    assert aggregator.stats["frames"] == 1
+    assert aggregator.summary("A", now=100.0)["sensors"]["temp"]["count"] == 1
+
+
+def test_consumer_survives_bad_frames():
+    gateway = _gateway()
+    gateway.aggregator = SensorAggregator(window_seconds=10, change_threshold=10.0, min_interval=1000)
+
+    async def run():
+        queue = asyncio.Queue(maxsize=8)
+        consumer = asyncio.create_task(gateway.consume(queue, send=lambda event: None))
+        await queue.put({"location": "A", "value": 1, "ts": "abc"})
+        await queue.put({"location": "A", "value": 1, "ts": 50.0})
+        await queue.put({"location": "A", "value": 2, "ts": 51.0})
+        await asyncio.wait_for(_drain(queue), timeout=2)
+        consumer.cancel()
+        return consumer
+
+    consumer = asyncio.run(run())
+    assert consumer.cancelled()
+    assert gateway.aggregator.stats["invalid"] == 1
+    assert gateway.aggregator.stats["frames"] == 2
+    assert [summary["location"] for summary in gateway.triggered] == ["A"]
+
+
+def test_consumer_keeps_going_when_the_aggregator_raises():
+    gateway = _gateway()
+    real_add = gateway.aggregator.add
+    calls = []
+
+    def flaky_add(frame):
+        calls.append(frame)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        return real_add(frame)
+
+    gateway.aggregator.add = flaky_add
+
+    async def run():
+        queue = asyncio.Queue(maxsize=8)
+        consumer = asyncio.create_task(gateway.consume(queue, send=lambda event: None))
+        await queue.put({"location": "B", "value": 1, "ts": 10.0})
+        await queue.put({"location": "B", "value": 1, "ts": 11.0})
+        await asyncio.wait_for(_drain(queue), timeout=2)
+        consumer.cancel()
+
+    asyncio.run(run())
+    assert len(calls) == 2
+    assert gateway.stats["frame_errors"] == 1
+
+
+def test_one_chain_per_location_even_when_frames_are_queued_back_to_back():
+    gateway = SensorGateway()
+    gateway.aggregator = SensorAggregator(window_seconds=10, change_threshold=0.01, min_interval=0.001)
+    started, cancelled = [], []
+
+    async def slow_chain(summary, send):
+        started.append(summary["location"])
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(summary["location"])
+            raise
+
+    gateway._run_chain = slow_chain
+
+    async def run():
+        queue = asyncio.Queue(maxsize=8)
+        for i in range(4):  # All queued before the consumer first runs
+            queue.put_nowait({"location": "C", "value": i * 10, "ts": 100.0 + i})
+        consumer = asyncio.create_task(gateway.consume(queue, send=lambda event: None))
+        await asyncio.wait_for(_drain(queue), timeout=2)
+        assert gateway._in_flight == {"C"}
+        consumer.cancel()  # Connection closed
+        await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+    assert started == ["C"]
+    assert cancelled == ["C"]
+    assert gateway.stats["chains_skipped"] == 3
+    assert gateway._in_flight == set()
+
+
+def test_idle_locations_are_pruned():
+    aggregator = SensorAggregator(window_seconds=10, change_threshold=0.25, min_interval=2)
+    aggregator.add({"location": "old", "value": 1, "ts": 100.0})
+    aggregator.add({"location": "live", "value": 1, "ts": 195.0})
+
+    assert aggregator.prune(now=200.0) == 1
+    assert list(aggregator.windows) == ["live"]
+    assert "old" not in aggregator.last_trigger and "old" not in aggregator.notes
+
+
+def test_location_count_is_capped():
+    aggregator = SensorAggregator(window_seconds=10, change_threshold=0.25, min_interval=2, max_locations=3)
+    for i in range(5):
+        aggregator.add({"location": f"L{i}", "value": 1, "text": "smoke"})
+
+    assert list(aggregator.windows) == ["L2", "L3", "L4"]
+    assert set(aggregator.notes) == set(aggregator.last_trigger) == {"L2", "L3", "L4"}
+    assert aggregator.stats["locations_evicted"] == 2
+
+
+def _gateway():
+    # Triggered windows are recorded instead of running perception -> memory -> risk
+    gateway = SensorGateway()
+    gateway.triggered = []
+
+    async def record_chain(summary, send):
+        gateway.triggered.append(summary)
+
+    gateway._run_chain = record_chain
+    return gateway
+
+
+async def _drain(queue):
+    while not queue.empty():
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.01)
@@ -0,0 +1,48 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+import main
+from agents.tracing import Tracer
+
+
+def test_spans_nest_and_feed_histograms():
+    tracer = Tracer()
+    with tracer.span("outer", model="m") as outer:
+        with tracer.span("inner") as inner:
+            pass
+
+    assert inner.parent_id == outer.span_id and inner.trace_id == outer.trace_id
+    assert [span["name"] for span in tracer.traces()] == ["outer", "inner"]
+    assert 'aura_span_duration_seconds_count{span="outer",model="m"} 1' in tracer.render_prometheus()
+
+
+def test_request_span_covers_the_streamed_body(monkeypatch):
+    tracer = Tracer()
+    monkeypatch.setattr(main, "tracer", tracer)
+
+    app = FastAPI()
+    app.middleware("http")(main.trace_requests)
+
+    @app.get("/stream")
+    async def stream():
+        async def body():
+            for _ in range(3):
+                await asyncio.sleep(0.05)
+                yield b"chunk\n"
+        return StreamingResponse(body(), media_type="application/x-ndjson")
+
+    with TestClient(app) as client:
+        assert client.get("/stream").text == "chunk\n" * 3
+
+    (span,) = [s for s in tracer.traces() if s["name"] == "http.request"]
+    assert span["duration_ms"] >= 150
+    assert span["attributes"]["route"] == "/stream"
+
+
+def test_profile_seconds_are_bounded():
+    with TestClient(main.app) as client:
+        assert client.get("/debug/profile", params={"seconds": -1}).status_code == 422
+        assert client.get("/debug/profile", params={"seconds": 10_000}).status_code == 422
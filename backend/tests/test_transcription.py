@@ -0,0 +1,23 @@
+import pytest
+
+from agents.transcription import TranscriptionBackend, MockTranscriber, MOCK_TRANSCRIPT
+
+
+def test_incomplete_backend_fails_at_construction():
+    class NoTranscribe(TranscriptionBackend):
+        name = "broken"
+
+    with pytest.raises(TypeError):
+        NoTranscribe()
+
+
+def test_pcm_goes_through_transcribe_by_default():
+    class Recorder(TranscriptionBackend):
+        def transcribe(self, source):
+            return source.name
+
+    assert Recorder().transcribe_pcm(b"\x00\x00" * 160, 16000) == "chunk.wav"
+
+
+def test_mock_backend():
+    assert MockTranscriber().transcribe("call.wav") == MOCK_TRANSCRIPT
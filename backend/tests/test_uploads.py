@@ -0,0 +1,39 @@
+import os
+import zipfile
+
+from agents import uploads
+from agents.uploads import IngestedUpload, expand_archive, upload_limits
+
+
+def _archive(files):
+    upload = IngestedUpload("batch.zip")
+    with zipfile.ZipFile(upload.buffer, "w") as archive:
+        for name, data in files.items():
+            archive.writestr(name, data)
+    return upload
+
+
+def test_every_part_type_gets_a_size_limit():
+    assert upload_limits("image", "a.bin") == (None, uploads.MAX_IMAGE_BYTES)
+    assert upload_limits("auto", "a.wav") == (uploads.AUDIO_SPILL_BYTES, uploads.MAX_UPLOAD_BYTES)
+    assert upload_limits("image", "frames.zip") == (uploads.AUDIO_SPILL_BYTES, uploads.MAX_UPLOAD_BYTES)
+
+
+def test_oversize_archive_members_are_reported(monkeypatch):
+    monkeypatch.setattr(uploads, "MAX_IMAGE_BYTES", 10)
+    upload = _archive({"small.png": b"x" * 5, "big.png": b"x" * 50, "inner.zip": b"PK"})
+
+    members, rejected = expand_archive(upload)
+    assert [m.filename for m in members] == ["small.png"]
+    assert dict(rejected) == {"big.png": "Upload exceeds 10 bytes", "inner.zip": "Nested archives are not supported"}
+
+
+def test_large_audio_members_spill_to_disk(monkeypatch):
+    monkeypatch.setattr(uploads, "AUDIO_SPILL_BYTES", 10)
+    upload = _archive({"call.wav": b"a" * 100})
+
+    (member,), _ = expand_archive(upload)
+    try:
+        assert member.path and os.path.getsize(member.path) == member.size == 100
+    finally:
+        os.remove(member.path)